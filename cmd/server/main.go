@@ -4,9 +4,11 @@ import (
 	"log"
 	"net/http"
 	"os"
+	"path/filepath"
 	"strings"
 
 	"github.com/aaronmcgrath/website02/internal/handlers"
+	"github.com/aaronmcgrath/website02/internal/pybundle"
 	"github.com/aaronmcgrath/website02/internal/templates"
 	"github.com/go-chi/chi/v5"
 	"github.com/go-chi/chi/v5/middleware"
@@ -55,6 +57,11 @@ func main() {
 		log.Fatalf("Failed to load templates: %v", err)
 	}
 
+	// Bundle the arcade's Python modules into one cacheable archive
+	if err := pybundle.Load(filepath.Join("static", "py")); err != nil {
+		log.Fatalf("Failed to bundle arcade modules: %v", err)
+	}
+
 	// Shared static file server
 	fileServer := http.FileServer(http.Dir("static"))
 
@@ -73,8 +80,9 @@ func main() {
 	arcadeRouter.Use(middleware.Logger)
 	arcadeRouter.Use(middleware.Recoverer)
 	arcadeRouter.Handle("/static/*", http.StripPrefix("/static/", fileServer))
+	arcadeRouter.Get(pybundle.Prefix+"*", pybundle.Serve)
 	arcadeRouter.Get("/", handlers.ArcadeIndex)
-	arcadeRouter.Get("/games/tennis", handlers.TennisGame)
+	arcadeRouter.With(handlers.CrossOriginIsolated).Get("/games/tennis", handlers.TennisGame)
 	arcadeRouter.Get("/games/guessnumber", handlers.GuessNumberGame)
 
 	// Host-based routing
@@ -3,18 +3,31 @@ package handlers
 import (
 	"net/http"
 
+	"github.com/aaronmcgrath/website02/internal/pybundle"
 	"github.com/aaronmcgrath/website02/internal/templates"
 )
 
 // ArcadePageData holds data for arcade templates
 type ArcadePageData struct {
-	Title string
+	Title  string
+	Bundle string // URL of the bundled game modules
+}
+
+// CrossOriginIsolated sets the COOP/COEP headers that let a page use
+// SharedArrayBuffer (tennis worker mode shares game state through one)
+func CrossOriginIsolated(next http.Handler) http.Handler {
+	return http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		w.Header().Set("Cross-Origin-Opener-Policy", "same-origin")
+		w.Header().Set("Cross-Origin-Embedder-Policy", "credentialless")
+		next.ServeHTTP(w, r)
+	})
 }
 
 // ArcadeIndex serves the arcade landing page
 func ArcadeIndex(w http.ResponseWriter, r *http.Request) {
 	data := ArcadePageData{
-		Title: "Game Select",
+		Title:  "Game Select",
+		Bundle: pybundle.URL(),
 	}
 	if err := templates.RenderArcade(w, "index.html", data); err != nil {
 		http.Error(w, err.Error(), http.StatusInternalServerError)
@@ -24,7 +37,8 @@ func ArcadeIndex(w http.ResponseWriter, r *http.Request) {
 // TennisGame serves the tennis/pong game page
 func TennisGame(w http.ResponseWriter, r *http.Request) {
 	data := ArcadePageData{
-		Title: "Classic Tennis",
+		Title:  "Classic Tennis",
+		Bundle: pybundle.URL(),
 	}
 	if err := templates.RenderArcade(w, "tennis.html", data); err != nil {
 		http.Error(w, err.Error(), http.StatusInternalServerError)
@@ -34,7 +48,8 @@ func TennisGame(w http.ResponseWriter, r *http.Request) {
 // GuessNumberGame serves the guess my number game page
 func GuessNumberGame(w http.ResponseWriter, r *http.Request) {
 	data := ArcadePageData{
-		Title: "Guess My Number",
+		Title:  "Guess My Number",
+		Bundle: pybundle.URL(),
 	}
 	if err := templates.RenderArcade(w, "guessnumber.html", data); err != nil {
 		http.Error(w, err.Error(), http.StatusInternalServerError)
@@ -0,0 +1,85 @@
+package pybundle
+
+import (
+	"archive/zip"
+	"bytes"
+	"crypto/sha256"
+	"encoding/hex"
+	"fmt"
+	"net/http"
+	"os"
+	"path/filepath"
+	"sort"
+	"time"
+)
+
+// BootScript is the loader that fetches the bundle, so it is served on its own
+const BootScript = "arcade_boot.py"
+
+// Prefix is the URL path the bundle is served under
+const Prefix = "/bundle/"
+
+// bundle holds the zipped arcade modules and the content hash naming them
+var bundle struct {
+	data []byte
+	name string
+}
+
+// Load zips every Python module in dir into one archive named by its hash,
+// so pages can cache it forever and a code change gets a new URL
+func Load(dir string) error {
+	paths, err := filepath.Glob(filepath.Join(dir, "*.py"))
+	if err != nil {
+		return err
+	}
+	sort.Strings(paths)
+
+	var buf bytes.Buffer
+	archive := zip.NewWriter(&buf)
+	for _, path := range paths {
+		name := filepath.Base(path)
+		if name == BootScript {
+			continue
+		}
+		source, err := os.ReadFile(path)
+		if err != nil {
+			return err
+		}
+		// Fixed timestamps keep the archive (and its hash) reproducible
+		file, err := archive.CreateHeader(&zip.FileHeader{
+			Name:     name,
+			Method:   zip.Deflate,
+			Modified: time.Date(2024, 1, 1, 0, 0, 0, 0, time.UTC),
+		})
+		if err != nil {
+			return err
+		}
+		if _, err := file.Write(source); err != nil {
+			return err
+		}
+	}
+	if err := archive.Close(); err != nil {
+		return err
+	}
+
+	sum := sha256.Sum256(buf.Bytes())
+	bundle.data = buf.Bytes()
+	bundle.name = fmt.Sprintf("arcade-%s.zip", hex.EncodeToString(sum[:6]))
+	return nil
+}
+
+// URL returns the path pages should fetch the current bundle from
+func URL() string {
+	return Prefix + bundle.name
+}
+
+// Serve responds with the bundle, marked immutable since its name is its hash
+func Serve(w http.ResponseWriter, r *http.Request) {
+	if r.URL.Path != URL() {
+		http.NotFound(w, r)
+		return
+	}
+	w.Header().Set("Content-Type", "application/zip")
+	w.Header().Set("Cache-Control", "public, max-age=31536000, immutable")
+	http.ServeContent(w, r, bundle.name, time.Time{}, bytes.NewReader(bundle.data))
+}
@@ -0,0 +1,104 @@
+/**
+ * Arcade startup helpers - plain JS that runs before Python is ready
+ * - Game pages: paints the court placeholder and queues an early START click
+ * - Arcade index: warms the HTTP cache with Pyodide and the game bundle when idle
+ */
+
+(function() {
+    'use strict';
+
+    // Pyodide release loaded by PyScript 2024.1.1 (see arcade base template)
+    const PYODIDE_BASE = 'https://cdn.jsdelivr.net/pyodide/v0.24.1/full/';
+    const PYODIDE_FILES = [
+        'pyodide.mjs',
+        'pyodide.asm.js',
+        'pyodide.asm.wasm',
+        'python_stdlib.zip',
+        'pyodide-lock.json',
+    ];
+
+    // Court layout, matching tennis_core.py / tennis_render.py
+    const PADDLE_WIDTH = 15;
+    const PADDLE_HEIGHT = 100;
+    const PADDLE_OFFSET = 30;
+    const BALL_RADIUS = 10;
+
+    function mark(name) {
+        if (window.performance && performance.mark) {
+            performance.mark('arcade:' + name);
+        }
+    }
+
+    // ===== PLACEHOLDER COURT =====
+    // Python repaints the whole canvas on its first frame, so this only has
+    // to look right until then
+    function paintCourt(canvas) {
+        const ctx = canvas.getContext('2d');
+        const width = canvas.width;
+        const height = canvas.height;
+        const paddleY = height / 2 - PADDLE_HEIGHT / 2;
+
+        ctx.fillStyle = '#0a0a0a';
+        ctx.fillRect(0, 0, width, height);
+
+        ctx.setLineDash([10, 10]);
+        ctx.strokeStyle = '#333333';
+        ctx.lineWidth = 2;
+        ctx.beginPath();
+        ctx.moveTo(width / 2, 0);
+        ctx.lineTo(width / 2, height);
+        ctx.stroke();
+        ctx.setLineDash([]);
+
+        ctx.fillStyle = '#00ff00';
+        ctx.fillRect(PADDLE_OFFSET, paddleY, PADDLE_WIDTH, PADDLE_HEIGHT);
+        ctx.fillRect(width - PADDLE_OFFSET - PADDLE_WIDTH, paddleY, PADDLE_WIDTH, PADDLE_HEIGHT);
+
+        ctx.fillStyle = '#ff00ff';
+        ctx.beginPath();
+        ctx.arc(width / 2, height / 2, BALL_RADIUS, 0, Math.PI * 2);
+        ctx.fill();
+    }
+
+    // ===== EARLY START CLICKS =====
+    // A click before Python is up is remembered; the game runs it as soon as
+    // it is interactive (arcade_runtime.announce_ready)
+    function queueStart(button) {
+        button.addEventListener('click', function() {
+            if (window.arcadeReady) return;
+            window.arcadeQueuedStart = true;
+            button.textContent = 'LOADING...';
+        });
+    }
+
+    // ===== IDLE WARM-UP =====
+    function prefetch(url) {
+        const link = document.createElement('link');
+        link.rel = 'prefetch';
+        link.as = 'fetch';
+        link.crossOrigin = 'anonymous';
+        link.href = url;
+        document.head.appendChild(link);
+    }
+
+    function warmUp() {
+        PYODIDE_FILES.forEach(function(file) {
+            prefetch(PYODIDE_BASE + file);
+        });
+        const bundle = document.body.dataset.arcadeBundle;
+        if (bundle) prefetch(bundle);
+    }
+
+    // ===== INIT =====
+    const canvas = document.getElementById('game-canvas');
+    if (canvas) paintCourt(canvas);
+    document.querySelectorAll('[data-arcade-start]').forEach(queueStart);
+    mark('placeholder');
+
+    if (document.querySelector('[data-arcade-warmup]')) {
+        const idle = window.requestIdleCallback || function(callback) {
+            return setTimeout(callback, 1000);
+        };
+        idle(warmUp);
+    }
+})();
@@ -0,0 +1,72 @@
+/**
+ * Arcade canvas executor - replays a frame of draw commands from Python
+ * static/py/arcade_canvas.py fills a Float32 command buffer and calls run()
+ * once per frame; the buffer is read in place from the Pyodide heap
+ */
+
+(function() {
+    'use strict';
+
+    // Opcodes and operand counts, matching arcade_canvas.py
+    const OP_IMAGE = 1;         // id, x, y
+    const OP_IMAGE_REGION = 2;  // id, x, y, w, h: that region of the image, at the same spot
+    const OP_IMAGES = 3;        // id, count, then count (x, y) pairs
+
+    const images = [];
+
+    // Commands refer to images (offscreen canvases) by the id this returns;
+    // passing an earlier id swaps in a new image under it
+    function register(image, id) {
+        if (id !== undefined) {
+            images[id] = image;
+            return id;
+        }
+        images.push(image);
+        return images.length - 1;
+    }
+
+    function execute(ctx, ops, length) {
+        let i = 0;
+        while (i < length) {
+            switch (ops[i]) {
+            case OP_IMAGE:
+                ctx.drawImage(images[ops[i + 1]], ops[i + 2], ops[i + 3]);
+                i += 4;
+                break;
+            case OP_IMAGE_REGION: {
+                const x = ops[i + 2];
+                const y = ops[i + 3];
+                const w = ops[i + 4];
+                const h = ops[i + 5];
+                ctx.drawImage(images[ops[i + 1]], x, y, w, h, x, y, w, h);
+                i += 6;
+                break;
+            }
+            case OP_IMAGES: {
+                const image = images[ops[i + 1]];
+                const end = i + 3 + 2 * ops[i + 2];
+                for (let j = i + 3; j < end; j += 2) {
+                    ctx.drawImage(image, ops[j], ops[j + 1]);
+                }
+                i = end;
+                break;
+            }
+            default:
+                throw new Error('arcade-canvas: bad opcode ' + ops[i] + ' at ' + i);
+            }
+        }
+    }
+
+    // `buffer` is a PyProxy of a Python array('f'): getBuffer() gives a
+    // Float32Array over its memory without copying, valid until release()
+    function run(ctx, buffer, length) {
+        const view = buffer.getBuffer('f32');
+        try {
+            execute(ctx, view.data, length);
+        } finally {
+            view.release();
+        }
+    }
+
+    window.arcadeCanvas = { register: register, run: run };
+})();
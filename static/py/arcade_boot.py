@@ -0,0 +1,43 @@
+"""
+Arcade Boot - Bundled Module Loader
+Fetches every game module as one cached archive, unpacks it into the Pyodide
+filesystem and imports the game named on the page's script tag
+"""
+
+import asyncio
+import importlib
+import json
+
+from js import URLSearchParams, document, window
+from pyodide.ffi import to_js
+from pyodide.http import pyfetch
+
+
+async def load_flag_packages(script):
+    """Load packages only some modes need, from data-flag-packages
+
+    The attribute maps a ?flag to Pyodide packages, e.g. {"chaos": ["numpy"]},
+    so the default game doesn't pay for them at startup.
+    """
+    mapping = json.loads(script.getAttribute("data-flag-packages") or "{}")
+    params = URLSearchParams.new(window.location.search)
+    packages = [name for flag, names in mapping.items() if params.has(flag) for name in names]
+    if packages:
+        import pyodide_js
+        await pyodide_js.loadPackage(to_js(packages))
+
+
+async def boot():
+    """Load the bundle, then import (and so start) the page's game module"""
+    window.performance.mark("arcade:python")
+    script = document.querySelector("script[data-game]")
+    response = await pyfetch(script.dataset.bundle)
+    if not response.ok:
+        raise OSError(f"arcade bundle request failed: {response.status}")
+    await response.unpack_archive(format="zip")
+    await load_flag_packages(script)
+    importlib.invalidate_caches()
+    importlib.import_module(script.dataset.game)
+
+
+asyncio.ensure_future(boot())
@@ -0,0 +1,134 @@
+"""
+Arcade Canvas - batched 2D drawing for the PyScript games
+Encodes a frame's draw calls into one preallocated float32 buffer that
+static/js/arcade-canvas.js replays in a single FFI call
+"""
+
+from array import array
+
+from js import window
+
+# Opcodes, matching static/js/arcade-canvas.js
+OP_IMAGE = 1  # id, x, y
+OP_IMAGE_REGION = 2  # id, x, y, w, h: that region of the image, at the same spot
+OP_IMAGES = 3  # id, count, then count (x, y) pairs
+
+DEFAULT_CAPACITY = 1 << 15  # Floats (128 KB); a frame that overflows is flushed in parts
+
+
+class CommandBuffer:
+    """Draw calls for one canvas, queued as numbers and run by one JS call
+
+    The array is allocated once and shared through a pooled PyProxy; the
+    executor views it in place, so a frame crosses the FFI once however
+    many sprites it draws.
+    """
+    def __init__(self, registry, ctx, capacity=DEFAULT_CAPACITY):
+        self.ctx = ctx
+        self.executor = window.arcadeCanvas
+        self.data = array("f", bytes(4 * capacity))
+        self.capacity = capacity
+        self.length = 0
+        self.flushes = 0
+        self.buffer = registry.get("draw-buffer", self.data)
+
+    def register(self, image, image_id=None):
+        """Id that commands use for `image` (an offscreen canvas)
+
+        Passing an earlier id swaps in a new image under it.
+        """
+        if image_id is None:
+            return self.executor.register(image)
+        return self.executor.register(image, image_id)
+
+    def reserve(self, size):
+        """Start index of `size` free slots, flushing first when they don't fit"""
+        start = self.length
+        if start + size > self.capacity:
+            self.flush()
+            start = 0
+        self.length = start + size
+        return start
+
+    def image(self, image_id, x, y):
+        i = self.reserve(4)
+        data = self.data
+        data[i] = OP_IMAGE
+        data[i + 1] = image_id
+        data[i + 2] = x
+        data[i + 3] = y
+
+    def image_region(self, image_id, x, y, w, h):
+        i = self.reserve(6)
+        data = self.data
+        data[i] = OP_IMAGE_REGION
+        data[i + 1] = image_id
+        data[i + 2] = x
+        data[i + 3] = y
+        data[i + 4] = w
+        data[i + 5] = h
+
+    def images(self, image_id, points):
+        """`image_id` at every (x, y) of points, a flat float32 buffer x0, y0, x1, y1, ...
+
+        Copied in with one slice assignment per chunk, so NumPy callers
+        never go through Python floats.
+        """
+        per_op = (self.capacity - 3) // 2
+        total = len(points) // 2
+        for first in range(0, total, per_op):
+            count = min(per_op, total - first)
+            i = self.reserve(3 + 2 * count)
+            data = self.data
+            data[i] = OP_IMAGES
+            data[i + 1] = image_id
+            data[i + 2] = count
+            memoryview(data)[i + 3:i + 3 + 2 * count] = memoryview(points[2 * first:2 * (first + count)])
+
+    def flush(self):
+        """Run everything queued since the last flush"""
+        if self.length:
+            self.executor.run(self.ctx, self.buffer, self.length)
+            self.length = 0
+            self.flushes += 1
+
+
+class DirectCanvas:
+    """CommandBuffer's interface drawing straight to the context
+
+    One FFI call per command; used when the executor script isn't loaded.
+    """
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.registered = []
+        self.flushes = 0
+
+    def register(self, image, image_id=None):
+        if image_id is None:
+            self.registered.append(image)
+            return len(self.registered) - 1
+        self.registered[image_id] = image
+        return image_id
+
+    def image(self, image_id, x, y):
+        self.ctx.drawImage(self.registered[image_id], x, y)
+
+    def image_region(self, image_id, x, y, w, h):
+        self.ctx.drawImage(self.registered[image_id], x, y, w, h, x, y, w, h)
+
+    def images(self, image_id, points):
+        draw_image = self.ctx.drawImage
+        image = self.registered[image_id]
+        coords = points.tolist()
+        for i in range(0, len(coords) - 1, 2):
+            draw_image(image, coords[i], coords[i + 1])
+
+    def flush(self):
+        self.flushes += 1
+
+
+def make_surface(registry, ctx):
+    """A CommandBuffer when static/js/arcade-canvas.js has loaded, else a DirectCanvas"""
+    if getattr(window, "arcadeCanvas", None) is None:
+        return DirectCanvas(ctx)
+    return CommandBuffer(registry, ctx)
@@ -0,0 +1,110 @@
+"""
+Arcade Input - coalesced pointer, touch and keyboard control
+Event handlers only record the newest sample; the game reads one value per
+animation frame, in canvas pixels, however fast events arrive
+"""
+
+from js import document, window
+
+# Held keys move the paddle this many canvas pixels per second
+KEY_SPEED = 600
+KEYS_UP = ("ArrowUp", "w", "W")
+KEYS_DOWN = ("ArrowDown", "s", "S")
+
+# Longest gap between polls that held keys act over (tab switches etc.)
+MAX_POLL_GAP_MS = 100
+
+
+class CanvasInput:
+    """Vertical control of a canvas game from pointer, touch and keys
+
+    Pointer events cover mouse, pen and touch alike and only store their
+    clientY. The canvas's page position and CSS scale are cached and read
+    again only after a resize or scroll, so a frame costs at most one
+    layout read whatever the event rate.
+    """
+    def __init__(self, registry, canvas, height=None, key_speed=KEY_SPEED):
+        self.canvas = canvas
+        self.key_speed = key_speed
+        # Game coordinates span this, whatever resolution the canvas renders at
+        self.height = canvas.height if height is None else height
+        self.active = False  # Game keys are only captured while play is on
+        self.rect = None  # (top, scale) of the canvas on the page; None when stale
+        self.client_y = None  # Newest pointer sample not yet polled
+        self.up = False
+        self.down = False
+        self.last_poll = None
+        self.events = 0
+        self.rect_reads = 0
+
+        canvas.style.touchAction = "none"  # Touch drags steer instead of scrolling
+        registry.listen(canvas, "pointermove", "input:pointermove", self.on_pointer)
+        registry.listen(canvas, "pointerdown", "input:pointerdown", self.on_pointer)
+        registry.listen(document, "keydown", "input:keydown", self.on_key_down)
+        registry.listen(document, "keyup", "input:keyup", self.on_key_up)
+        registry.listen(window, "blur", "input:blur", self.release_keys)
+        registry.listen(window, "resize", "input:resize", self.invalidate)
+        # Capture phase, so scrolling any ancestor of the canvas counts too
+        registry.listen(window, "scroll", "input:scroll", self.invalidate, True)
+
+    def on_pointer(self, event):
+        self.client_y = event.clientY
+        self.events += 1
+
+    def on_key_down(self, event):
+        if event.key in KEYS_UP:
+            self.up = True
+        elif event.key in KEYS_DOWN:
+            self.down = True
+        else:
+            return
+        self.events += 1
+        if self.active:
+            event.preventDefault()  # Don't scroll the page while steering
+
+    def on_key_up(self, event):
+        if event.key in KEYS_UP:
+            self.up = False
+        elif event.key in KEYS_DOWN:
+            self.down = False
+
+    def release_keys(self, event=None):
+        """Forget held keys (their keyup goes elsewhere once focus is lost)"""
+        self.up = self.down = False
+
+    def invalidate(self, event=None):
+        """The canvas may have moved or been resized; re-read its rect on next use"""
+        self.rect = None
+
+    def reset(self):
+        """Drop pending samples and timing (call when play starts)"""
+        self.client_y = None
+        self.last_poll = None
+
+    def canvas_y(self, client_y):
+        """Viewport y to game coordinates (0 to height), allowing for CSS scaling"""
+        if self.rect is None:
+            rect = self.canvas.getBoundingClientRect()
+            self.rect_reads += 1
+            scale = self.height / rect.height if rect.height else 1.0
+            self.rect = (rect.top, scale)
+        top, scale = self.rect
+        return (client_y - top) * scale
+
+    def poll(self, timestamp, current_y):
+        """New target y for this frame, or None when nothing moved it
+
+        The newest pointer sample wins; held keys then move on from it (or
+        from `current_y`) for the time since the last poll.
+        """
+        elapsed = 0.0 if self.last_poll is None else min(timestamp - self.last_poll, MAX_POLL_GAP_MS)
+        self.last_poll = timestamp
+
+        y = None
+        if self.client_y is not None:
+            y = self.canvas_y(self.client_y)
+            self.client_y = None
+        direction = self.down - self.up
+        if direction:
+            y = (current_y if y is None else y) + direction * self.key_speed * elapsed / 1000
+        return y
@@ -0,0 +1,162 @@
+"""
+Arcade Quality - frame-time driven quality governor
+Steps a game down through cheaper render settings while frames run over
+budget and back up once they have room again, with hysteresis
+"""
+
+from array import array
+
+from arcade_runtime import FrameScheduler
+
+WINDOW_FRAMES = 30  # Frame gaps averaged for each decision (half a second at 60 fps)
+DEGRADE_RATIO = 1.2  # Mean gap over budget by this much steps quality down
+RESTORE_RATIO = 1.05  # ...and under this much, for long enough, steps it back up
+RESTORE_FRAMES = 120  # Calm frames needed before stepping up
+MAX_RESTORE_FRAMES = 1920  # Cap on that wait as failed restores double it
+MAX_GAP_MS = 250  # Longer gaps are pauses (hidden tab, menus), not slow frames
+BUDGET_MS = 1000 / 60  # Target frame gap until the display's refresh interval is measured
+PROBE_MS = 1000  # How long the idle page is watched to measure that interval
+# Measured intervals are clamped to real displays (30 to 240 Hz)
+MIN_BUDGET_MS = 1000 / 240
+MAX_BUDGET_MS = 1000 / 30
+
+
+class QualityGovernor:
+    """Picks a quality level (0 = best) from rolling animation-frame gaps
+
+    Gaps between requestAnimationFrame timestamps cover everything the
+    browser did for a frame, not just the Python side. Stepping down
+    happens after one window over budget; stepping up needs
+    `restore_after` frames of headroom, and that wait doubles whenever a
+    restored level promptly drops again, so a borderline device settles
+    instead of flickering between two levels.
+
+    The budget is one refresh interval of the display: probe() measures it
+    as the median frame gap while the page idles, so a 30 Hz display isn't
+    mistaken for a slow device.
+    """
+    def __init__(self, levels, on_change, budget_ms=BUDGET_MS, window=WINDOW_FRAMES):
+        self.levels = levels
+        self.on_change = on_change
+        self.budget_ms = budget_ms
+        self.level = 0
+        self.gaps = array("d", bytes(8 * window))
+        self.window = window
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+        self.last_timestamp = None
+        self.calm = 0
+        self.restore_after = RESTORE_FRAMES
+        self.restored_at = None
+        self.frames = 0
+        self.changes = 0
+        self.pinned = False
+        self.probe_scheduler = None
+        self.probe_gaps = []
+        self.probe_last = None
+        self.probe_elapsed = 0.0
+
+    def probe(self, registry):
+        """Measure the display's refresh interval over PROBE_MS of otherwise idle frames"""
+        if self.pinned:
+            return
+        self.probe_scheduler = FrameScheduler(registry, self.on_probe_frame, "quality-probe")
+        self.probe_scheduler.start()
+
+    def on_probe_frame(self, timestamp):
+        last = self.probe_last
+        self.probe_last = timestamp
+        if last is None:
+            return
+        gap = timestamp - last
+        if gap > MAX_GAP_MS:
+            return
+        self.probe_gaps.append(gap)
+        self.probe_elapsed += gap
+        if self.probe_elapsed >= PROBE_MS:
+            gaps = sorted(self.probe_gaps)
+            self.budget_ms = max(MIN_BUDGET_MS, min(gaps[len(gaps) // 2], MAX_BUDGET_MS))
+            self.probe_scheduler.stop()
+            self.probe_scheduler = None  # Its pooled proxy stays; it can't be destroyed mid-call
+            self.clear()
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def clear(self):
+        """Forget the gaps so far (after a level change or a pause)"""
+        for i in range(self.window):
+            self.gaps[i] = 0.0
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+        self.calm = 0
+
+    def pause(self):
+        """The frame loop stopped; the next frame starts a fresh gap"""
+        self.last_timestamp = None
+        self.clear()
+
+    def pin(self, level):
+        """Hold `level` from now on, whatever the frame times"""
+        if level != self.level:
+            self.set_level(level)
+        self.pinned = True
+
+    def on_frame(self, timestamp):
+        """Record one frame's timestamp and adjust the level if needed"""
+        if self.pinned:
+            return
+        last = self.last_timestamp
+        self.last_timestamp = timestamp
+        if last is None:
+            return
+        gap = timestamp - last
+        if gap > MAX_GAP_MS:
+            self.clear()
+            return
+        self.frames += 1
+
+        self.total += gap - self.gaps[self.index]
+        self.gaps[self.index] = gap
+        self.index = (self.index + 1) % self.window
+        if self.count < self.window:
+            self.count += 1
+            return
+
+        mean = self.total / self.window
+        budget = self.budget_ms
+        if mean > budget * DEGRADE_RATIO:
+            self.calm = 0
+            if self.level < self.levels - 1:
+                # Dropping soon after a restore: that level can't be held, so wait longer next time
+                if self.restored_at is not None and self.frames - self.restored_at < self.restore_after:
+                    self.restore_after = min(self.restore_after * 2, MAX_RESTORE_FRAMES)
+                self.set_level(self.level + 1)
+        elif mean < budget * RESTORE_RATIO:
+            self.calm += 1
+            if self.level > 0 and self.calm >= self.restore_after:
+                self.restored_at = self.frames
+                self.set_level(self.level - 1)
+        else:
+            self.calm = 0
+
+    def set_level(self, level):
+        """Switch to `level` and judge it on fresh frames"""
+        self.level = level
+        self.changes += 1
+        self.clear()
+        self.on_change(level)
+
+    def stats(self):
+        """Diagnostics for window.<name>()"""
+        return {
+            "level": self.level,
+            "pinned": self.pinned,
+            "mean_ms": round(self.mean(), 2),
+            "budget_ms": round(self.budget_ms, 2),
+            "probing": self.probe_scheduler is not None,
+            "changes": self.changes,
+            "restore_after": self.restore_after,
+        }
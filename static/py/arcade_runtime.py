@@ -0,0 +1,207 @@
+"""
+Arcade Runtime - shared browser plumbing for the PyScript games
+Keeps Pyodide FFI proxies and requestAnimationFrame callbacks alive exactly
+as long as they're needed, so long play sessions don't leak
+"""
+
+from js import Object, URLSearchParams, window
+from pyodide.ffi import create_proxy, to_js
+
+
+class ProxyRegistry:
+    """Owns every JS-facing proxy a game creates, keyed by purpose"""
+    def __init__(self):
+        self.proxies = {}
+        self.created = 0
+        self.destroyed = 0
+
+    def get(self, key, fn):
+        """Return the proxy for `key`, creating it once and reusing it after"""
+        proxy = self.proxies.get(key)
+        if proxy is None:
+            proxy = create_proxy(fn)
+            self.proxies[key] = proxy
+            self.created += 1
+        return proxy
+
+    def listen(self, element, event, key, fn, *options):
+        """Attach the pooled proxy for `key` to `element`
+
+        Overlay buttons are rebuilt with innerHTML each round; the old element
+        (and its listener) goes away with it, so the same proxy is safely
+        re-attached to the new one instead of minting a fresh proxy.
+        """
+        element.addEventListener(event, self.get(key, fn), *options)
+
+    def release(self, key):
+        """Destroy the proxy for `key` if one exists"""
+        proxy = self.proxies.pop(key, None)
+        if proxy is not None:
+            proxy.destroy()
+            self.destroyed += 1
+
+    def release_all(self):
+        """Destroy every proxy (page teardown)"""
+        for key in list(self.proxies):
+            self.release(key)
+
+    def stats(self):
+        """Live/created/destroyed proxy counts"""
+        return {
+            "live": len(self.proxies),
+            "created": self.created,
+            "destroyed": self.destroyed,
+        }
+
+
+class FrameScheduler:
+    """One persistent requestAnimationFrame callback driving a game loop"""
+    def __init__(self, registry, callback, key="frame"):
+        self.callback = callback
+        self.frame_id = None
+        self.running = False
+        self.frames = 0
+        self.proxy = registry.get(key, self.on_frame)
+
+    def start(self):
+        """Begin calling `callback(timestamp)` once per animation frame"""
+        if self.running:
+            return
+        self.running = True
+        self.frame_id = window.requestAnimationFrame(self.proxy)
+
+    def stop(self):
+        """Cancel the pending frame; the callback won't fire again until start()"""
+        self.running = False
+        if self.frame_id is not None:
+            window.cancelAnimationFrame(self.frame_id)
+            self.frame_id = None
+
+    def on_frame(self, timestamp):
+        self.frame_id = None
+        if not self.running:
+            return
+        self.frames += 1
+        self.callback(timestamp)
+        if self.running and self.frame_id is None:
+            self.frame_id = window.requestAnimationFrame(self.proxy)
+
+
+def expose(name, registry, fn):
+    """Publish `window.<name>()` returning fn()'s dict as a plain JS object"""
+    def read():
+        return to_js(fn(), dict_converter=Object.fromEntries)
+    key = f"expose:{name}"
+    registry.release(key)
+    setattr(window, name, registry.get(key, read))
+
+
+def unexpose(name, registry):
+    """Remove `window.<name>` published by expose() and release its proxy"""
+    if hasattr(window, name):
+        delattr(window, name)
+    registry.release(f"expose:{name}")
+
+
+def expose_stats(name, registry):
+    """Publish `window.<name>()` returning the registry's live proxy counts"""
+    expose(name, registry, registry.stats)
+
+
+def query_param(name):
+    """Value of ?<name>=... in the page URL, or None"""
+    value = URLSearchParams.new(window.location.search).get(name)
+    return None if value is None else str(value)
+
+
+def query_flag(name):
+    """True when the page URL carries ?<name> (with or without a value)"""
+    return bool(URLSearchParams.new(window.location.search).has(name))
+
+
+class DomView:
+    """Mirrors a plain Python state object into the DOM
+
+    Handlers only change attributes on `state`; schedule() queues a single
+    flush on the next animation frame, which writes just the bound fields
+    whose value differs from what was last written.
+    """
+    def __init__(self, registry, state):
+        self.state = state
+        self.bindings = []
+        self.frame_id = None
+        self.writes = 0
+        self.proxy = registry.get("view-flush", self.on_frame)
+
+    def bind(self, field, write):
+        """Call write(value) whenever state.<field> changes"""
+        self.bindings.append([field, write, object()])
+
+    def text(self, field, element):
+        self.bind(field, lambda value: setattr(element, "textContent", value))
+
+    def prop(self, field, element, name):
+        self.bind(field, lambda value: setattr(element, name, value))
+
+    def style(self, field, element, name):
+        style = element.style
+        self.bind(field, lambda value: setattr(style, name, value))
+
+    def shown(self, field, element, when=True):
+        """Toggle the "hidden" class so element shows only while field == when"""
+        class_list = element.classList
+        self.bind(field, lambda value: class_list.toggle("hidden", value != when))
+
+    def schedule(self):
+        """Flush on the next animation frame (once, however often it's called)"""
+        if self.frame_id is None:
+            self.frame_id = window.requestAnimationFrame(self.proxy)
+
+    def on_frame(self, timestamp):
+        self.frame_id = None
+        self.flush()
+
+    def flush(self):
+        """Write every changed field now"""
+        state = self.state
+        for binding in self.bindings:
+            value = getattr(state, binding[0])
+            if value != binding[2]:
+                binding[1](value)
+                binding[2] = value
+                self.writes += 1
+
+
+# Startup marks in the order a page reaches them: "placeholder" (court and
+# overlay painted by arcade-boot.js), "python" (interpreter up), "first-frame"
+# (the game's own first paint) and "interactive" (its handlers attached)
+STARTUP_MARKS = ("placeholder", "python", "first-frame", "interactive")
+
+
+def mark_startup(name):
+    """Record performance mark "arcade:<name>" (milliseconds since navigation)"""
+    window.performance.mark(f"arcade:{name}")
+
+
+def startup_metrics():
+    """{"<mark>_ms": time} for every startup mark the page has reached"""
+    metrics = {}
+    for name in STARTUP_MARKS:
+        entries = window.performance.getEntriesByName(f"arcade:{name}")
+        if entries.length:
+            metrics[f"{name.replace('-', '_')}_ms"] = round(entries[0].startTime, 1)
+    return metrics
+
+
+def announce_ready(registry, start):
+    """The game is interactive: publish startup metrics, run any early start
+
+    arcade-boot.js queues a start click made while Python was still loading
+    and stops doing so once window.arcadeReady is set.
+    """
+    mark_startup("interactive")
+    expose("arcadeStartup", registry, startup_metrics)
+    window.arcadeReady = True
+    if getattr(window, "arcadeQueuedStart", False):
+        window.arcadeQueuedStart = False
+        start()
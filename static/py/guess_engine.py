@@ -0,0 +1,448 @@
+"""
+Guess My Number - Search Engine
+Range handling and the computer's guessing strategy with no browser
+dependencies, so the same code drives the game and offline evaluation
+"""
+
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from math import comb
+
+# Bounds are signed 64-bit so they round-trip through JS BigInt / int64 arrays
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+# Galloping stops doubling here so strides stay representable as int64
+MAX_GALLOP_STEP = 2 ** 62
+
+DEFAULT_LOW = 1
+DEFAULT_HIGH = 100
+
+
+def midpoint_split(size):
+    """Offset of the guess into an interval of `size` numbers (plain bisection)
+
+    Works on ints and NumPy integer arrays alike.
+    """
+    return (size - 1) // 2
+
+
+def check_range(low, high):
+    """Validate a range; high=None means open-ended. Raises ValueError"""
+    if not INT64_MIN <= low <= INT64_MAX:
+        raise ValueError(f"low bound {low} is outside the 64-bit range")
+    if high is not None:
+        if not INT64_MIN <= high <= INT64_MAX:
+            raise ValueError(f"high bound {high} is outside the 64-bit range")
+        if high < low:
+            raise ValueError(f"empty range {low} - {high}")
+
+
+def gallop_offset(step, low):
+    """Next galloping probe offset from `low`, kept inside 64-bit bounds"""
+    return min(step - 1, INT64_MAX - low)
+
+
+class GuessSearch:
+    """The computer's search for the player's number in Mode 2
+
+    With a fixed range it bisects. Open-ended (high=None) it first gallops,
+    doubling its stride until told "lower", then bisects what's left.
+    """
+    def __init__(self, low=DEFAULT_LOW, high=DEFAULT_HIGH, split=midpoint_split):
+        check_range(low, high)
+        self.low = low
+        self.high = high
+        self.split = split
+        self.step = 1  # Gallop stride while the range is open
+        self.guess = None
+
+    @property
+    def open(self):
+        return self.high is None
+
+    def next_guess(self):
+        """Pick the next number to ask about"""
+        if self.open:
+            self.guess = self.low + gallop_offset(self.step, self.low)
+        else:
+            self.guess = self.low + self.split(self.high - self.low + 1)
+        return self.guess
+
+    def feedback(self, answer):
+        """Apply "higher"/"lower"; False when no number could fit the answers"""
+        if answer == "higher":
+            if self.guess >= INT64_MAX:
+                return False
+            self.low = self.guess + 1
+            if self.open:
+                self.step = min(self.step * 2, MAX_GALLOP_STEP)
+        elif answer == "lower":
+            self.high = self.guess - 1
+        return self.open or self.low <= self.high
+
+
+# Lie-tolerant search (Ulam's game) ------------------------------------------
+
+# Strategy tables remember the first few questions per (low, high, lies),
+# filled in as games ask them
+TABLE_DEPTH = 8
+MAX_LIES = 3
+
+
+@lru_cache(maxsize=None)
+def lie_volume(questions, lies_left):
+    """Answer sequences a candidate with `lies_left` lies can still produce
+
+    Berlekamp's weight: sum of C(questions, i) for i <= lies_left.
+    """
+    if lies_left < 0:
+        return 0
+    return sum(comb(questions, i) for i in range(min(lies_left, questions) + 1))
+
+
+class LieTolerantSearch:
+    """Mode 2 search that survives up to `max_lies` wrong higher/lower answers
+
+    Every number keeps a count of answers it contradicts; it stays a
+    candidate while that count is at most max_lies. Counts are held
+    run-length encoded - segment starts in an int64 array and their lie
+    counts in a byte array - since q answers split the range into at most
+    q + 1 runs, whatever its size. Each question is the one that minimises
+    the worst-case Berlekamp volume (weighted candidates) left afterwards.
+    Answering "correct" is always taken as true.
+    """
+    tables = {}
+    open = False
+
+    def __init__(self, low=DEFAULT_LOW, high=DEFAULT_HIGH, max_lies=1):
+        check_range(low, high)
+        if high is None:
+            raise ValueError("lie-tolerant search needs a finite range")
+        if not 0 <= max_lies <= MAX_LIES:
+            raise ValueError(f"can tolerate 0 to {MAX_LIES} lies, not {max_lies}")
+        self.range_low = low
+        self.range_high = high
+        self.max_lies = max_lies
+        self.starts = array("q", [low])
+        self.lies = array("B", [0])
+        self.history = ()
+        self.guess = None
+        self.table = self.tables.setdefault((low, high, max_lies), {})
+
+    def segments(self):
+        """Yield (first, last, lies) for every run"""
+        count = len(self.starts)
+        for i in range(count):
+            last = self.starts[i + 1] - 1 if i + 1 < count else self.range_high
+            yield self.starts[i], last, self.lies[i]
+
+    def candidates(self):
+        """Yield (first, last) runs of numbers still consistent with the answers"""
+        for first, last, lies in self.segments():
+            if lies <= self.max_lies:
+                yield first, last
+
+    @property
+    def low(self):
+        return next(self.candidates(), (None, None))[0]
+
+    @property
+    def high(self):
+        last = None
+        for _, last in self.candidates():
+            pass
+        return last
+
+    def remaining(self):
+        """How many numbers are still possible"""
+        return sum(last - first + 1 for first, last in self.candidates())
+
+    def questions_left(self):
+        """Fewest questions that could still pin the number down (Berlekamp bound)"""
+        questions = 0
+        while self.volume(questions) > 2 ** questions:
+            questions += 1
+        return questions
+
+    def volume(self, questions):
+        k = self.max_lies
+        return sum((last - first + 1) * lie_volume(questions, k - lies)
+                   for first, last, lies in self.segments())
+
+    def choose_guess(self):
+        """Guess g minimising max(volume after "higher", volume after "lower")
+
+        With D(x) the volume x loses by being contradicted once and P(g) the
+        sum of D over x <= g, the two outcomes leave T - P(g) and
+        T - (Dtotal - P(g - 1)), so the best g is where P(g) + P(g - 1)
+        first reaches Dtotal. P is linear inside each run, so that point is
+        found in one pass over the runs.
+        """
+        k = self.max_lies
+        q = max(self.questions_left() - 1, 0)
+        runs = []
+        d_total = 0
+        for first, last, lies in self.segments():
+            if lies > k:
+                continue
+            d = lie_volume(q, k - lies) - lie_volume(q, k - lies - 1)
+            runs.append((first, last, d, d_total))
+            d_total += (last - first + 1) * d
+
+        best = None
+        for first, last, d, before in runs:
+            # Within this run P(g) = before + (g - first + 1) * d
+            if d == 0:
+                options = (first, last)
+            else:
+                # Smallest g here with P(g) + P(g - 1) >= d_total
+                need = d_total - 2 * before + d
+                g = first + max(0, -(-need // (2 * d)) - 1)
+                options = (min(max(g - 1, first), last), min(max(g, first), last))
+            for g in options:
+                p_g = before + (g - first + 1) * d
+                p_prev = p_g - d
+                cost = max(-p_g, p_prev - d_total)
+                if best is None or cost < best[0]:
+                    best = (cost, g)
+        return best[1] if best else self.range_low
+
+    def next_guess(self):
+        """Pick the next number to ask about
+
+        Early questions come from the shared strategy table, which learns
+        each one the first time a game asks it, so nothing is computed up
+        front and later games skip the work.
+        """
+        guess = self.table.get(self.history)
+        if guess is None:
+            guess = self.choose_guess()
+            if len(self.history) <= TABLE_DEPTH:
+                self.table[self.history] = guess
+        self.guess = guess
+        return guess
+
+    def split_at(self, number):
+        """Make sure a run starts at `number` (within the range)"""
+        if number > self.range_high or number < self.range_low:
+            return
+        i = bisect_right(self.starts, number) - 1
+        if self.starts[i] != number:
+            self.starts.insert(i + 1, number)
+            self.lies.insert(i + 1, self.lies[i])
+
+    def contradict(self, guess, answer):
+        """Charge one lie to every number the answer rules out"""
+        if answer == "higher":
+            first, last = self.range_low, guess
+        else:
+            first, last = guess, self.range_high
+        self.split_at(first)
+        self.split_at(last + 1)
+        cap = self.max_lies + 1
+        for i in range(len(self.starts)):
+            end = self.starts[i + 1] - 1 if i + 1 < len(self.starts) else self.range_high
+            if self.starts[i] >= first and end <= last and self.lies[i] < cap:
+                self.lies[i] += 1
+
+        # Merge neighbouring runs that now agree
+        i = 1
+        while i < len(self.starts):
+            if self.lies[i] == self.lies[i - 1] or (self.lies[i] >= cap and self.lies[i - 1] >= cap):
+                del self.starts[i]
+                del self.lies[i]
+            else:
+                i += 1
+
+    def feedback(self, answer):
+        """Apply "higher"/"lower"; False once no number fits within the lie budget"""
+        self.contradict(self.guess, answer)
+        self.history += (answer,)
+        return self.remaining() > 0
+
+
+# Learned prior over player picks --------------------------------------------
+
+# Ranges up to this size get a prior and an optimal search tree (the tables
+# take O(size^2 * height) memory and a full build is O(size^2 * height) time)
+MAX_PRIOR_SIZE = 200
+
+# Every number starts with this many imaginary picks, so one lucky round
+# can't make the tree ignore the rest of the range
+PSEUDO_COUNT = 1.0
+
+# Starting nudge towards numbers people are known to favour (extra picks)
+FAVOURITES = {7: 2.0, 37: 2.0, 42: 2.0, 69: 2.0}
+ROUND_NUMBER_BONUS = 1.0  # For multiples of 10
+
+INFINITY = float("inf")
+
+
+class GuessPrior:
+    """How often players picked each number in a finite range, and the best
+    search tree for that distribution
+
+    The tree minimises expected attempts (sum of weight x depth) among
+    trees at most one level deeper than plain bisection's, so the worst
+    case never gets more than one guess worse. cost[h] and root[h] hold,
+    for every interval i..j of the range, the cheapest subtree of height
+    <= h and its root (Knuth's interval DP, with roots bounded by the
+    neighbouring intervals' roots). Recording a pick changes one weight,
+    so only intervals containing it are recomputed.
+    """
+    def __init__(self, low=DEFAULT_LOW, high=DEFAULT_HIGH, counts=None):
+        check_range(low, high)
+        if high is None:
+            raise ValueError("a prior needs a finite range")
+        size = high - low + 1
+        if size > MAX_PRIOR_SIZE:
+            raise ValueError(f"priors cover at most {MAX_PRIOR_SIZE} numbers, not {size}")
+        self.low = low
+        self.high = high
+        self.size = size
+        self.height = size.bit_length() + 1
+        self.counts = array("d", bytes(8 * size))
+        for number, count in (counts or {}).items():
+            if low <= number <= high:
+                self.counts[number - low] = count
+        self.weights = array("d", (self.base_weight(low + k) + self.counts[k] for k in range(size)))
+        self.prefix = array("d", bytes(8 * (size + 1)))
+        self.stride = size + 1
+        self.cost = None  # Tables are built on first use
+        self.root = None
+
+    @staticmethod
+    def base_weight(number):
+        """Pseudo-count plus the built-in nudge for `number`"""
+        weight = PSEUDO_COUNT + FAVOURITES.get(number, 0.0)
+        if number % 10 == 0:
+            weight += ROUND_NUMBER_BONUS
+        return weight
+
+    def index(self, i, j):
+        """Table cell of interval i..j (j = i - 1 is the empty interval)"""
+        return i * self.stride + j + 1
+
+    def update_prefix(self):
+        total = 0.0
+        for k, weight in enumerate(self.weights):
+            self.prefix[k] = total
+            total += weight
+        self.prefix[self.size] = total
+
+    def solve_height(self, h, key=None):
+        """Fill cost[h] and root[h] from height h - 1, for every interval or only those holding `key`
+
+        Intervals longer than 2**h - 1 can't fit and keep their infinite
+        cost. Cell arithmetic is inlined: index(i, r - 1) = i * stride + r
+        and index(r + 1, j) = (r + 1) * stride + j + 1.
+        """
+        n = self.size
+        stride = self.stride
+        cost = self.cost[h]
+        root = self.root[h]
+        below = self.cost[h - 1]
+        prefix = self.prefix
+        for length in range(1, min(n, (1 << h) - 1) + 1):
+            if key is None:
+                first_i, last_i = 0, n - length
+            else:
+                first_i, last_i = max(0, key - length + 1), min(key, n - length)
+            for i in range(first_i, last_i + 1):
+                j = i + length - 1
+                cell = i * stride + j + 1
+                if length == 1:
+                    first = last = i
+                else:
+                    # Knuth's bounds: between the roots of i..j-1 and i+1..j
+                    first = root[cell - 1]
+                    last = root[cell + stride]
+                left = i * stride
+                right = j + 1
+                best, best_root = INFINITY, first
+                for r in range(first, last + 1):
+                    c = below[left + r] + below[(r + 1) * stride + right]
+                    if c < best:
+                        best, best_root = c, r
+                if best == INFINITY:
+                    # The bounds only held roots that overflow the height; try them all
+                    for r in range(i, j + 1):
+                        c = below[left + r] + below[(r + 1) * stride + right]
+                        if c < best:
+                            best, best_root = c, r
+                cost[cell] = best + prefix[j + 1] - prefix[i]
+                root[cell] = best_root
+
+    def build(self):
+        """Solve every interval at every height"""
+        self.update_prefix()
+        cells = self.stride * self.stride
+        self.cost = [array("d", [INFINITY]) * cells for _ in range(self.height + 1)]
+        self.root = [array("l", [0]) * cells for _ in range(self.height + 1)]
+        for table in self.cost:
+            for i in range(self.size + 1):
+                table[self.index(i, i - 1)] = 0.0
+        for h in range(1, self.height + 1):
+            self.solve_height(h)
+
+    def ensure_built(self):
+        if self.cost is None:
+            self.build()
+
+    def record(self, number):
+        """Count one more pick of `number` and re-solve the intervals holding it"""
+        if not self.low <= number <= self.high:
+            return
+        k = number - self.low
+        self.counts[k] += 1
+        self.weights[k] += 1
+        if self.cost is None:
+            return
+        self.update_prefix()
+        for h in range(1, self.height + 1):
+            self.solve_height(h, k)
+
+    def best_guess(self, low, high, height):
+        """Root of the best subtree for low..high with `height` guesses left"""
+        self.ensure_built()
+        i, j = low - self.low, high - self.low
+        if height > self.height or j - i + 1 > (1 << max(height, 0)) - 1:
+            return low + midpoint_split(high - low + 1)
+        return self.low + self.root[height][self.index(i, j)]
+
+    def expected_attempts(self):
+        """Mean attempts the tree needs with secrets drawn from the prior"""
+        self.ensure_built()
+        return self.cost[self.height][self.index(0, self.size - 1)] / self.prefix[self.size]
+
+    def to_text(self):
+        """Recorded picks as "number:count" pairs (for localStorage)"""
+        return " ".join(f"{self.low + k}:{count:g}" for k, count in enumerate(self.counts) if count)
+
+    @classmethod
+    def from_text(cls, low, high, text):
+        """Prior for low..high from to_text() output; bad entries are skipped"""
+        counts = {}
+        for pair in (text or "").split():
+            number, _, count = pair.partition(":")
+            try:
+                counts[int(number)] = max(0.0, float(count))
+            except ValueError:
+                continue
+        return cls(low, high, counts)
+
+
+class PriorSearch(GuessSearch):
+    """Mode 2 search that walks a GuessPrior's tree instead of bisecting"""
+    def __init__(self, prior):
+        super().__init__(prior.low, prior.high)
+        self.prior = prior
+        self.asked = 0
+
+    def next_guess(self):
+        """Root of the best subtree for what's left, within the height budget"""
+        self.guess = self.prior.best_guess(self.low, self.high, self.prior.height - self.asked)
+        self.asked += 1
+        return self.guess
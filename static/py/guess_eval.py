@@ -0,0 +1,149 @@
+"""
+Guess My Number - Offline Strategy Evaluator
+Runs a computer strategy against every possible secret at once with NumPy
+and reports the full distribution of attempts, so optimality can be checked
+for any range in milliseconds instead of by playing rounds
+"""
+
+from functools import lru_cache
+import sys
+
+import numpy as np
+
+from guess_engine import INT64_MAX, MAX_GALLOP_STEP, PriorSearch, check_range, midpoint_split
+
+# Ranges up to this many numbers are simulated secret by secret; larger ones
+# are counted exactly by interval size instead
+EXHAUSTIVE_LIMIT = 1 << 22
+
+
+def simulate(secrets, low, high=None, split=midpoint_split):
+    """Attempts GuessSearch needs for each secret in `secrets` (int64 array)"""
+    n = len(secrets)
+    lo = np.full(n, low, dtype=np.int64)
+    hi = np.full(n, INT64_MAX if high is None else high, dtype=np.int64)
+    open_range = np.full(n, high is None)
+    step = np.ones(n, dtype=np.int64)
+    attempts = np.zeros(n, dtype=np.int64)
+    active = np.ones(n, dtype=bool)
+
+    while active.any():
+        gallop = lo + np.minimum(step - 1, INT64_MAX - lo)
+        guess = np.where(open_range, gallop, lo + split(hi - lo + 1))
+        attempts += active
+        higher = active & (secrets > guess)
+        lower = active & (secrets < guess)
+        active &= higher | lower
+
+        lo = np.where(higher, guess + 1, lo)
+        hi = np.where(lower, guess - 1, hi)
+        step = np.where(higher & open_range, np.minimum(step, MAX_GALLOP_STEP // 2) * 2, step)
+        open_range &= ~lower
+    return attempts
+
+
+@lru_cache(maxsize=None)
+def size_distribution(size, split=midpoint_split):
+    """{attempts: secrets} for a fixed interval of `size`, counted recursively
+
+    The search only depends on the interval size, and bisection leaves
+    O(log size) distinct sizes, so this is exact even for 64-bit ranges.
+    """
+    if size <= 0:
+        return {}
+    offset = split(size)
+    counts = {1: 1}
+    for part in (offset, size - offset - 1):
+        for depth, count in size_distribution(part, split).items():
+            counts[depth + 1] = counts.get(depth + 1, 0) + count
+    return counts
+
+
+def optimal_total(size):
+    """Fewest total attempts any strategy can need over `size` uniform secrets"""
+    total = 0
+    depth = 1
+    remaining = size
+    while remaining > 0:
+        level = min(remaining, 1 << (depth - 1))
+        total += depth * level
+        remaining -= level
+        depth += 1
+    return total
+
+
+def evaluate(low, high, split=midpoint_split):
+    """Distribution, worst case and mean of attempts over every secret in range"""
+    check_range(low, high)
+    size = high - low + 1
+    if size <= EXHAUSTIVE_LIMIT:
+        secrets = np.arange(low, high + 1, dtype=np.int64)
+        values, counts = np.unique(simulate(secrets, low, high, split), return_counts=True)
+        distribution = {int(v): int(c) for v, c in zip(values, counts)}
+    else:
+        distribution = dict(sorted(size_distribution(size, split).items()))
+
+    total = sum(depth * count for depth, count in distribution.items())
+    return {
+        "range": (low, high),
+        "secrets": size,
+        "distribution": distribution,
+        "worst": max(distribution),
+        "mean": total / size,
+        "optimal_worst": size.bit_length(),
+        "optimal_mean": optimal_total(size) / size,
+        "optimal": max(distribution) == size.bit_length() and total == optimal_total(size),
+    }
+
+
+def evaluate_open(low, max_secret, split=midpoint_split):
+    """Open-ended mode: attempts for every secret in low..max_secret"""
+    check_range(low, max_secret)
+    secrets = np.arange(low, max_secret + 1, dtype=np.int64)
+    attempts = simulate(secrets, low, None, split)
+    values, counts = np.unique(attempts, return_counts=True)
+    return {
+        "range": (low, None),
+        "secrets": len(secrets),
+        "distribution": {int(v): int(c) for v, c in zip(values, counts)},
+        "worst": int(attempts.max()),
+        "mean": float(attempts.mean()),
+    }
+
+
+def prior_attempts(prior):
+    """Attempts PriorSearch needs for each secret in the prior's range, in order"""
+    attempts = np.zeros(prior.size, dtype=np.int64)
+    for k in range(prior.size):
+        secret = prior.low + k
+        search = PriorSearch(prior)
+        while search.next_guess() != secret:
+            search.feedback("higher" if secret > search.guess else "lower")
+        attempts[k] = search.asked
+    return attempts
+
+
+def evaluate_prior(prior, population):
+    """PriorSearch against bisection for secrets drawn from `population`
+
+    `population` maps numbers to how often players pick them; the means
+    are weighted by it, the worst cases are over the whole range.
+    """
+    secrets = np.arange(prior.low, prior.high + 1, dtype=np.int64)
+    weights = np.array([population.get(int(n), 0.0) for n in secrets], dtype=float)
+    learned = prior_attempts(prior)
+    bisection = simulate(secrets, prior.low, prior.high)
+    return {
+        "range": (prior.low, prior.high),
+        "mean": float(np.average(learned, weights=weights)),
+        "bisection_mean": float(np.average(bisection, weights=weights)),
+        "worst": int(learned.max()),
+        "bisection_worst": int(bisection.max()),
+        "expected_under_prior": prior.expected_attempts(),
+    }
+
+
+if __name__ == "__main__":
+    low, high = (int(arg) for arg in sys.argv[1:3]) if len(sys.argv) > 2 else (1, 100)
+    for key, value in evaluate(low, high).items():
+        print(f"{key}: {value}")
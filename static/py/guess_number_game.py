@@ -3,23 +3,95 @@ Guess My Number Game - Python/PyScript Implementation
 Adapted from console game to browser GUI
 """
 
-from js import document
-from pyodide.ffi import create_proxy
+from js import document, window
+from pyodide.ffi import JsException
 import random
 
+from arcade_runtime import (
+    DomView, ProxyRegistry, announce_ready, expose_stats, mark_startup, query_param,
+)
+from guess_engine import (
+    DEFAULT_HIGH, DEFAULT_LOW, MAX_LIES, MAX_PRIOR_SIZE, GuessPrior, GuessSearch, LieTolerantSearch,
+    PriorSearch, check_range,
+)
+
+# Mode 1 needs a finite secret, so open-ended games draw it from this many numbers
+OPEN_SECRET_SPAN = 1000
+
+# localStorage key for the numbers players picked in Mode 2, per range
+PRIOR_KEY = "guessPrior:{low}-{high}"
+
+
+def read_range():
+    """Range from ?low=..&high=.. (high=open for no upper bound), else 1-100"""
+    try:
+        low = int(query_param("low") or DEFAULT_LOW)
+        high_param = query_param("high")
+        if high_param == "open":
+            high = None
+        else:
+            high = int(high_param or DEFAULT_HIGH)
+        check_range(low, high)
+    except ValueError:
+        return DEFAULT_LOW, DEFAULT_HIGH
+    return low, high
+
+
+def read_lies():
+    """Lie budget from ?lies=k (0 = classic mode that calls out any slip)"""
+    try:
+        lies = int(query_param("lies") or 0)
+    except ValueError:
+        return 0
+    return max(0, min(lies, MAX_LIES))
+
+
+def load_prior(low, high):
+    """The learned prior for a finite range small enough to tree, else None"""
+    if high is None or high - low + 1 > MAX_PRIOR_SIZE:
+        return None
+    try:
+        text = window.localStorage.getItem(PRIOR_KEY.format(low=low, high=high))
+    except JsException:  # Storage blocked (privacy mode, sandboxed frame)
+        text = None
+    return GuessPrior.from_text(low, high, text)
+
+
+def save_prior(prior):
+    try:
+        window.localStorage.setItem(PRIOR_KEY.format(low=prior.low, high=prior.high), prior.to_text())
+    except JsException:
+        pass
+
+
+class ViewState:
+    """Everything the page shows; handlers change this, DomView draws it"""
+    def __init__(self):
+        self.mode = "MODE 1"
+        self.message = ""
+        self.hint = ""
+        self.hint_color = "#ff00ff"
+        self.range = ""
+        self.attempts = "0"
+        self.controls = None  # 'player', 'computer' or None
+        self.overlay = "start"  # Panel shown over the game, None when closed
+        self.continue_tries = "0"
+        self.result_number = ""
+        self.result_title = ""
+        self.result_color = "#ffffff"
+        self.result_message = ""
+
 
 class GuessNumberGame:
     """Main game class managing both game modes"""
 
-    def __init__(self):
+    def __init__(self, low=None, high=None, max_lies=None):
         # DOM elements
         self.overlay = document.getElementById("game-overlay")
         self.start_btn = document.getElementById("start-btn")
-        self.mode_display = document.getElementById("game-mode")
-        self.message_display = document.getElementById("game-message")
-        self.hint_display = document.getElementById("game-hint")
-        self.range_display = document.getElementById("game-range")
-        self.attempt_display = document.getElementById("attempt-count")
+        self.continue_btn = document.getElementById("continue-btn")
+        self.restart_btn = document.getElementById("restart-btn")
+        self.replay_btn = document.getElementById("replay-btn")
 
         # Player mode controls
         self.player_controls = document.getElementById("player-controls")
@@ -39,22 +111,84 @@ class GuessNumberGame:
         self.player_score = 0
         self.computer_score = 0
 
-        # Computer mode state (binary search)
-        self.low = 1
-        self.high = 100
+        # Number range (high=None is open-ended)
+        if low is None:
+            low, high = read_range()
+        check_range(low, high)
+        self.range_low = low
+        self.range_high = high
+
+        # Wrong HIGHER/LOWER clicks Mode 2 forgives (needs a finite range)
+        if max_lies is None:
+            max_lies = read_lies()
+        self.max_lies = max_lies if high is not None else 0
+
+        # What players picked before steers Mode 2's guesses (small finite ranges)
+        self.prior = load_prior(low, high)
+
+        # Computer mode state
+        self.search = self.new_search()
         self.computer_guess = 0
 
-        # Setup event handlers
+        # Setup event handlers and the batched view
+        self.proxies = ProxyRegistry()
+        self.state = ViewState()
+        self.view = DomView(self.proxies, self.state)
+        self.setup_view()
         self.setup_handlers()
 
+        # The page markup is the first frame; Python takes it over from here
+        mark_startup("first-frame")
+        announce_ready(self.proxies, self.handler(self.start_game))
+
+    def setup_view(self):
+        """Bind each ViewState field to the element that shows it"""
+        view = self.view
+        view.text("mode", document.getElementById("game-mode"))
+        view.text("message", document.getElementById("game-message"))
+        hint = document.getElementById("game-hint")
+        view.text("hint", hint)
+        view.style("hint_color", hint, "color")
+        view.text("range", document.getElementById("game-range"))
+        view.text("attempts", document.getElementById("attempt-count"))
+        view.shown("controls", self.player_controls, "player")
+        view.shown("controls", self.computer_controls, "computer")
+
+        # Overlay panels live in the page; only the visible one changes
+        view.bind("overlay", lambda panel: self.overlay.classList.toggle("hidden", panel is None))
+        for panel in ("start", "continue", "cheater", "result"):
+            view.shown("overlay", document.getElementById(f"panel-{panel}"), panel)
+        view.text("continue_tries", document.getElementById("continue-tries"))
+        view.text("result_number", document.getElementById("result-number"))
+        result_title = document.getElementById("result-title")
+        view.text("result_title", result_title)
+        view.style("result_color", result_title, "color")
+        view.text("result_message", document.getElementById("result-message"))
+
     def setup_handlers(self):
-        """Setup all button click handlers"""
-        self.start_btn.addEventListener("click", create_proxy(lambda e: self.start_game()))
-        self.submit_btn.addEventListener("click", create_proxy(lambda e: self.handle_player_guess()))
-        self.guess_input.addEventListener("keypress", create_proxy(self.handle_keypress))
-        self.btn_higher.addEventListener("click", create_proxy(lambda e: self.handle_computer_feedback("higher")))
-        self.btn_lower.addEventListener("click", create_proxy(lambda e: self.handle_computer_feedback("lower")))
-        self.btn_correct.addEventListener("click", create_proxy(lambda e: self.handle_computer_feedback("correct")))
+        """Setup all button click handlers, once - panels are never rebuilt"""
+        on = self.handler
+        listen = self.proxies.listen
+        listen(self.start_btn, "click", "start", on(self.start_game))
+        listen(self.continue_btn, "click", "continue", on(self.start_computer_mode))
+        listen(self.restart_btn, "click", "restart", on(self.start_game))
+        listen(self.replay_btn, "click", "replay", on(self.start_game))
+        listen(self.submit_btn, "click", "submit", on(self.handle_player_guess))
+        listen(self.guess_input, "keypress", "keypress", on(self.handle_keypress, event=True))
+        listen(self.btn_higher, "click", "higher", on(self.handle_computer_feedback, "higher"))
+        listen(self.btn_lower, "click", "lower", on(self.handle_computer_feedback, "lower"))
+        listen(self.btn_correct, "click", "correct", on(self.handle_computer_feedback, "correct"))
+        expose_stats("arcadeProxyStats", self.proxies)
+
+    def handler(self, fn, *args, event=False):
+        """Event listener that runs fn, then queues one view flush"""
+        def listener(e=None):
+            if event:
+                fn(e, *args)
+            else:
+                fn(*args)
+            self.view.schedule()
+        return listener
 
     def handle_keypress(self, event):
         """Handle Enter key in input field"""
@@ -63,54 +197,58 @@ class GuessNumberGame:
 
     def start_game(self):
         """Start the game with Mode 1 (player guesses)"""
-        self.overlay.classList.add("hidden")
+        self.state.overlay = None
         self.start_player_mode()
 
     def start_player_mode(self):
         """Initialize Mode 1: Player guesses computer's number"""
         self.current_mode = "player"
-        self.secret_number = random.randint(1, 100)
+        self.secret_number = random.randint(self.range_low, self.secret_high())
         self.attempts = 0
 
         # Update display
-        self.mode_display.textContent = "MODE 1: YOUR TURN"
-        self.message_display.textContent = "I'm thinking of a number between 1 and 100..."
-        self.hint_display.textContent = ""
-        self.range_display.textContent = "Range: 1 - 100"
-        self.attempt_display.textContent = "0"
-
-        # Show correct controls
-        self.player_controls.classList.remove("hidden")
-        self.computer_controls.classList.add("hidden")
+        state = self.state
+        state.mode = "MODE 1: YOUR TURN"
+        state.message = f"I'm thinking of a number {self.range_phrase()}..."
+        state.hint = ""
+        state.range = f"Range: {self.range_text()}"
+        state.attempts = "0"
+        state.controls = "player"
+
+        # The input is written directly: it has to be usable before the flush
+        self.guess_input.min = str(self.range_low)
+        self.guess_input.max = "" if self.range_high is None else str(self.range_high)
+        self.guess_input.placeholder = f"Enter {self.range_text()}"
         self.guess_input.value = ""
         self.guess_input.focus()
 
     def handle_player_guess(self):
         """Process the player's guess in Mode 1"""
+        state = self.state
         try:
             guess = int(self.guess_input.value)
         except (ValueError, TypeError):
-            self.hint_display.textContent = "ENTER A NUMBER!"
-            self.hint_display.style.color = "#ff6600"
+            state.hint = "ENTER A NUMBER!"
+            state.hint_color = "#ff6600"
             return
 
-        if guess < 1 or guess > 100:
-            self.hint_display.textContent = "1 TO 100 ONLY!"
-            self.hint_display.style.color = "#ff6600"
+        if not self.in_range(guess):
+            state.hint = self.range_hint()
+            state.hint_color = "#ff6600"
             return
 
         self.attempts += 1
-        self.attempt_display.textContent = str(self.attempts)
+        state.attempts = str(self.attempts)
         self.guess_input.value = ""
 
         if guess < self.secret_number:
-            self.hint_display.textContent = "TOO LOW!"
-            self.hint_display.style.color = "#00ff00"
-            self.message_display.textContent = f"Your guess: {guess}. Try higher!"
+            state.hint = "TOO LOW!"
+            state.hint_color = "#00ff00"
+            state.message = f"Your guess: {guess}. Try higher!"
         elif guess > self.secret_number:
-            self.hint_display.textContent = "TOO HIGH!"
-            self.hint_display.style.color = "#ff6600"
-            self.message_display.textContent = f"Your guess: {guess}. Try lower!"
+            state.hint = "TOO HIGH!"
+            state.hint_color = "#ff6600"
+            state.message = f"Your guess: {guess}. Try lower!"
         else:
             # Correct!
             self.player_wins()
@@ -118,105 +256,112 @@ class GuessNumberGame:
     def player_wins(self):
         """Handle player winning Mode 1"""
         self.player_score = self.attempts
-        self.hint_display.textContent = f"CORRECT! IT WAS {self.secret_number}!"
-        self.hint_display.style.color = "#ff00ff"
-        self.message_display.textContent = f"You got it in {self.attempts} tries!"
-
-        # Hide input, show continue button
-        self.player_controls.classList.add("hidden")
-
-        # Show overlay with continue option
-        self.overlay.classList.remove("hidden")
-        self.overlay.innerHTML = '''
-            <p class="arcade-instructions">NICE GUESSING!</p>
-            <p class="arcade-instructions-sub">You found it in ''' + str(self.attempts) + ''' tries!</p>
-            <p class="arcade-instructions-sub" style="color: #00ffff; margin-top: 1rem;">
-                Now it's MY turn to guess YOUR number!
-            </p>
-            <button id="continue-btn" class="arcade-start-btn">
-                CONTINUE TO MODE 2
-            </button>
-        '''
-        continue_btn = document.getElementById("continue-btn")
-        continue_btn.addEventListener("click", create_proxy(lambda e: self.start_computer_mode()))
+        state = self.state
+        state.hint = f"CORRECT! IT WAS {self.secret_number}!"
+        state.hint_color = "#ff00ff"
+        state.message = f"You got it in {self.attempts} tries!"
+
+        # Hide input, show the continue panel
+        state.controls = None
+        state.continue_tries = str(self.attempts)
+        state.overlay = "continue"
 
     def start_computer_mode(self):
         """Initialize Mode 2: Computer guesses player's number"""
-        self.overlay.classList.add("hidden")
+        state = self.state
+        state.overlay = None
         self.current_mode = "computer"
         self.attempts = 0
-        self.low = 1
-        self.high = 100
+        self.search = self.new_search()
 
         # Update display
-        self.mode_display.textContent = "MODE 2: MY TURN"
-        self.message_display.textContent = "Think of a number between 1 and 100..."
-        self.hint_display.textContent = "GOT IT? CLICK BELOW!"
-        self.hint_display.style.color = "#00ffff"
-        self.range_display.textContent = "I'll try to guess it!"
-        self.attempt_display.textContent = "0"
-
-        # Show correct controls
-        self.player_controls.classList.add("hidden")
-        self.computer_controls.classList.remove("hidden")
+        state.mode = "MODE 2: MY TURN"
+        message = f"Think of a number {self.range_phrase()}..."
+        if self.max_lies:
+            message += f" You may fib up to {self.max_lies} time{'s' if self.max_lies > 1 else ''}!"
+        state.message = message
+        state.hint = "GOT IT? CLICK BELOW!"
+        state.hint_color = "#00ffff"
+        state.range = "I'll try to guess it!"
+        state.attempts = "0"
+        state.controls = "computer"
 
         # Make first guess after short delay
         self.make_computer_guess()
 
+    def new_search(self):
+        """Fresh Mode 2 search for the configured range and lie budget"""
+        if self.max_lies:
+            return LieTolerantSearch(self.range_low, self.range_high, self.max_lies)
+        if self.prior is not None:
+            return PriorSearch(self.prior)
+        return GuessSearch(self.range_low, self.range_high)
+
+    def secret_high(self):
+        """Largest number the computer may pick in Mode 1"""
+        if self.range_high is None:
+            return self.range_low + OPEN_SECRET_SPAN - 1
+        return self.range_high
+
+    def in_range(self, number):
+        return number >= self.range_low and (self.range_high is None or number <= self.range_high)
+
+    def range_text(self):
+        if self.range_high is None:
+            return f"{self.range_low}+"
+        return f"{self.range_low} - {self.range_high}"
+
+    def range_hint(self):
+        if self.range_high is None:
+            return f"{self.range_low} OR MORE!"
+        return f"{self.range_low} TO {self.range_high} ONLY!"
+
+    def range_phrase(self):
+        if self.range_high is None:
+            return f"of {self.range_low} or more"
+        return f"between {self.range_low} and {self.range_high}"
+
     def make_computer_guess(self):
-        """Computer makes a guess using binary search"""
+        """Computer makes a guess: walks the learned tree, or gallops while the range is open, then bisects"""
         self.attempts += 1
-        self.attempt_display.textContent = str(self.attempts)
+        self.computer_guess = self.search.next_guess()
 
-        # Binary search: guess middle of range
-        self.computer_guess = (self.low + self.high) // 2
-
-        self.message_display.textContent = "Is your number..."
-        self.hint_display.textContent = str(self.computer_guess) + "?"
-        self.hint_display.style.color = "#ff00ff"
-        self.range_display.textContent = f"Searching: {self.low} - {self.high}"
+        state = self.state
+        state.attempts = str(self.attempts)
+        state.message = "Is your number..."
+        state.hint = str(self.computer_guess) + "?"
+        state.hint_color = "#ff00ff"
+        high = "?" if self.search.open else self.search.high
+        state.range = f"Searching: {self.search.low} - {high}"
 
     def handle_computer_feedback(self, feedback):
         """Process player's feedback on computer's guess"""
-        if feedback == "higher":
-            self.low = self.computer_guess + 1
-            if self.low > self.high:
-                self.cheating_detected()
-                return
-            self.make_computer_guess()
-
-        elif feedback == "lower":
-            self.high = self.computer_guess - 1
-            if self.high < self.low:
-                self.cheating_detected()
-                return
-            self.make_computer_guess()
-
-        elif feedback == "correct":
+        if feedback == "correct":
             self.computer_wins()
+        elif self.search.feedback(feedback):
+            self.make_computer_guess()
+        else:
+            self.cheating_detected()
 
     def cheating_detected(self):
         """Handle impossible feedback (player cheated)"""
-        self.hint_display.textContent = "HEY! NO CHEATING!"
-        self.hint_display.style.color = "#ff0000"
-        self.message_display.textContent = "That's mathematically impossible... Let's try again!"
-        self.computer_controls.classList.add("hidden")
-
-        self.overlay.classList.remove("hidden")
-        self.overlay.innerHTML = '''
-            <p class="arcade-instructions" style="color: #ff0000;">CHEATER DETECTED!</p>
-            <p class="arcade-instructions-sub">Your answers don't add up...</p>
-            <button id="restart-btn" class="arcade-start-btn">
-                TRY AGAIN
-            </button>
-        '''
-        restart_btn = document.getElementById("restart-btn")
-        restart_btn.addEventListener("click", create_proxy(lambda e: self.start_game()))
+        state = self.state
+        state.hint = "HEY! NO CHEATING!"
+        state.hint_color = "#ff0000"
+        state.message = "That's mathematically impossible... Let's try again!"
+        state.controls = None
+        state.overlay = "cheater"
 
     def computer_wins(self):
         """Handle computer guessing correctly in Mode 2"""
         self.computer_score = self.attempts
-        self.computer_controls.classList.add("hidden")
+        state = self.state
+        state.controls = None
+
+        # Remember the player's pick so later rounds find it sooner
+        if self.prior is not None:
+            self.prior.record(self.computer_guess)
+            save_prior(self.prior)
 
         # Compare scores
         if self.player_score < self.computer_score:
@@ -232,17 +377,11 @@ class GuessNumberGame:
             result_color = "#ffff00"
             result_msg = f"Both guessed in {self.player_score} tries!"
 
-        self.overlay.classList.remove("hidden")
-        self.overlay.innerHTML = f'''
-            <p class="arcade-instructions">YOUR NUMBER: {self.computer_guess}</p>
-            <p class="arcade-instructions" style="color: {result_color}; margin-top: 1rem;">{result}</p>
-            <p class="arcade-instructions-sub">{result_msg}</p>
-            <button id="replay-btn" class="arcade-start-btn" style="margin-top: 1.5rem;">
-                PLAY AGAIN
-            </button>
-        '''
-        replay_btn = document.getElementById("replay-btn")
-        replay_btn.addEventListener("click", create_proxy(lambda e: self.start_game()))
+        state.result_number = str(self.computer_guess)
+        state.result_title = result
+        state.result_color = result_color
+        state.result_message = result_msg
+        state.overlay = "result"
 
 
 # Initialize game when script loads
@@ -0,0 +1,215 @@
+"""
+Classic Tennis/Pong Game - Arena Mode Physics
+Destructible bricks mid-court, bucketed in a uniform grid so the ball only
+tests the bricks in cells it sweeps through, however many there are
+"""
+
+from array import array
+import math
+
+from tennis_core import (
+    BALL_RADIUS, BALL_START_SPEED, CANVAS_HEIGHT, CANVAS_WIDTH, TennisSimulation, sweep_ball,
+)
+
+ARENA_BRICKS = 300  # Default brick count (?arena=N picks another)
+MAX_ARENA_BRICKS = 4000
+BRICK_GAP = 2  # Pixels between neighbouring bricks
+
+# Bricks fill two blocks (x ranges) either side of a clear serving lane
+BRICK_BLOCKS = ((200, 340), (460, 600))
+BRICK_MARGIN = 20  # Clear space above and below the blocks
+
+# Brick rallies return the ball to a paddle far more often than tennis does,
+# so its speed-up per paddle hit is capped (pixels per tick, horizontally)
+MAX_ARENA_SPEED = 3 * BALL_START_SPEED
+
+# Grid cells are at least a ball across, so a tick's sweep touches few cells
+MIN_CELL_SIZE = 2 * BALL_RADIUS
+
+# Which way a brick hit reverses the ball
+AXIS_X = 0
+AXIS_Y = 1
+
+
+def read_brick_count(value):
+    """Brick count from a ?arena= value, clamped to what the mode supports"""
+    try:
+        count = int(value) if value else ARENA_BRICKS
+    except ValueError:
+        return ARENA_BRICKS
+    return max(1, min(count, MAX_ARENA_BRICKS))
+
+
+def arena_layout(count):
+    """Rects (x, y, w, h) for `count` equal square bricks, and their pitch
+
+    The pitch is the largest that fits them all in the blocks; rows fill
+    across both blocks and the whole wall is centred vertically.
+    """
+    height = CANVAS_HEIGHT - 2 * BRICK_MARGIN
+    area = sum(hi - lo for lo, hi in BRICK_BLOCKS) * height
+    pitch = max(int(math.sqrt(area / count)), BRICK_GAP + 1)
+    while pitch > BRICK_GAP + 1:
+        columns = sum((hi - lo) // pitch for lo, hi in BRICK_BLOCKS)
+        if columns * (height // pitch) >= count:
+            break
+        pitch -= 1
+    columns = sum((hi - lo) // pitch for lo, hi in BRICK_BLOCKS)
+    rows = math.ceil(count / columns)
+    top = (CANVAS_HEIGHT - rows * pitch) // 2
+
+    rects = []
+    size = pitch - BRICK_GAP
+    for row in range(rows):
+        for lo, hi in BRICK_BLOCKS:
+            for column in range((hi - lo) // pitch):
+                if len(rects) < count:
+                    rects.append((lo + column * pitch, top + row * pitch, size, size))
+    return rects, pitch
+
+
+class BrickGrid:
+    """Live bricks bucketed into a uniform grid of square cells
+
+    Brick geometry is struct-of-arrays; each cell lists the bricks that
+    overlap it. A query visits only the cells under the ball's swept box and
+    stamps every brick it tests, so one spanning several cells is tested
+    once. Breaking a brick just removes it from its few cells, so the grid
+    is never rebuilt during a match.
+
+    This is the `obstacles` argument of tennis_core.sweep_ball.
+    """
+    def __init__(self, rects, cell_size):
+        self.cell_size = cell_size
+        self.columns = math.ceil(CANVAS_WIDTH / cell_size)
+        self.rows = math.ceil(CANVAS_HEIGHT / cell_size)
+        self.x = array("d", (r[0] for r in rects))
+        self.y = array("d", (r[1] for r in rects))
+        self.w = array("d", (r[2] for r in rects))
+        self.h = array("d", (r[3] for r in rects))
+        self.alive = array("B", [1]) * len(rects)
+        self.stamps = array("l", [0]) * len(rects)
+        self.stamp = 0
+        self.live = len(rects)
+        self.broken = []  # Bricks broken since the renderer last drained them
+        self.queries = 0  # Sweeps asked about, and brick tests they ran (for the benchmarks)
+        self.tests = 0
+        self.cells = [[] for _ in range(self.columns * self.rows)]
+        for i in range(len(rects)):
+            for cell in self.cells_under(self.x[i], self.y[i], self.x[i] + self.w[i], self.y[i] + self.h[i]):
+                self.cells[cell].append(i)
+
+    def cells_under(self, x0, y0, x1, y1):
+        """Indices of the cells a box overlaps, clamped to the court"""
+        size = self.cell_size
+        cx0 = max(int(x0 // size), 0)
+        cx1 = min(int(x1 // size), self.columns - 1)
+        cy0 = max(int(y0 // size), 0)
+        cy1 = min(int(y1 // size), self.rows - 1)
+        return [cy * self.columns + cx for cy in range(cy0, cy1 + 1) for cx in range(cx0, cx1 + 1)]
+
+    def rect(self, i):
+        return (self.x[i], self.y[i], self.w[i], self.h[i])
+
+    def live_rects(self):
+        """{index: rect} of every brick still standing"""
+        return {i: self.rect(i) for i in range(len(self.alive)) if self.alive[i]}
+
+    def remove(self, i):
+        """Break brick i, taking it out of its cells"""
+        self.alive[i] = 0
+        self.live -= 1
+        for cell in self.cells_under(self.x[i], self.y[i], self.x[i] + self.w[i], self.y[i] + self.h[i]):
+            self.cells[cell].remove(i)
+        self.broken.append(i)
+
+    def time_of_impact(self, ball, limit):
+        """(ticks, brick, axis) of the first brick the ball touches within `limit`, or None
+
+        Each candidate gets the paddles' slab test: the ball centre against
+        the brick grown by the radius. A ball already overlapping a brick
+        isn't hitting it (it can only be leaving).
+        """
+        r = ball.radius
+        end_x = ball.x + ball.vx * limit
+        end_y = ball.y + ball.vy * limit
+        self.queries += 1
+        self.stamp += 1
+        stamp = self.stamp
+        stamps = self.stamps
+        best = None
+        for cell in self.cells_under(min(ball.x, end_x) - r, min(ball.y, end_y) - r,
+                                     max(ball.x, end_x) + r, max(ball.y, end_y) + r):
+            for i in self.cells[cell]:
+                if stamps[i] == stamp:
+                    continue
+                stamps[i] = stamp
+                self.tests += 1
+                hit = self.brick_impact(ball, i, limit if best is None else best[0])
+                if hit is not None:
+                    best = (hit[0], i, hit[1])
+        return best
+
+    def brick_impact(self, ball, i, limit):
+        """(ticks, axis) until the ball enters brick i's grown box, or None past `limit`"""
+        r = ball.radius
+        t_enter = -math.inf
+        t_exit = limit
+        axis = AXIS_X
+        slabs = (
+            (AXIS_X, ball.x, ball.vx, self.x[i] - r, self.x[i] + self.w[i] + r),
+            (AXIS_Y, ball.y, ball.vy, self.y[i] - r, self.y[i] + self.h[i] + r),
+        )
+        for slab_axis, pos, vel, lo, hi in slabs:
+            if vel == 0:
+                if pos < lo or pos > hi:
+                    return None
+                continue
+            t0 = (lo - pos) / vel
+            t1 = (hi - pos) / vel
+            if t0 > t1:
+                t0, t1 = t1, t0
+            if t0 > t_enter:
+                t_enter = t0
+                axis = slab_axis
+            t_exit = min(t_exit, t1)
+        if t_enter < 0 or t_enter > t_exit:
+            return None
+        return t_enter, axis
+
+    def bounce(self, ball, impact):
+        """Reflect the ball off the brick it reached and break the brick"""
+        _, i, axis = impact
+        if axis == AXIS_X:
+            ball.vx = -ball.vx
+        else:
+            ball.vy = -ball.vy
+        ball.trajectory += 1  # The AI's read of the ball is stale now
+        self.remove(i)
+
+
+class ArenaSimulation(TennisSimulation):
+    """TennisSimulation with a wall of bricks between the paddles
+
+    Every match starts with a fresh wall; bricks break on contact and the
+    ball bounces off them. Scoring is unchanged.
+    """
+    def __init__(self, bricks=ARENA_BRICKS, difficulty=0.5, rng=None):
+        super().__init__(difficulty, rng)
+        self.bricks = bricks
+        self.layout, pitch = arena_layout(bricks)
+        self.cell_size = max(pitch, MIN_CELL_SIZE)
+        self.grid = BrickGrid(self.layout, self.cell_size)
+
+    def reset_match(self, seed=None):
+        """Rebuild the wall, then reset as usual"""
+        self.grid = BrickGrid(self.layout, self.cell_size)
+        super().reset_match(seed)
+
+    def move_ball(self, dt=1.0):
+        """Move ball, resolving wall, brick and paddle hits along the way"""
+        ball = self.ball
+        hits = sweep_ball(ball, (self.player, self.ai_paddle), dt, self.grid)
+        if hits:
+            ball.vx = max(-MAX_ARENA_SPEED, min(ball.vx, MAX_ARENA_SPEED))
+        self.rally_hits += len(hits)
@@ -0,0 +1,172 @@
+"""
+Classic Tennis/Pong Game - Batched Simulation Runner
+Steps thousands of independent matches at once as NumPy arrays, using the
+same rules as tennis_core.TennisSimulation, for offline analysis
+"""
+
+import time
+
+import numpy as np
+
+from tennis_core import (
+    AI_BANK_ERROR, AI_ERROR_RANGE, AI_MOVE_SPEED, AI_REACTION_FRAMES, BALL_RADIUS,
+    BALL_START_SPEED, CANVAS_HEIGHT, CANVAS_WIDTH, PADDLE_HEIGHT, WINNING_SCORE, fold_y,
+)
+from tennis_vec import AI_FACE, sweep_paddles
+
+PADDLE_START_Y = CANVAS_HEIGHT / 2 - PADDLE_HEIGHT / 2
+
+# Scripted player: tracks the ball centre at a capped speed
+DEFAULT_PLAYER_SPEED = 8.0
+
+
+class BatchTennis:
+    """N independent matches of player-model vs AIController, one array slot each"""
+    def __init__(self, n, difficulty=0.5, player_speed=DEFAULT_PLAYER_SPEED, seed=None):
+        self.n = n
+        self.difficulty = np.broadcast_to(np.asarray(difficulty, dtype=np.float64), (n,)).copy()
+        self.player_speed = np.broadcast_to(np.asarray(player_speed, dtype=np.float64), (n,)).copy()
+        self.rng = np.random.default_rng(seed)
+
+        # Ball state
+        self.bx = np.empty(n)
+        self.by = np.empty(n)
+        self.bvx = np.empty(n)
+        self.bvy = np.empty(n)
+
+        # Paddle state
+        self.player_y = np.full(n, PADDLE_START_Y)
+        self.ai_y = np.full(n, PADDLE_START_Y)
+
+        # AIController state
+        self.ai_target = np.full(n, CANVAS_HEIGHT / 2)
+        self.ai_delay = np.zeros(n, dtype=np.int32)
+        self.ai_frames = np.zeros(n, dtype=np.int32)
+        self.ai_last_vx = np.zeros(n)
+        self.ai_aimed = np.zeros(n, dtype=bool)  # Target set for the current trajectory
+
+        # Scores and counters
+        self.player_score = np.zeros(n, dtype=np.int32)
+        self.ai_score = np.zeros(n, dtype=np.int32)
+        self.player_wins = np.zeros(n, dtype=np.int64)
+        self.ai_wins = np.zeros(n, dtype=np.int64)
+        self.rally_hits = np.zeros(n, dtype=np.int32)
+        self.rallies = 0
+        self.total_hits = 0
+        self.ticks = 0
+
+        self.serve(np.ones(n, dtype=bool))
+
+    def serve(self, mask):
+        """Reset the ball to the centre for every match selected by mask"""
+        count = int(mask.sum())
+        if count == 0:
+            return
+        angle = self.rng.uniform(-0.5, 0.5, count)
+        direction = self.rng.choice(np.array([-1.0, 1.0]), count)
+        self.bx[mask] = CANVAS_WIDTH / 2
+        self.by[mask] = CANVAS_HEIGHT / 2
+        self.bvx[mask] = BALL_START_SPEED * direction
+        self.bvy[mask] = BALL_START_SPEED * angle
+        self.ai_aimed[mask] = False
+
+    def step(self):
+        """Advance every match by one tick"""
+        r = BALL_RADIUS
+
+        self.move_ball()
+        self.update_ai()
+        self.update_player()
+
+        # Scoring
+        ai_point = self.bx - r <= 0
+        player_point = ~ai_point & (self.bx + r >= CANVAS_WIDTH)
+        self.ai_score += ai_point
+        self.player_score += player_point
+        point = ai_point | player_point
+        if point.any():
+            self.rallies += int(point.sum())
+            self.rally_hits[point] = 0
+            ai_won = self.ai_score >= WINNING_SCORE
+            player_won = self.player_score >= WINNING_SCORE
+            self.ai_wins += ai_won
+            self.player_wins += player_won
+            over = ai_won | player_won
+            self.ai_score[over] = 0
+            self.player_score[over] = 0
+            self.serve(point)
+        self.ticks += 1
+
+    def move_ball(self):
+        """Swept ball motion (tennis_vec.sweep_paddles), then the hit counters"""
+        self.bx, self.by, self.bvx, self.bvy, hit = sweep_paddles(
+            self.bx, self.by, self.bvx, self.bvy, self.player_y, self.ai_y,
+        )
+
+        self.rally_hits += hit
+        self.total_hits += int(hit.sum())
+        self.ai_aimed &= ~hit
+
+    def update_ai(self):
+        """Vectorised AIController.update"""
+        turned = (self.bvx > 0) & (self.ai_last_vx <= 0)
+        count = int(turned.sum())
+        if count:
+            self.ai_frames[turned] = 0
+            lo, hi = AI_REACTION_FRAMES
+            self.ai_delay[turned] = self.rng.integers(lo, hi + 1, count)
+        self.ai_last_vx[:] = self.bvx
+
+        approaching = self.bvx > 0
+        self.ai_frames += approaching
+        thinking = approaching & (self.ai_frames < self.ai_delay)
+        aiming = approaching & ~thinking & ~self.ai_aimed
+        count = int(aiming.sum())
+        if count:
+            # Same closed-form intercept and error model as AIController
+            vx = self.bvx[aiming]
+            raw_y = self.by[aiming] + self.bvy[aiming] * np.maximum(AI_FACE - self.bx[aiming], 0) / vx
+            predicted, _ = fold_y(raw_y)
+            bounces = np.abs((raw_y - BALL_RADIUS) // (CANVAS_HEIGHT - 2 * BALL_RADIUS))
+            spread = (1 - self.difficulty[aiming]) * AI_ERROR_RANGE * (1 + AI_BANK_ERROR * bounces)
+            self.ai_target[aiming] = predicted + self.rng.uniform(-1.0, 1.0, count) * spread
+            self.ai_aimed[aiming] = True
+
+        diff = self.ai_target - (self.ai_y + PADDLE_HEIGHT / 2)
+        speed = AI_MOVE_SPEED * self.difficulty
+        move = np.where(np.abs(diff) > speed, np.sign(diff) * speed, 0.0)
+        move[thinking] = 0.0
+        self.ai_y += move
+        np.clip(self.ai_y, 0, CANVAS_HEIGHT - PADDLE_HEIGHT, out=self.ai_y)
+
+    def update_player(self):
+        """Scripted player model: chase the ball with a capped speed"""
+        diff = self.by - (self.player_y + PADDLE_HEIGHT / 2)
+        self.player_y += np.clip(diff, -self.player_speed, self.player_speed)
+        np.clip(self.player_y, 0, CANVAS_HEIGHT - PADDLE_HEIGHT, out=self.player_y)
+
+    def run(self, ticks):
+        """Step every match `ticks` times and return a summary dict"""
+        start = time.perf_counter()
+        rallies_before = self.rallies
+        for _ in range(ticks):
+            self.step()
+        elapsed = time.perf_counter() - start
+        rallies = self.rallies - rallies_before
+        return {
+            "matches": self.n,
+            "ticks": ticks,
+            "seconds": elapsed,
+            "rallies": rallies,
+            "rallies_per_second": rallies / elapsed if elapsed else 0.0,
+            "ticks_per_second": self.n * ticks / elapsed if elapsed else 0.0,
+            "player_wins": int(self.player_wins.sum()),
+            "ai_wins": int(self.ai_wins.sum()),
+        }
+
+
+if __name__ == "__main__":
+    batch = BatchTennis(10_000, seed=0)
+    summary = batch.run(2_000)
+    for key, value in summary.items():
+        print(f"{key}: {value}")
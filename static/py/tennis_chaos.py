@@ -0,0 +1,146 @@
+"""
+Classic Tennis/Pong Game - Chaos Mode Physics
+Hundreds of balls on one court, held as struct-of-arrays NumPy state so wall
+bounces, paddle hits and scoring are each one vectorised pass per tick
+"""
+
+import numpy as np
+
+from tennis_core import (
+    AI_MOVE_SPEED, BALL_RADIUS, BALL_START_SPEED, CANVAS_HEIGHT, CANVAS_WIDTH, PADDLE_HEIGHT,
+    PHYSICS_RATE, fold_y,
+)
+from tennis_vec import AI_FACE, sweep_paddles
+
+CHAOS_BALLS = 500  # Default ball count (?chaos=N picks another)
+MAX_CHAOS_BALLS = 5000
+CHAOS_SECONDS = 30  # Match length; whoever scored more when it runs out wins
+CHAOS_TICKS = CHAOS_SECONDS * PHYSICS_RATE
+
+
+def read_ball_count(value):
+    """Ball count from a ?chaos= value, clamped to what the mode supports"""
+    try:
+        count = int(value) if value else CHAOS_BALLS
+    except ValueError:
+        return CHAOS_BALLS
+    return max(1, min(count, MAX_CHAOS_BALLS))
+
+
+class ChaosField:
+    """Every ball's position and velocity as contiguous float64 arrays
+
+    Slot i of x/y/vx/vy is one ball; prev_x/prev_y hold the positions a tick
+    ago for interpolated drawing. Paddles stay scalar (there are only two),
+    and the AI chases whichever ball will reach it first.
+    """
+    def __init__(self, n=CHAOS_BALLS, difficulty=0.5, seed=None):
+        self.n = n
+        self.difficulty = difficulty
+        self.rng = np.random.default_rng(seed)
+        self.x = np.empty(n)
+        self.y = np.empty(n)
+        self.vx = np.empty(n)
+        self.vy = np.empty(n)
+        self.prev_x = np.empty(n)
+        self.prev_y = np.empty(n)
+        self.points = np.empty(2 * n, dtype=np.float32)  # Interleaved sprite corners for drawing
+        self.hits = 0
+        self.ticks = 0.0
+        self.reset()
+
+    def reset(self):
+        """Serve every ball and restart the clock"""
+        self.serve(np.ones(self.n, dtype=bool))
+        # Spread the opening serves over the court so they don't start as a clump
+        self.x[:] = self.rng.uniform(CANVAS_WIDTH / 4, 3 * CANVAS_WIDTH / 4, self.n)
+        self.save_previous()
+        self.hits = 0
+        self.ticks = 0.0
+
+    @property
+    def time_left(self):
+        """Seconds until the match ends"""
+        return max(CHAOS_TICKS - self.ticks, 0) / PHYSICS_RATE
+
+    def serve(self, mask):
+        """Put the balls selected by mask back on the centre line, heading off at random"""
+        count = int(np.count_nonzero(mask))
+        if count == 0:
+            return
+        angle = self.rng.uniform(-0.5, 0.5, count)
+        direction = self.rng.choice(np.array([-1.0, 1.0]), count)
+        self.x[mask] = CANVAS_WIDTH / 2
+        self.y[mask] = self.rng.uniform(BALL_RADIUS, CANVAS_HEIGHT - BALL_RADIUS, count)
+        self.vx[mask] = BALL_START_SPEED * direction
+        self.vy[mask] = BALL_START_SPEED * angle
+        # Re-served balls jump, so don't interpolate them from where they were
+        self.prev_x[mask] = self.x[mask]
+        self.prev_y[mask] = self.y[mask]
+
+    def save_previous(self):
+        np.copyto(self.prev_x, self.x)
+        np.copyto(self.prev_y, self.y)
+
+    def step(self, player_y, ai_y, dt=1.0):
+        """Advance every ball `dt` ticks; returns (player_points, ai_points)"""
+        self.move(player_y, ai_y, dt)
+        self.ticks += dt
+        return self.score()
+
+    def move(self, player_y, ai_y, dt=1.0):
+        """Swept motion for all balls (tennis_vec.sweep_paddles) against the two paddles"""
+        self.x, self.y, self.vx, self.vy, hit = sweep_paddles(
+            self.x, self.y, self.vx, self.vy, player_y, ai_y, dt,
+        )
+        self.hits += int(np.count_nonzero(hit))
+
+    def score(self):
+        """Re-serve every ball past a paddle; returns (player_points, ai_points)"""
+        ai_point = self.x - BALL_RADIUS <= 0
+        player_point = self.x + BALL_RADIUS >= CANVAS_WIDTH
+        point = ai_point | player_point
+        self.serve(point)
+        return int(np.count_nonzero(player_point)), int(np.count_nonzero(ai_point))
+
+    def ai_target(self):
+        """Intercept y of the incoming ball that reaches the AI soonest
+
+        With no ball on its way the AI drifts back to the middle.
+        """
+        incoming = (self.vx > 0) & (self.x <= AI_FACE)
+        if not incoming.any():
+            return CANVAS_HEIGHT / 2
+        eta = np.where(incoming, (AI_FACE - self.x) / self.vx, np.inf)
+        i = int(np.argmin(eta))
+        target, _ = fold_y(self.y[i] + self.vy[i] * eta[i])
+        return float(target)
+
+    def move_ai(self, ai_y, dt=1.0):
+        """New AI paddle top: towards ai_target at the difficulty's speed"""
+        diff = self.ai_target() - (ai_y + PADDLE_HEIGHT / 2)
+        speed = AI_MOVE_SPEED * self.difficulty * dt
+        if abs(diff) > speed:
+            ai_y += speed if diff > 0 else -speed
+        return max(0, min(ai_y, CANVAS_HEIGHT - PADDLE_HEIGHT))
+
+    def over(self):
+        """True once the match clock has run out"""
+        return self.ticks >= CHAOS_TICKS
+
+    def blend(self, alpha):
+        """Ball positions `alpha` of the way into the last tick, as two arrays"""
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
+
+    def sprite_points(self, alpha, half, scale=1.0):
+        """Top-left canvas pixel of each ball's sprite `alpha` into the last tick
+
+        `half` is half the sprite's size and `scale` canvas pixels per court
+        unit. Filled into one reused float32 array as x0, y0, x1, y1, ... -
+        the layout CommandBuffer.images copies straight into its buffer.
+        """
+        x, y = self.blend(alpha)
+        np.rint(x * scale - half, out=self.points[0::2], casting="unsafe")
+        np.rint(y * scale - half, out=self.points[1::2], casting="unsafe")
+        return self.points
@@ -0,0 +1,397 @@
+"""
+Classic Tennis/Pong Game - Simulation Core
+Ball, paddle and AI physics with no browser dependencies, so the same rules
+run in Pyodide and under plain CPython
+"""
+
+import random
+
+# Game constants
+CANVAS_WIDTH = 800
+CANVAS_HEIGHT = 600
+PADDLE_WIDTH = 15
+PADDLE_HEIGHT = 100
+BALL_RADIUS = 10
+PADDLE_OFFSET = 30
+WINNING_SCORE = 3
+
+# Velocities are in pixels per tick at PHYSICS_RATE; other tick rates pass dt
+PHYSICS_RATE = 60
+
+# Fixed-timestep scheduling
+TICK_RATE = 60  # Simulation ticks per second, independent of display refresh
+MAX_CATCHUP_STEPS = 5  # Ticks run per frame at most before dropping time
+
+# Ball speed constants
+BALL_START_SPEED = 6
+BALL_SPEEDUP = 1.05
+BALL_SPIN = 10
+
+# AIController tuning
+AI_REACTION_FRAMES = (15, 35)  # Ticks before the AI reacts to a return
+AI_ERROR_RANGE = 150  # Aim error at difficulty 0, in pixels either side
+AI_BANK_ERROR = 0.5  # Extra aim error per wall bounce in the predicted path
+AI_MOVE_SPEED = 5
+
+# Collision events resolved per sweep before the rest of the tick is dropped
+MAX_SWEEP_EVENTS = 16
+
+# Scoring events returned by TennisSimulation.step
+SCORE_PLAYER = "player"
+SCORE_AI = "ai"
+
+
+class Paddle:
+    """Represents a paddle in the game"""
+    __slots__ = ("x", "y", "width", "height", "score")
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.width = PADDLE_WIDTH
+        self.height = PADDLE_HEIGHT
+        self.score = 0
+
+    def move_to(self, y):
+        """Move paddle to y position (clamped to canvas bounds)"""
+        self.y = max(0, min(y - self.height / 2, CANVAS_HEIGHT - self.height))
+
+
+class Ball:
+    """Represents the ball in the game"""
+    __slots__ = ("rng", "trajectory", "x", "y", "radius", "speed", "vx", "vy")
+
+    def __init__(self, rng=None):
+        self.rng = rng or random
+        # Bumped whenever the ball starts a new path (serve or paddle hit);
+        # wall bounces don't count since predictions fold them in already
+        self.trajectory = 0
+        self.reset()
+
+    def reset(self):
+        """Reset ball to center with random direction"""
+        self.x = CANVAS_WIDTH / 2
+        self.y = CANVAS_HEIGHT / 2
+        self.radius = BALL_RADIUS
+
+        # Random direction with slight angle
+        angle = self.rng.uniform(-0.5, 0.5)
+        direction = self.rng.choice([-1, 1])
+
+        self.speed = BALL_START_SPEED
+        self.vx = self.speed * direction
+        self.vy = self.speed * angle
+        self.trajectory += 1
+
+
+class AIController:
+    """AI controller for the computer paddle
+
+    Difficulty acts through two explicit models: a reaction delay before the
+    AI starts tracking a return, and an aiming error drawn once per ball
+    trajectory that grows with the number of wall bounces it has to read.
+    The intercept itself is exact and only recomputed when the ball's
+    trajectory changes.
+    """
+    def __init__(self, paddle, difficulty=0.5, rng=None):
+        self.paddle = paddle
+        self.difficulty = difficulty
+        self.rng = rng or random
+        self.predictions = 0
+        self.reset()
+
+    def reset(self):
+        """Forget everything about the current point (new match)"""
+        self.target_y = CANVAS_HEIGHT / 2
+        self.reaction_delay = 0  # Frames before AI reacts to ball direction change
+        self.frames_since_direction_change = 0
+        self.last_ball_vx = 0
+        self.trajectory = None  # ball.trajectory that target_y was aimed for
+
+    def sample_reaction_delay(self):
+        """Reaction model: ticks the AI waits before tracking a return"""
+        return self.rng.randint(*AI_REACTION_FRAMES)
+
+    def sample_aim_error(self, bounces):
+        """Error model: pixel offset added to the true intercept"""
+        spread = (1 - self.difficulty) * AI_ERROR_RANGE * (1 + AI_BANK_ERROR * bounces)
+        return self.rng.uniform(-spread, spread)
+
+    def update(self, ball, dt=1.0):
+        """Update AI paddle position based on ball"""
+        # Detect when ball changes direction (was hit by player)
+        if ball.vx > 0 and self.last_ball_vx <= 0:
+            self.frames_since_direction_change = 0
+            self.reaction_delay = self.sample_reaction_delay()
+        self.last_ball_vx = ball.vx
+
+        # Only react when ball is coming towards AI AND after reaction delay
+        if ball.vx > 0:
+            self.frames_since_direction_change += dt
+
+            # Wait for reaction delay before tracking
+            if self.frames_since_direction_change < self.reaction_delay:
+                return  # AI is "thinking"
+
+            # Aim once per trajectory; the intercept can't change until it does
+            if self.trajectory != ball.trajectory:
+                self.trajectory = ball.trajectory
+                predicted_y, bounces = predict_intercept(ball, self.paddle.x - ball.radius)
+                self.target_y = predicted_y + self.sample_aim_error(bounces)
+                self.predictions += 1
+
+        # Move towards target with some lag
+        diff = self.target_y - (self.paddle.y + self.paddle.height / 2)
+        move_speed = AI_MOVE_SPEED * self.difficulty * dt  # Slightly slower base speed
+
+        if abs(diff) > move_speed:
+            if diff > 0:
+                self.paddle.y += move_speed
+            else:
+                self.paddle.y -= move_speed
+
+        # Clamp to bounds
+        self.paddle.y = max(0, min(self.paddle.y, CANVAS_HEIGHT - self.paddle.height))
+
+
+def fold_y(y, radius=BALL_RADIUS):
+    """Reflect an unbounded y back onto the court as if it bounced off the walls
+
+    Returns (folded_y, flipped) where flipped is 1 when an odd number of
+    bounces reversed vy. Works on floats and on NumPy arrays alike.
+    """
+    low = radius
+    span = CANVAS_HEIGHT - 2 * radius
+    k = (y - low) // span
+    m = (y - low) - k * span
+    flipped = k % 2
+    return low + m + flipped * (span - 2 * m), flipped
+
+
+def predict_intercept(ball, x):
+    """Ball-centre y when it reaches `x`, and the wall bounces on the way
+
+    O(1) via fold_y instead of stepping the ball. A ball that has already
+    passed `x` reports its current y.
+    """
+    if ball.vx == 0 or (x - ball.x) / ball.vx < 0:
+        return ball.y, 0
+    raw_y = ball.y + ball.vy * (x - ball.x) / ball.vx
+    y, _ = fold_y(raw_y, ball.radius)
+    bounces = int(abs((raw_y - ball.radius) // (CANVAS_HEIGHT - 2 * ball.radius)))
+    return y, bounces
+
+
+def wall_time_of_impact(ball, limit):
+    """Ticks until the ball touches the top/bottom wall, or None past `limit`"""
+    if ball.vy < 0:
+        t = (ball.radius - ball.y) / ball.vy
+    elif ball.vy > 0:
+        t = (CANVAS_HEIGHT - ball.radius - ball.y) / ball.vy
+    else:
+        return None
+    t = max(t, 0.0)
+    return t if t <= limit else None
+
+
+def paddle_time_of_impact(ball, paddle, limit):
+    """Ticks until the moving ball first overlaps `paddle`, or None past `limit`
+
+    Slab test of the ball centre against the paddle grown by the radius on
+    its left and right (the hit rule is "edge touches the paddle while the
+    centre is within its height"). Only a ball heading towards the paddle's
+    open side can hit it.
+    """
+    if paddle.x < CANVAS_WIDTH / 2:
+        if ball.vx >= 0:
+            return None
+    elif ball.vx <= 0:
+        return None
+
+    t_enter = 0.0
+    t_exit = limit
+    slabs = (
+        (ball.x, ball.vx, paddle.x - ball.radius, paddle.x + paddle.width + ball.radius),
+        (ball.y, ball.vy, paddle.y, paddle.y + paddle.height),
+    )
+    for pos, vel, lo, hi in slabs:
+        if vel == 0:
+            if pos < lo or pos > hi:
+                return None
+            continue
+        t0 = (lo - pos) / vel
+        t1 = (hi - pos) / vel
+        if t0 > t1:
+            t0, t1 = t1, t0
+        t_enter = max(t_enter, t0)
+        t_exit = min(t_exit, t1)
+        if t_enter > t_exit:
+            return None
+    return t_enter
+
+
+def bounce_off_paddle(ball, paddle):
+    """Send the ball back from `paddle`, faster and angled by where it hit"""
+    # Reverse horizontal direction
+    ball.vx *= -BALL_SPEEDUP  # Slight speed increase
+
+    # Adjust vertical speed based on where ball hit paddle
+    hit_pos = (ball.y - paddle.y) / paddle.height
+    ball.vy = (hit_pos - 0.5) * BALL_SPIN
+    ball.trajectory += 1
+
+    # Move ball outside paddle to prevent multiple collisions
+    if paddle.x < CANVAS_WIDTH / 2:
+        ball.x = paddle.x + paddle.width + ball.radius
+    else:
+        ball.x = paddle.x - ball.radius
+
+
+def sweep_ball(ball, paddles, dt=1.0, obstacles=None):
+    """Move the ball `dt` ticks, resolving every wall and paddle hit in order
+
+    Each event is found by exact time of impact within what's left of the
+    tick, so a fast ball can bounce off several walls and a paddle in one
+    step without tunnelling. `obstacles` (e.g. tennis_arena.BrickGrid)
+    adds hits of its own through time_of_impact() and bounce(). Returns
+    the paddles that were hit.
+    """
+    remaining = dt
+    hits = []
+    for _ in range(MAX_SWEEP_EVENTS):
+        t = wall_time_of_impact(ball, remaining)
+        hit = None
+        impact = None
+        for paddle in paddles:
+            tp = paddle_time_of_impact(ball, paddle, remaining)
+            if tp is not None and (t is None or tp < t):
+                t = tp
+                hit = paddle
+        if obstacles is not None:
+            impact = obstacles.time_of_impact(ball, remaining if t is None else t)
+            if impact is not None and (t is None or impact[0] < t):
+                t = impact[0]
+            else:
+                impact = None
+        if t is None:
+            break
+
+        ball.x += ball.vx * t
+        ball.y += ball.vy * t
+        remaining -= t
+        if impact is not None:
+            obstacles.bounce(ball, impact)
+        elif hit is None:
+            ball.vy *= -1
+        else:
+            bounce_off_paddle(ball, hit)
+            hits.append(hit)
+
+    ball.x += ball.vx * remaining
+    ball.y += ball.vy * remaining
+    ball.y = max(ball.radius, min(ball.y, CANVAS_HEIGHT - ball.radius))
+    return hits
+
+
+class TennisSimulation:
+    """One match of tennis: paddles, ball, AI and scoring, without rendering
+
+    Every match is seeded (see reset_match), so the seed plus the player's
+    paddle position at each tick reproduce it exactly.
+    """
+    def __init__(self, difficulty=0.5, rng=None):
+        self.rng = rng or random.Random()
+        self.player = Paddle(PADDLE_OFFSET, CANVAS_HEIGHT / 2 - PADDLE_HEIGHT / 2)
+        self.ai_paddle = Paddle(
+            CANVAS_WIDTH - PADDLE_OFFSET - PADDLE_WIDTH,
+            CANVAS_HEIGHT / 2 - PADDLE_HEIGHT / 2
+        )
+        self.ball = Ball(self.rng)
+        self.ai = AIController(self.ai_paddle, difficulty, self.rng)
+        self.rally_hits = 0
+        self.seed = None
+
+    # Bricks on court (tennis_arena.ArenaSimulation); replays record it
+    bricks = 0
+
+    def reset_match(self, seed=None):
+        """Reset scores, paddles and AI, reseed and serve a fresh ball
+
+        Without a seed one is drawn from the current RNG, so a seeded
+        simulation stays reproducible across matches.
+        """
+        self.seed = self.rng.getrandbits(32) if seed is None else seed
+        self.rng.seed(self.seed)
+        for paddle in (self.player, self.ai_paddle):
+            paddle.score = 0
+            paddle.y = CANVAS_HEIGHT / 2 - PADDLE_HEIGHT / 2
+        self.ai.reset()
+        self.rally_hits = 0
+        self.ball.reset()
+
+    def step(self, dt=1.0):
+        """Advance one tick; returns SCORE_PLAYER/SCORE_AI when a point ends"""
+        self.move_ball(dt)
+        self.ai.update(self.ball, dt)
+        return self.check_scoring()
+
+    def move_ball(self, dt=1.0):
+        """Move ball, resolving wall and paddle hits along the way"""
+        hits = sweep_ball(self.ball, (self.player, self.ai_paddle), dt)
+        self.rally_hits += len(hits)
+
+    def check_scoring(self):
+        """Award a point once the ball is past a paddle"""
+        if self.ball.x - self.ball.radius <= 0:
+            self.ai_paddle.score += 1
+            return self.end_point(SCORE_AI)
+        elif self.ball.x + self.ball.radius >= CANVAS_WIDTH:
+            self.player.score += 1
+            return self.end_point(SCORE_PLAYER)
+        return None
+
+    def end_point(self, scorer):
+        """Serve the next ball unless the match is over"""
+        self.rally_hits = 0
+        if self.winner() is None:
+            self.ball.reset()
+        return scorer
+
+    def winner(self):
+        """Return SCORE_PLAYER/SCORE_AI once someone reaches WINNING_SCORE"""
+        if self.player.score >= WINNING_SCORE:
+            return SCORE_PLAYER
+        elif self.ai_paddle.score >= WINNING_SCORE:
+            return SCORE_AI
+        return None
+
+
+class FixedTimestep:
+    """Accumulator that turns variable frame times into fixed simulation ticks"""
+    def __init__(self, tick_rate=TICK_RATE, max_steps=MAX_CATCHUP_STEPS):
+        self.dt = 1000 / tick_rate
+        self.max_steps = max_steps
+        self.reset()
+
+    def reset(self):
+        """Forget accumulated time (call when the loop starts or resumes)"""
+        self.accumulator = 0.0
+        self.last_time = None
+
+    def advance(self, now):
+        """Return how many ticks to run for a frame at `now` (milliseconds)"""
+        if self.last_time is None:
+            self.last_time = now
+            return 0
+        self.accumulator += now - self.last_time
+        self.last_time = now
+
+        # Drop time we can't catch up on so slow devices don't spiral
+        self.accumulator = min(self.accumulator, self.dt * self.max_steps)
+        steps = int(self.accumulator // self.dt)
+        self.accumulator -= steps * self.dt
+        return steps
+
+    def alpha(self):
+        """Fraction of a tick elapsed since the last update, for interpolation"""
+        return self.accumulator / self.dt
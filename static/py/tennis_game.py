@@ -4,264 +4,314 @@ Ported from JavaScript to Python for browser execution via Pyodide
 """
 
 from js import document, window
-from pyodide.ffi import create_proxy
 import math
-import random
-
-# Game constants
-CANVAS_WIDTH = 800
-CANVAS_HEIGHT = 600
-PADDLE_WIDTH = 15
-PADDLE_HEIGHT = 100
-BALL_RADIUS = 10
-PADDLE_OFFSET = 30
-WINNING_SCORE = 3
-
-# Colors (neon arcade style)
-COLOR_BG = "#0a0a0a"
-COLOR_PADDLE = "#00ff00"
-COLOR_BALL = "#ff00ff"
-COLOR_CENTER_LINE = "#333333"
-
-
-class Paddle:
-    """Represents a paddle in the game"""
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.width = PADDLE_WIDTH
-        self.height = PADDLE_HEIGHT
-        self.score = 0
-
-    def draw(self, ctx):
-        ctx.fillStyle = COLOR_PADDLE
-        ctx.shadowColor = COLOR_PADDLE
-        ctx.shadowBlur = 15
-        ctx.fillRect(self.x, self.y, self.width, self.height)
-        ctx.shadowBlur = 0
-
-    def move_to(self, y):
-        """Move paddle to y position (clamped to canvas bounds)"""
-        self.y = max(0, min(y - self.height / 2, CANVAS_HEIGHT - self.height))
-
-
-class Ball:
-    """Represents the ball in the game"""
-    def __init__(self):
-        self.reset()
-
-    def reset(self):
-        """Reset ball to center with random direction"""
-        self.x = CANVAS_WIDTH / 2
-        self.y = CANVAS_HEIGHT / 2
-        self.radius = BALL_RADIUS
-
-        # Random direction with slight angle
-        angle = random.uniform(-0.5, 0.5)
-        direction = random.choice([-1, 1])
-
-        self.speed = 6
-        self.vx = self.speed * direction
-        self.vy = self.speed * angle
-
-    def draw(self, ctx):
-        ctx.beginPath()
-        ctx.arc(self.x, self.y, self.radius, 0, 2 * math.pi)
-        ctx.fillStyle = COLOR_BALL
-        ctx.shadowColor = COLOR_BALL
-        ctx.shadowBlur = 20
-        ctx.fill()
-        ctx.shadowBlur = 0
 
-    def update(self):
-        """Update ball position"""
-        self.x += self.vx
-        self.y += self.vy
-
-        # Bounce off top and bottom walls
-        if self.y - self.radius <= 0 or self.y + self.radius >= CANVAS_HEIGHT:
-            self.vy *= -1
-            self.y = max(self.radius, min(self.y, CANVAS_HEIGHT - self.radius))
-
-
-class AIController:
-    """Simple AI controller for the computer paddle"""
-    def __init__(self, paddle, difficulty=0.5):
-        self.paddle = paddle
-        self.difficulty = difficulty
-        self.target_y = CANVAS_HEIGHT / 2
-        self.reaction_delay = 0  # Frames before AI reacts to ball direction change
-        self.frames_since_direction_change = 0
-        self.last_ball_vx = 0
-
-    def update(self, ball):
-        """Update AI paddle position based on ball"""
-        # Detect when ball changes direction (was hit by player)
-        if ball.vx > 0 and self.last_ball_vx <= 0:
-            self.frames_since_direction_change = 0
-            self.reaction_delay = random.randint(15, 35)  # Random delay before reacting
-        self.last_ball_vx = ball.vx
-
-        # Only react when ball is coming towards AI AND after reaction delay
-        if ball.vx > 0:
-            self.frames_since_direction_change += 1
-
-            # Wait for reaction delay before tracking
-            if self.frames_since_direction_change < self.reaction_delay:
-                return  # AI is "thinking"
-
-            # Predict where ball will be
-            if ball.vx != 0:
-                time_to_reach = (self.paddle.x - ball.x) / ball.vx
-                predicted_y = ball.y + ball.vy * time_to_reach
-
-                # Add some randomness based on difficulty
-                error = (1 - self.difficulty) * 150  # Increased error range
-                self.target_y = predicted_y + random.uniform(-error, error)
-
-        # Move towards target with some lag
-        diff = self.target_y - (self.paddle.y + self.paddle.height / 2)
-        move_speed = 5 * self.difficulty  # Slightly slower base speed
-
-        if abs(diff) > move_speed:
-            if diff > 0:
-                self.paddle.y += move_speed
-            else:
-                self.paddle.y -= move_speed
-
-        # Clamp to bounds
-        self.paddle.y = max(0, min(self.paddle.y, CANVAS_HEIGHT - self.paddle.height))
+from arcade_canvas import make_surface
+from arcade_input import CanvasInput
+from arcade_quality import QualityGovernor
+from arcade_runtime import (
+    FrameScheduler, ProxyRegistry, announce_ready, expose, expose_stats, mark_startup, query_flag,
+    query_param, unexpose,
+)
+from tennis_arena import ArenaSimulation, read_brick_count
+from tennis_core import (
+    CANVAS_HEIGHT, CANVAS_WIDTH, MAX_CATCHUP_STEPS, PHYSICS_RATE, SCORE_AI, SCORE_PLAYER,
+    TICK_RATE, FixedTimestep, TennisSimulation,
+)
+from tennis_net import (
+    LEFT, RIGHT, SIDE_FULL, STATUS_OVER as MATCH_OVER, STATUS_PLAYING as MATCH_PLAYING,
+    STATUS_WAITING as MATCH_WAITING, VERSUS_PORT, NetClient,
+)
+from tennis_render import QUALITY_LEVELS, RenderCache
+from tennis_replay import InputRecorder, Replay, ReplayEngine
+from tennis_tiers import DEFAULT_TIER, TIERS
+from tennis_shared import (
+    AI_SCORE, AI_Y, BALL_X, BALL_Y, BUFFER_BYTES, COUNTER_LIMIT, DIFFICULTY, MATCH, MOUSE_Y,
+    PLAYER_SCORE, PREV_AI_Y, PREV_BALL_X, PREV_BALL_Y, START_REQUESTS, STATUS,
+    STATUS_OVER, StateReader,
+)
+
+PROFILE_KEY = "p"  # Toggles the profiling overlay
+
+# Worker mode (?worker on a cross-origin isolated page)
+WORKER_SRC = "/static/py/tennis_worker.py"
+WORKER_CONFIG = "/static/py/tennis_worker.json"
+
+
+def read_tier():
+    """Difficulty tier from ?tier=easy|normal|hard"""
+    tier = query_param("tier")
+    return tier if tier in TIERS else DEFAULT_TIER
+
+
+def tier_buttons_html(selected):
+    """Tier picker markup for overlays rebuilt after a match"""
+    buttons = "".join(
+        f'<button class="tennis-tier-btn{" selected" if tier == selected else ""}" '
+        f'data-tier="{tier}">{tier.upper()}</button>'
+        for tier in TIERS
+    )
+    return f'<div class="tennis-tiers">{buttons}</div>'
+
+
+def read_speed():
+    """Replay speed from ?speed=N (default 1)"""
+    try:
+        speed = float(query_param("speed") or 1)
+    except ValueError:
+        return 1.0
+    return speed if speed > 0 else 1.0
+
+
+def read_shared_replay():
+    """The match shared through ?replay=<text>, or None"""
+    text = query_param("replay")
+    return Replay.from_text(text) if text else None
+
+
+def read_quality():
+    """Quality level pinned by ?quality=N (0 = best), or None to adapt"""
+    try:
+        level = int(query_param("quality"))
+    except (TypeError, ValueError):
+        return None
+    return max(0, min(level, len(QUALITY_LEVELS) - 1))
 
 
 class TennisGame:
     """Main game class"""
-    def __init__(self):
+    def __init__(self, tick_rate=TICK_RATE, tier=None):
         self.canvas = document.getElementById("game-canvas")
         self.ctx = self.canvas.getContext("2d")
+        self.proxies = ProxyRegistry()
+        self.surface = make_surface(self.proxies, self.ctx)
+        self.renderer = RenderCache(self.surface)
+        # Render quality follows measured frame times unless ?quality=N pins it
+        self.quality = QualityGovernor(len(QUALITY_LEVELS), self.apply_quality)
+        pinned = read_quality()
+        if pinned is not None:
+            self.quality.pin(pinned)
         self.overlay = document.getElementById("game-overlay")
         self.start_btn = document.getElementById("start-btn")
 
-        # Game objects
-        self.player = Paddle(PADDLE_OFFSET, CANVAS_HEIGHT / 2 - PADDLE_HEIGHT / 2)
-        self.ai_paddle = Paddle(
-            CANVAS_WIDTH - PADDLE_OFFSET - PADDLE_WIDTH,
-            CANVAS_HEIGHT / 2 - PADDLE_HEIGHT / 2
-        )
-        self.ball = Ball()
-        self.ai = AIController(self.ai_paddle)
+        # Game objects (physics live in the DOM-free simulation core)
+        self.sim = self.make_simulation()
+        self.player = self.sim.player
+        self.ai_paddle = self.sim.ai_paddle
+        self.ball = self.sim.ball
+        self.ai = self.sim.ai
 
         # Game state
         self.running = False
         self.game_over = False
-        self.animation_id = None
+        self.scheduler = FrameScheduler(self.proxies, self.on_frame)
+        self.profiler = None
+        self.tick_rate = tick_rate
+        self.timestep = FixedTimestep(tick_rate)
+        self.dt = PHYSICS_RATE / tick_rate  # Physics ticks covered by one update
+
+        # Every live match is recorded; `replaying` drives the sim from a replay
+        self.recorder = InputRecorder()
+        self.last_replay = None
+        self.replaying = None
+
+        # Positions at the previous tick, blended with the current ones in draw()
+        self.prev_ball_x = self.ball.x
+        self.prev_ball_y = self.ball.y
+        self.prev_ai_y = self.ai_paddle.y
 
         # Score display elements
         self.player_score_el = document.getElementById("player-score")
         self.ai_score_el = document.getElementById("ai-score")
 
-        # Setup input
+        # Setup input; the AI's difficulty comes from the calibrated tiers
+        self.tier = tier or read_tier()
         self.setup_input()
+        self.set_tier(self.tier)
+        if query_flag("profile"):
+            self.enable_profiling()
 
         # Draw initial state
         self.draw()
+        mark_startup("first-frame")
+        # Time the display's refresh while the start overlay idles
+        self.quality.probe(self.proxies)
+        announce_ready(self.proxies, self.start)
+        expose("tennisReplay", self.proxies, self.replay_info)
+        expose("tennisQuality", self.proxies, self.quality_info)
+
+        # ?replay=<text>[&speed=N] plays a shared match instead
+        shared_replay = read_shared_replay()
+        if shared_replay is not None:
+            self.play_replay(shared_replay, read_speed())
+
+    def make_simulation(self):
+        """The physics this mode plays with"""
+        return TennisSimulation()
 
     def setup_input(self):
-        """Setup mouse movement and button handlers"""
-        def on_mouse_move(event):
-            if not self.running:
-                return
-            rect = self.canvas.getBoundingClientRect()
-            mouse_y = event.clientY - rect.top
-            self.player.move_to(mouse_y)
+        """Setup paddle input and button handlers"""
+        # Pointer, touch and keys are coalesced and read once per frame in on_frame
+        # In court units: a pinned or governed quality level shrinks the canvas itself
+        self.input = CanvasInput(self.proxies, self.canvas, CANVAS_HEIGHT)
 
         def on_start_click(event):
             self.start()
 
-        self.mouse_proxy = create_proxy(on_mouse_move)
-        self.start_proxy = create_proxy(on_start_click)
-
-        self.canvas.addEventListener("mousemove", self.mouse_proxy)
-        self.start_btn.addEventListener("click", self.start_proxy)
+        def on_key_down(event):
+            if event.key == PROFILE_KEY:
+                self.toggle_profiling()
+
+        self.proxies.listen(self.start_btn, "click", "start", on_start_click)
+        self.proxies.listen(document, "keydown", "keydown", on_key_down)
+        self.bind_tier_buttons()
+        expose_stats("arcadeProxyStats", self.proxies)
+
+    def bind_tier_buttons(self):
+        """Attach the tier picker (again, after an overlay rebuild)"""
+        for tier in TIERS:
+            button = document.querySelector(f'[data-tier="{tier}"]')
+            if button is not None:
+                self.proxies.listen(button, "click", f"tier:{tier}", lambda e, tier=tier: self.set_tier(tier))
+
+    def set_tier(self, tier):
+        """Use `tier`'s calibrated difficulty from the next match on"""
+        self.tier = tier
+        self.sim.ai.difficulty = TIERS[tier]["difficulty"]
+        for name in TIERS:
+            button = document.querySelector(f'[data-tier="{name}"]')
+            if button is not None:
+                button.classList.toggle("selected", name == tier)
+
+    def move_player(self, mouse_y):
+        if self.replaying is None:
+            self.player.move_to(mouse_y)
 
     def start(self):
         """Start the game"""
+        self.replaying = None
+        self.sim.ai.difficulty = TIERS[self.tier]["difficulty"]
+        self.sim.reset_match()
+        self.recorder.begin(self.sim, self.dt)
+        self.timestep = FixedTimestep(self.tick_rate)
+        self.begin_play()
+
+    def play_replay(self, replay, speed=1.0):
+        """Watch a recorded match, `speed` times as fast as it was played"""
+        self.replaying = ReplayEngine(replay, self.sim)
+        tick_rate = PHYSICS_RATE / replay.dt * speed
+        self.timestep = FixedTimestep(tick_rate, MAX_CATCHUP_STEPS * math.ceil(speed))
+        self.begin_play()
+
+    def replay_info(self):
+        """The last finished match, for window.tennisReplay()"""
+        replay = self.last_replay
+        if replay is None:
+            return {}
+        return {"replay": replay.to_text(), "ticks": replay.ticks, "seed": replay.seed}
+
+    def begin_play(self):
         self.running = True
         self.game_over = False
-        self.player.score = 0
-        self.ai_paddle.score = 0
-        self.ball.reset()
         self.update_score_display()
         self.overlay.classList.add("hidden")
-        self.game_loop()
-
-    def game_loop(self):
-        """Main game loop"""
+        self.save_previous()
+        self.renderer.invalidate()
+        self.quality.pause()
+        self.timestep.reset()
+        self.input.reset()
+        self.input.active = True
+        self.scheduler.start()
+
+    def on_frame(self, timestamp):
+        """Scheduler callback: one frame of the game, then profiling bookkeeping"""
+        self.quality.on_frame(timestamp)
+        self.read_input(timestamp)
+        self.game_loop(timestamp)
+        if self.profiler is not None:
+            self.profiler.on_frame(timestamp)
+
+    def read_input(self, timestamp):
+        """Apply this frame's coalesced paddle input"""
+        y = self.input.poll(timestamp, self.player.y + self.player.height / 2)
+        if y is not None:
+            self.move_player(y)
+
+    def apply_quality(self, level):
+        """Re-render for QUALITY_LEVELS[level], resizing the canvas when its scale changes"""
+        settings = QUALITY_LEVELS[level]
+        width = round(CANVAS_WIDTH * settings["scale"])
+        if self.canvas.width != width:
+            # Resizing clears the canvas; CSS keeps it at full size on the page
+            self.canvas.style.width = f"{CANVAS_WIDTH}px"
+            self.canvas.width = width
+            self.canvas.height = round(CANVAS_HEIGHT * settings["scale"])
+        self.renderer.configure(settings["glow"], settings["scale"])
+
+    def quality_info(self):
+        """The current quality level and the frame times behind it, for window.tennisQuality()"""
+        info = self.quality.stats()
+        info.update(QUALITY_LEVELS[self.quality.level])
+        return info
+
+    def enable_profiling(self):
+        """Instrument the loop phases and show the timing overlay"""
+        # Imported lazily so normal play never loads the profiler
+        from tennis_profiler import ProfilerOverlay
+        self.profiler = ProfilerOverlay(self)
+        expose("tennisProfile", self.proxies, self.profiler.stats)
+
+    def toggle_profiling(self):
+        if self.profiler is None:
+            self.enable_profiling()
+        else:
+            self.profiler.remove()
+            self.profiler = None
+            unexpose("tennisProfile", self.proxies)
+
+    def game_loop(self, timestamp):
+        """Main game loop: fixed-rate updates, one interpolated draw per frame"""
         if not self.running:
             return
 
-        self.update()
-        self.draw()
+        for _ in range(self.timestep.advance(timestamp)):
+            self.save_previous()
+            self.update()
+            if not self.running:
+                break
 
-        if not self.game_over:
-            self.animation_id = window.requestAnimationFrame(
-                create_proxy(lambda _: self.game_loop())
-            )
+        self.draw(self.timestep.alpha() if self.running else 1.0)
+
+    def save_previous(self):
+        """Remember the current positions as the interpolation start point"""
+        self.prev_ball_x = self.ball.x
+        self.prev_ball_y = self.ball.y
+        self.prev_ai_y = self.ai_paddle.y
 
     def update(self):
         """Update game state"""
-        # Update ball
-        self.ball.update()
-
-        # Update AI
-        self.ai.update(self.ball)
-
-        # Check paddle collisions
-        self.check_paddle_collision(self.player)
-        self.check_paddle_collision(self.ai_paddle)
-
-        # Check scoring
-        if self.ball.x - self.ball.radius <= 0:
-            # AI scores
-            self.ai_paddle.score += 1
-            self.update_score_display()
-            if self.check_win():
+        if self.replaying is not None:
+            if self.replaying.done:
+                self.end_game("REPLAY OVER")
                 return
-            self.ball.reset()
-
-        elif self.ball.x + self.ball.radius >= CANVAS_WIDTH:
-            # Player scores
-            self.player.score += 1
+            scorer = self.replaying.step()
+        else:
+            # Step with the position the recorder logs, so replays match exactly
+            self.player.y = self.recorder.record(self.player.y)
+            scorer = self.sim.step(self.dt)
+        if scorer is not None:
+            # Ball was re-served: don't interpolate across the jump
+            self.save_previous()
             self.update_score_display()
-            if self.check_win():
-                return
-            self.ball.reset()
-
-    def check_paddle_collision(self, paddle):
-        """Check and handle ball-paddle collision"""
-        if (self.ball.x - self.ball.radius <= paddle.x + paddle.width and
-            self.ball.x + self.ball.radius >= paddle.x and
-            self.ball.y >= paddle.y and
-            self.ball.y <= paddle.y + paddle.height):
-
-            # Reverse horizontal direction
-            self.ball.vx *= -1.05  # Slight speed increase
-
-            # Adjust vertical speed based on where ball hit paddle
-            hit_pos = (self.ball.y - paddle.y) / paddle.height
-            self.ball.vy = (hit_pos - 0.5) * 10
-
-            # Move ball outside paddle to prevent multiple collisions
-            if paddle.x < CANVAS_WIDTH / 2:
-                self.ball.x = paddle.x + paddle.width + self.ball.radius
-            else:
-                self.ball.x = paddle.x - self.ball.radius
+            self.check_win()
 
     def check_win(self):
         """Check if someone has won"""
-        if self.player.score >= WINNING_SCORE:
+        winner = self.sim.winner()
+        if winner == SCORE_PLAYER:
             self.end_game("YOU WIN!")
             return True
-        elif self.ai_paddle.score >= WINNING_SCORE:
+        elif winner == SCORE_AI:
             self.end_game("GAME OVER")
             return True
         return False
@@ -270,49 +320,391 @@ class TennisGame:
         """End the game and show message"""
         self.running = False
         self.game_over = True
+        self.input.active = False
+        self.scheduler.stop()
+        if self.replaying is None and self.recorder.positions:
+            self.last_replay = self.recorder.finish(self.sim)
 
         # Show overlay with result
         self.overlay.classList.remove("hidden")
         self.overlay.innerHTML = f'''
             <p class="arcade-instructions">{message}</p>
             <p class="arcade-instructions-sub">Final Score: {self.player.score} - {self.ai_paddle.score}</p>
+            {tier_buttons_html(self.tier)}
             <button id="restart-btn" class="arcade-start-btn">
                 PLAY AGAIN
             </button>
         '''
+        self.bind_tier_buttons()
 
         # Setup restart button
         restart_btn = document.getElementById("restart-btn")
-        restart_btn.addEventListener("click", create_proxy(lambda e: self.start()))
+        self.proxies.listen(restart_btn, "click", "restart", lambda e: self.start())
 
     def update_score_display(self):
         """Update the score display elements"""
         self.player_score_el.textContent = str(self.player.score)
         self.ai_score_el.textContent = str(self.ai_paddle.score)
 
-    def draw(self):
-        """Draw the game"""
-        ctx = self.ctx
+    def draw(self, alpha=1.0):
+        """Draw the game, blending positions `alpha` of the way into the last tick"""
+        # (the player paddle follows the mouse directly, so it isn't blended)
+        ball_x = self.prev_ball_x + (self.ball.x - self.prev_ball_x) * alpha
+        ball_y = self.prev_ball_y + (self.ball.y - self.prev_ball_y) * alpha
+        ai_y = self.prev_ai_y + (self.ai_paddle.y - self.prev_ai_y) * alpha
+        self.renderer.draw(
+            self.player.x, self.player.y,
+            self.ai_paddle.x, ai_y,
+            ball_x, ball_y,
+        )
+
+
+class WorkerTennisGame(TennisGame):
+    """TennisGame whose simulation runs in a PyScript worker
+
+    The worker publishes positions and scores into a SharedArrayBuffer and
+    reads the mouse back out of it. This thread copies that state into its
+    own (otherwise idle) sim objects once per frame and only draws, so a
+    long Python tick or GC pause in the worker can't stall painting or input.
+    """
+    def __init__(self, tick_rate=TICK_RATE, tier=None):
+        # Imported lazily so the default mode never touches worker-only APIs
+        from js import Float32Array, SharedArrayBuffer
+        from pyscript import PyWorker
+
+        self.shared = Float32Array.new(SharedArrayBuffer.new(BUFFER_BYTES))
+        self.reader = StateReader(self.shared)
+        self.start_requests = 0
+        self.tick_ms = 1000 / tick_rate
+        self.tick_seen_at = None
+        super().__init__(tick_rate, tier)
+
+        self.worker = PyWorker(WORKER_SRC, type="pyodide", config=WORKER_CONFIG)
+        self.worker.onmessage = self.proxies.get("worker-message", self.on_worker_message)
+
+    def on_worker_message(self, event):
+        if event.data == "ready":
+            self.worker.postMessage(self.shared.buffer)
+
+    def move_player(self, mouse_y):
+        self.shared[MOUSE_Y] = mouse_y
+        super().move_player(mouse_y)
+
+    def start(self):
+        """Ask the worker for a new match, then start rendering"""
+        self.start_requests = (self.start_requests + 1) % COUNTER_LIMIT
+        self.shared[MOUSE_Y] = self.player.y + self.player.height / 2
+        self.shared[DIFFICULTY] = TIERS[self.tier]["difficulty"]
+        self.shared[START_REQUESTS] = self.start_requests
+        self.tick_seen_at = None
+        super().start()
+
+    def game_loop(self, timestamp):
+        """Pick up the worker's latest tick, then draw between it and the one before"""
+        if not self.running:
+            return
+
+        if self.reader.read() and self.mirror(self.reader.state):
+            self.tick_seen_at = timestamp
+        if self.tick_seen_at is None:
+            alpha = 1.0
+        else:
+            # Worker and page clocks differ, so time the tick from when we saw it
+            alpha = min((timestamp - self.tick_seen_at) / self.tick_ms, 1.0)
+        self.draw(alpha if self.running else 1.0)
+
+    def mirror(self, state):
+        """Copy worker state into the local sim objects; False if it's a stale match"""
+        if state[MATCH] != self.start_requests:
+            return False
+        self.prev_ball_x = state[PREV_BALL_X]
+        self.prev_ball_y = state[PREV_BALL_Y]
+        self.prev_ai_y = state[PREV_AI_Y]
+        self.ball.x = state[BALL_X]
+        self.ball.y = state[BALL_Y]
+        self.ai_paddle.y = state[AI_Y]
+
+        scores = (int(state[PLAYER_SCORE]), int(state[AI_SCORE]))
+        if scores != (self.player.score, self.ai_paddle.score):
+            self.player.score, self.ai_paddle.score = scores
+            self.update_score_display()
+        if state[STATUS] == STATUS_OVER:
+            self.check_win()
+        return True
+
+
+class ChaosTennisGame(TennisGame):
+    """TennisGame with hundreds of balls in play at once (?chaos or ?chaos=N)
+
+    Ball physics run in a NumPy ChaosField, one vectorised pass per tick;
+    the single-ball sim only keeps the paddles and scores. Matches are
+    timed instead of first to WINNING_SCORE, and aren't recorded.
+    """
+    def __init__(self, balls=None, tick_rate=TICK_RATE, tier=None):
+        # Imported lazily so the default mode never needs NumPy
+        from tennis_chaos import ChaosField, read_ball_count
+
+        self.field = ChaosField(balls or read_ball_count(query_param("chaos")))
+        self.clock_el = document.getElementById("chaos-clock")
+        self.clock_shown = None
+        super().__init__(tick_rate, tier)
+        self.clock_el.hidden = False
+        self.update_clock()
+
+    def start(self):
+        """Serve every ball and start the clock"""
+        self.replaying = None
+        self.field.difficulty = TIERS[self.tier]["difficulty"]
+        self.sim.reset_match()
+        self.field.reset()
+        self.timestep = FixedTimestep(self.tick_rate)
+        self.begin_play()
+
+    def save_previous(self):
+        super().save_previous()
+        self.field.save_previous()
+
+    def update(self):
+        """One tick for every ball, then the AI; ends the match when time runs out"""
+        player_points, ai_points = self.field.step(self.player.y, self.ai_paddle.y, self.dt)
+        self.ai_paddle.y = self.field.move_ai(self.ai_paddle.y, self.dt)
+        if player_points or ai_points:
+            self.player.score += player_points
+            self.ai_paddle.score += ai_points
+            self.update_score_display()
+        self.update_clock()
+        self.check_win()
+
+    def check_win(self):
+        """Whoever scored more once the clock has run out"""
+        if not self.field.over():
+            return False
+        if self.player.score > self.ai_paddle.score:
+            self.end_game("YOU WIN!")
+        elif self.player.score < self.ai_paddle.score:
+            self.end_game("GAME OVER")
+        else:
+            self.end_game("DRAW")
+        return True
+
+    def update_clock(self):
+        """Show the whole seconds left, touching the DOM only when they change"""
+        seconds = math.ceil(self.field.time_left)
+        if seconds != self.clock_shown:
+            self.clock_shown = seconds
+            self.clock_el.textContent = f"{seconds}s"
+
+    def draw(self, alpha=1.0):
+        """Draw the paddles and every ball, blended `alpha` into the last tick"""
+        points = self.field.sprite_points(alpha, self.renderer.ball_half, self.renderer.scale)
+        ai_y = self.prev_ai_y + (self.ai_paddle.y - self.prev_ai_y) * alpha
+        self.renderer.draw_many(
+            self.player.x, self.player.y,
+            self.ai_paddle.x, ai_y,
+            points,
+        )
+
+
+class ArenaTennisGame(TennisGame):
+    """TennisGame with a wall of breakable bricks mid-court (?arena or ?arena=N)
+
+    Brick hits come from the simulation's BrickGrid; the renderer paints the
+    wall into its cached background and clears each brick as it breaks.
+    """
+    def __init__(self, bricks=None, tick_rate=TICK_RATE, tier=None):
+        self.brick_count = bricks or read_brick_count(query_param("arena"))
+        super().__init__(tick_rate, tier)
+
+    def make_simulation(self):
+        sim = ArenaSimulation(self.brick_count)
+        self.renderer.set_bricks(sim.grid.live_rects())
+        return sim
+
+    def begin_play(self):
+        # Every match (and replay) starts from a fresh wall
+        self.renderer.set_bricks(self.sim.grid.live_rects())
+        super().begin_play()
+
+    def update(self):
+        """One tick, then clear the bricks it broke from the background"""
+        super().update()
+        broken = self.sim.grid.broken
+        if broken:
+            for index in broken:
+                self.renderer.erase_brick(index)
+            broken.clear()
+
+
+class SocketTransport:
+    """Binary WebSocket with the send()/poll() interface NetClient expects"""
+    # Messages kept while nobody polls (between matches); NetClient recovers from gaps
+    MAX_INBOX = 64
+
+    def __init__(self, registry, url):
+        # Imported lazily so other modes never touch networking APIs
+        from js import Uint8Array, WebSocket
+        from pyodide.ffi import to_js
+
+        self.Uint8Array = Uint8Array
+        self.to_js = to_js
+        self.socket = WebSocket.new(url)
+        self.socket.binaryType = "arraybuffer"
+        self.open = False
+        self.closed = False
+        self.inbox = []
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        # A reconnect must not reuse the pooled listeners bound to the last, closed transport
+        for key in ("versus:open", "versus:message", "versus:close"):
+            registry.release(key)
+        registry.listen(self.socket, "open", "versus:open", self.on_open)
+        registry.listen(self.socket, "message", "versus:message", self.on_message)
+        registry.listen(self.socket, "close", "versus:close", self.on_close)
+
+    def on_open(self, event):
+        self.open = True
+
+    def on_close(self, event):
+        self.open = False
+        self.closed = True
+
+    def on_message(self, event):
+        data = self.Uint8Array.new(event.data).to_bytes()
+        self.bytes_received += len(data)
+        self.inbox.append(data)
+        del self.inbox[:-self.MAX_INBOX]
+
+    def send(self, data):
+        if self.open:
+            self.socket.send(self.to_js(data))
+            self.bytes_sent += len(data)
+
+    def poll(self, now):
+        """Everything received since the last poll"""
+        messages, self.inbox = self.inbox, []
+        return messages
+
+
+class VersusTennisGame(TennisGame):
+    """TennisGame against another person through a match host (?versus, ?server=<url>)
+
+    The host (tools/arcade/tennis_server.py) runs the authoritative
+    simulation. It speaks plain ws://, which is the default on http pages;
+    https pages may only open wss://, so they need ?server= pointing at a
+    TLS proxy in front of it. This page sends its paddle target every tick, predicts its
+    own paddle and interpolates the ball and opponent from the host's
+    snapshots; the local sim objects only hold what gets drawn.
+    """
+    def __init__(self, url=None, tick_rate=TICK_RATE, tier=None):
+        if url is None and window.location.protocol != "https:":
+            url = f"ws://{window.location.hostname}:{VERSUS_PORT}"
+        self.url = url  # None: an https page with no ?server= has nothing it may connect to
+        self.transport = None
+        self.net = None
+        self.target_y = CANVAS_HEIGHT / 2
+        self.now = 0.0
+        self.awaiting_start = False
+        super().__init__(tick_rate, tier)
+
+    def start(self):
+        """Connect on first use, then ask the host for a match"""
+        if self.url is None:
+            self.end_game("SECURE PAGE: ADD ?server=wss://...")
+            return
+        if self.net is None:
+            self.transport = SocketTransport(self.proxies, self.url)
+            self.net = NetClient(self.transport, self.tick_rate)
+        self.net.request_start()
+        self.awaiting_start = True
+        self.timestep = FixedTimestep(self.tick_rate)
+        self.begin_play()
+        self.show_message("WAITING FOR OPPONENT")
+
+    def show_message(self, text):
+        self.overlay.classList.remove("hidden")
+        self.overlay.innerHTML = f'<p class="arcade-instructions">{text}</p>'
+
+    def move_player(self, mouse_y):
+        # Only the target is local; the paddle moves through NetClient's prediction
+        self.target_y = mouse_y
+
+    def game_loop(self, timestamp):
+        """Take in the host's messages, send this frame's inputs, draw"""
+        if not self.running:
+            return
+        self.now = timestamp
+        for data in self.transport.poll(timestamp):
+            self.net.receive(data, timestamp)
+        steps = self.timestep.advance(timestamp)
+        if self.net.side in (LEFT, RIGHT):
+            for _ in range(steps):
+                self.net.tick(self.target_y)
+        self.sync_match()
+        self.draw()
+
+    def sync_match(self):
+        """Mirror the host's scores and match status into the page"""
+        # The host closes a turned-away connection, so check for that first;
+        # either way the next start reconnects with a fresh NetClient
+        if self.net.side == SIDE_FULL or self.transport.closed:
+            self.end_game("MATCH FULL" if self.net.side == SIDE_FULL else "DISCONNECTED")
+            self.net = None
+            return
+
+        scores = self.net.scores
+        if scores != (self.player.score, self.ai_paddle.score):
+            self.player.score, self.ai_paddle.score = scores
+            self.update_score_display()
+
+        status = self.net.status
+        if status == MATCH_PLAYING and self.awaiting_start:
+            self.awaiting_start = False
+            self.overlay.classList.add("hidden")
+        elif status == MATCH_OVER and not self.awaiting_start:
+            mine = scores[self.net.side]
+            self.end_game("YOU WIN!" if mine > scores[1 - self.net.side] else "GAME OVER")
+        elif status == MATCH_WAITING and not self.awaiting_start:
+            # The opponent left mid-match; stay connected and wait for the next one
+            self.net.abandon_match()
+            self.net.request_start()
+            self.awaiting_start = True
+            self.show_message("OPPONENT LEFT - WAITING FOR OPPONENT")
+
+    def draw(self, alpha=1.0):
+        """Draw the host's state as NetClient sees it at this frame"""
+        if self.net is None:
+            super().draw(alpha)
+            return
+        ball_x, ball_y, left_y, right_y = self.net.view(self.now)
+        if ball_x is None:
+            ball_x, ball_y = CANVAS_WIDTH / 2, CANVAS_HEIGHT / 2
+        self.player.y = left_y
+        self.ai_paddle.y = right_y
+        self.renderer.draw(
+            self.player.x, left_y,
+            self.ai_paddle.x, right_y,
+            ball_x, ball_y,
+        )
 
-        # Clear canvas
-        ctx.fillStyle = COLOR_BG
-        ctx.fillRect(0, 0, CANVAS_WIDTH, CANVAS_HEIGHT)
 
-        # Draw center line
-        ctx.setLineDash([10, 10])
-        ctx.strokeStyle = COLOR_CENTER_LINE
-        ctx.lineWidth = 2
-        ctx.beginPath()
-        ctx.moveTo(CANVAS_WIDTH / 2, 0)
-        ctx.lineTo(CANVAS_WIDTH / 2, CANVAS_HEIGHT)
-        ctx.stroke()
-        ctx.setLineDash([])
+def make_game():
+    """Versus, chaos, arena or worker mode when asked for (worker needs SharedArrayBuffer)
 
-        # Draw game objects
-        self.player.draw(ctx)
-        self.ai_paddle.draw(ctx)
-        self.ball.draw(ctx)
+    A shared replay picks its own court, whatever else the URL asks for.
+    """
+    shared_replay = read_shared_replay()
+    if shared_replay is not None:
+        return ArenaTennisGame(shared_replay.bricks) if shared_replay.bricks else TennisGame()
+    if query_flag("versus"):
+        return VersusTennisGame(query_param("server") or query_param("versus") or None)
+    if query_flag("chaos"):
+        return ChaosTennisGame()
+    if query_flag("arena"):
+        return ArenaTennisGame()
+    if query_flag("worker") and window.crossOriginIsolated:
+        return WorkerTennisGame()
+    return TennisGame()
 
 
 # Initialize game when script loads
-game = TennisGame()
+game = make_game()
@@ -0,0 +1,504 @@
+"""
+Classic Tennis/Pong Game - Online Versus
+Authoritative two-player match host, the client-side prediction and
+interpolation that hide latency, and the compact binary messages between them
+"""
+
+import random
+import struct
+
+from tennis_core import (
+    CANVAS_HEIGHT, PADDLE_HEIGHT, PHYSICS_RATE, TICK_RATE, FixedTimestep, TennisSimulation,
+)
+from tennis_replay import POSITION_SCALE, quantize
+
+VERSUS_PORT = 8765  # Where tools/arcade/tennis_server.py listens by default
+
+LEFT = 0
+RIGHT = 1
+SIDE_FULL = 255  # Welcome "side" when the match already has two players
+
+SNAPSHOT_INTERVAL = 2  # Host ticks between snapshots (30 a second at TICK_RATE)
+INTERP_DELAY_TICKS = 2 * SNAPSHOT_INTERVAL  # Remote state is drawn this far behind
+NET_PADDLE_SPEED = 40  # Most a paddle travels in one tick (px); the host enforces it
+INPUT_REDUNDANCY = 3  # Earlier inputs resent with each one, so a lost packet costs nothing
+MAX_INPUT_BACKLOG = 4  # Inputs queued past this are applied at once so lag can't build up
+MAX_PENDING_INPUTS = 120  # Unacknowledged inputs a client keeps for reconciliation
+SNAPSHOT_HISTORY = 32  # Sent/received snapshots kept as delta baselines
+INTERP_BUFFER = 16  # Received snapshots kept for interpolation
+
+# Message kinds (first byte of every message)
+MSG_WELCOME = 1
+MSG_INPUT = 2
+MSG_SNAPSHOT = 3
+
+# kind, side
+WELCOME = struct.Struct("<BB")
+# kind, newest input seq, newest snapshot tick received, start requests, target count;
+# then `count` uint16 paddle-centre targets, oldest first
+INPUT_HEADER = struct.Struct("<BHHBB")
+# kind, tick, baseline tick, newest input seq applied, field mask
+SNAPSHOT_HEADER = struct.Struct("<BHHHB")
+
+# Snapshot fields, in mask-bit order. Positions are in 1/POSITION_SCALE px,
+# like replays, so the host's paddle values are exactly what clients predict
+BALL_X = 0
+BALL_Y = 1
+LEFT_Y = 2  # Paddle tops; RIGHT_Y == LEFT_Y + RIGHT
+RIGHT_Y = 3
+LEFT_SCORE = 4
+RIGHT_SCORE = 5
+STATUS = 6
+FIELDS = 7
+KEYFRAME = 0x80  # Mask bit: values are absolute, not deltas from a baseline
+
+STATUS_WAITING = 0
+STATUS_PLAYING = 1
+STATUS_OVER = 2
+
+SEQ_MASK = 0xFFFF  # Ticks and input sequence numbers wrap at 16 bits
+
+
+def seq_newer(a, b):
+    """True when 16-bit sequence number a comes after b"""
+    return 0 < ((a - b) & SEQ_MASK) < 0x8000
+
+
+def steer(top, target):
+    """Paddle top after one tick steering towards quantised centre `target`
+
+    The host's movement rule; clients repeat it exactly to predict their
+    own paddle, so every value stays on the 1/POSITION_SCALE px grid.
+    """
+    goal = target / POSITION_SCALE - PADDLE_HEIGHT / 2
+    step = max(-NET_PADDLE_SPEED, min(NET_PADDLE_SPEED, goal - top))
+    return max(0, min(top + step, CANVAS_HEIGHT - PADDLE_HEIGHT))
+
+
+def write_varint(out, value):
+    """Append a signed int as a zigzag LEB128 varint (1 byte for |value| < 64)"""
+    value = (value << 1) ^ (value >> 63)
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, offset):
+    """Decode write_varint's output at `offset`; returns (value, next offset)"""
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            break
+        shift += 7
+    return (value >> 1) ^ -(value & 1), offset
+
+
+def encode_welcome(side):
+    return WELCOME.pack(MSG_WELCOME, side)
+
+
+def encode_input(seq, ack, start_requests, targets):
+    """Input message: the newest `targets` (oldest first), the last one being `seq`"""
+    header = INPUT_HEADER.pack(MSG_INPUT, seq, ack, start_requests, len(targets))
+    return header + struct.pack(f"<{len(targets)}H", *targets)
+
+
+def decode_input(data):
+    """(seq, ack, start_requests, targets) from an input message"""
+    _, seq, ack, start_requests, count = INPUT_HEADER.unpack_from(data)
+    targets = struct.unpack_from(f"<{count}H", data, INPUT_HEADER.size)
+    return seq, ack, start_requests, targets
+
+
+def encode_snapshot(tick, values, ack, baseline=None):
+    """Snapshot message; with baseline (tick, values) only changed fields go out, as deltas"""
+    if baseline is None:
+        base_tick, base = tick, (0,) * FIELDS
+        mask = KEYFRAME
+    else:
+        base_tick, base = baseline
+        mask = 0
+    body = bytearray()
+    for field in range(FIELDS):
+        delta = values[field] - base[field]
+        if delta or mask & KEYFRAME:
+            mask |= 1 << field
+            write_varint(body, delta)
+    header = SNAPSHOT_HEADER.pack(MSG_SNAPSHOT, tick & SEQ_MASK, base_tick & SEQ_MASK, ack, mask)
+    return header + bytes(body)
+
+
+def decode_snapshot(data, baselines):
+    """(tick, values, ack) from a snapshot message, or None when its baseline is unknown
+
+    `baselines` maps 16-bit ticks to previously decoded values.
+    """
+    _, tick, base_tick, ack, mask = SNAPSHOT_HEADER.unpack_from(data)
+    if mask & KEYFRAME:
+        base = (0,) * FIELDS
+    else:
+        base = baselines.get(base_tick)
+        if base is None:
+            return None
+    values = list(base)
+    offset = SNAPSHOT_HEADER.size
+    for field in range(FIELDS):
+        if mask & (1 << field):
+            delta, offset = read_varint(data, offset)
+            values[field] += delta
+    return tick, tuple(values), ack
+
+
+def trim(mapping, size):
+    """Drop the oldest entries of an insertion-ordered dict down to `size`"""
+    while len(mapping) > size:
+        del mapping[next(iter(mapping))]
+
+
+class VersusSimulation(TennisSimulation):
+    """TennisSimulation with a second human in place of the AI"""
+    def __init__(self, rng=None):
+        super().__init__(rng=rng)
+        self.paddles = (self.player, self.ai_paddle)
+
+    def step(self, dt=1.0):
+        """Advance one tick; the paddles were already moved by their inputs"""
+        self.move_ball(dt)
+        return self.check_scoring()
+
+    def reset_match(self, seed=None):
+        """New match, leaving the paddles where their players put them"""
+        tops = [paddle.y for paddle in self.paddles]
+        super().reset_match(seed)
+        for paddle, top in zip(self.paddles, tops):
+            paddle.y = top
+
+
+class HostSeat:
+    """The host's record of one connected player"""
+    def __init__(self, side, transport):
+        self.side = side
+        self.transport = transport
+        self.queue = []  # (seq, target) received but not yet applied
+        self.newest_seq = None  # Newest input seq queued (older repeats are dropped)
+        self.applied_seq = 0
+        self.start_requests = 0  # Latest count the client sent
+        self.starts_seen = 0  # Count at the last match start
+        self.acked_tick = None  # Newest snapshot tick the client confirmed
+        self.sent = {}  # tick -> values, baselines for the next deltas
+
+    @property
+    def ready(self):
+        return self.start_requests != self.starts_seen
+
+
+class MatchHost:
+    """Authoritative versus match: applies both players' inputs, steps the ball, sends snapshots
+
+    Transports only need send(bytes); whatever owns the connections feeds
+    incoming messages to receive() and calls step() TICK_RATE times a second.
+    """
+    def __init__(self, tick_rate=TICK_RATE, seed=None):
+        self.sim = VersusSimulation(random.Random(seed))
+        self.dt = PHYSICS_RATE / tick_rate
+        self.seats = [None, None]
+        self.status = STATUS_WAITING
+        self.tick = 0
+
+    def join(self, transport):
+        """Seat a new connection; returns its side, or SIDE_FULL"""
+        side = self.seats.index(None) if None in self.seats else SIDE_FULL
+        if side != SIDE_FULL:
+            self.seats[side] = HostSeat(side, transport)
+        transport.send(encode_welcome(side))
+        return side
+
+    def leave(self, side):
+        """Free a side; the match in progress is abandoned"""
+        self.seats[side] = None
+        self.status = STATUS_WAITING
+
+    def receive(self, side, data):
+        """Queue an input message from `side`"""
+        seat = self.seats[side]
+        if seat is None or data[0] != MSG_INPUT:
+            return
+        seq, ack, start_requests, targets = decode_input(data)
+        first = (seq - len(targets) + 1) & SEQ_MASK
+        for i, target in enumerate(targets):
+            s = (first + i) & SEQ_MASK
+            if seat.newest_seq is None or seq_newer(s, seat.newest_seq):
+                seat.queue.append((s, target))
+                seat.newest_seq = s
+        if ack in seat.sent:
+            seat.acked_tick = ack
+        seat.start_requests = start_requests
+
+    def step(self):
+        """One host tick"""
+        for seat in self.seats:
+            if seat is not None:
+                self.apply_inputs(seat)
+
+        if self.status == STATUS_PLAYING:
+            if self.sim.step(self.dt) is not None and self.sim.winner() is not None:
+                self.status = STATUS_OVER
+        elif all(seat is not None and seat.ready for seat in self.seats):
+            for seat in self.seats:
+                seat.starts_seen = seat.start_requests
+            self.sim.reset_match()
+            self.status = STATUS_PLAYING
+
+        self.tick = (self.tick + 1) & SEQ_MASK
+        if self.tick % SNAPSHOT_INTERVAL == 0:
+            self.send_snapshots()
+
+    def apply_inputs(self, seat):
+        """One queued input per tick, more when a backlog has built up"""
+        queue = seat.queue
+        if not queue:
+            return
+        count = max(1, len(queue) - MAX_INPUT_BACKLOG + 1)
+        paddle = self.sim.paddles[seat.side]
+        for seq, target in queue[:count]:
+            paddle.y = steer(paddle.y, target)
+            seat.applied_seq = seq
+        del queue[:count]
+
+    def values(self):
+        """The current state as snapshot fields"""
+        sim = self.sim
+        return (
+            quantize(sim.ball.x), quantize(sim.ball.y),
+            quantize(sim.player.y), quantize(sim.ai_paddle.y),
+            sim.player.score, sim.ai_paddle.score, self.status,
+        )
+
+    def send_snapshots(self):
+        """Each client gets the state as a delta from the last snapshot it confirmed"""
+        values = self.values()
+        for seat in self.seats:
+            if seat is None:
+                continue
+            base = seat.sent.get(seat.acked_tick)
+            baseline = None if base is None else (seat.acked_tick, base)
+            seat.transport.send(encode_snapshot(self.tick, values, seat.applied_seq, baseline))
+            seat.sent[self.tick] = values
+            trim(seat.sent, SNAPSHOT_HISTORY)
+
+
+class NetClient:
+    """One player's side of a hosted match
+
+    The local paddle is predicted: every input moves it at once, and when a
+    snapshot confirms inputs up to some seq the host's position is taken and
+    the still-unconfirmed inputs replayed on top. The ball and the opponent
+    are drawn INTERP_DELAY_TICKS behind the newest snapshot, blended between
+    the two around that moment, so they move smoothly between 30 Hz updates.
+    """
+    def __init__(self, transport, tick_rate=TICK_RATE):
+        self.transport = transport
+        self.tick_ms = 1000 / tick_rate
+        self.side = None
+        self.seq = 0
+        self.pending = []  # (seq, target) sent but not yet confirmed
+        self.recent = []  # Latest targets, resent for redundancy
+        self.predicted_y = CANVAS_HEIGHT / 2 - PADDLE_HEIGHT / 2
+        self.start_requests = 0
+        self.baselines = {}  # 16-bit tick -> values
+        self.snapshots = []  # (unwrapped tick, values), oldest first
+        self.ack_tick = 0
+        self.received_at = None
+        self.mispredictions = 0
+
+    @property
+    def latest(self):
+        """Values of the newest snapshot, or None before the first"""
+        return self.snapshots[-1][1] if self.snapshots else None
+
+    @property
+    def status(self):
+        latest = self.latest
+        return STATUS_WAITING if latest is None else latest[STATUS]
+
+    @property
+    def scores(self):
+        """(left, right) as of the newest snapshot"""
+        latest = self.latest
+        return (0, 0) if latest is None else (latest[LEFT_SCORE], latest[RIGHT_SCORE])
+
+    def abandon_match(self):
+        """Drop the abandoned match's snapshots and inputs before waiting for a new one
+
+        Side, seq and the delta baselines belong to the connection, which
+        carries on, so they stay.
+        """
+        self.pending = []
+        self.recent = []
+        self.predicted_y = CANVAS_HEIGHT / 2 - PADDLE_HEIGHT / 2
+        self.snapshots = []
+        self.received_at = None
+
+    def request_start(self):
+        """Ask the host for a (new) match; it starts once both players have"""
+        self.start_requests = (self.start_requests + 1) & 0xFF
+
+    def tick(self, target_y):
+        """Send this tick's input and apply it to the predicted paddle at once"""
+        target = max(0, min(quantize(target_y), CANVAS_HEIGHT * POSITION_SCALE))
+        self.seq = (self.seq + 1) & SEQ_MASK
+        self.pending.append((self.seq, target))
+        del self.pending[:-MAX_PENDING_INPUTS]
+        self.recent.append(target)
+        del self.recent[:-(INPUT_REDUNDANCY + 1)]
+        self.predicted_y = steer(self.predicted_y, target)
+        self.transport.send(encode_input(self.seq, self.ack_tick, self.start_requests, self.recent))
+
+    def receive(self, data, now):
+        """Handle one message from the host; `now` is the page clock in ms"""
+        if data[0] == MSG_WELCOME:
+            self.side = data[1]
+        elif data[0] == MSG_SNAPSHOT:
+            decoded = decode_snapshot(data, self.baselines)
+            if decoded is not None:
+                self.on_snapshot(*decoded, now)
+
+    def on_snapshot(self, tick16, values, ack, now):
+        self.baselines[tick16] = values
+        trim(self.baselines, SNAPSHOT_HISTORY)
+        if self.snapshots:
+            last = self.snapshots[-1][0]
+            tick = last + ((tick16 - last + 0x8000) & SEQ_MASK) - 0x8000
+            if tick <= last:
+                return  # Arrived out of order; interpolation has moved past it
+        else:
+            tick = tick16
+        self.snapshots.append((tick, values))
+        del self.snapshots[:-INTERP_BUFFER]
+        self.ack_tick = tick16
+        self.received_at = now
+        if self.side in (LEFT, RIGHT):
+            self.reconcile(values[LEFT_Y + self.side] / POSITION_SCALE, ack)
+
+    def reconcile(self, host_y, ack):
+        """Take the host's paddle and replay the inputs it hasn't applied yet"""
+        self.pending = [(seq, target) for seq, target in self.pending if seq_newer(seq, ack)]
+        y = host_y
+        for _, target in self.pending:
+            y = steer(y, target)
+        if y != self.predicted_y:
+            self.mispredictions += 1
+        self.predicted_y = y
+
+    def view(self, now):
+        """(ball_x, ball_y, left_y, right_y) in px to draw at page time `now`"""
+        snapshots = self.snapshots
+        if not snapshots:
+            middle = CANVAS_HEIGHT / 2 - PADDLE_HEIGHT / 2
+            return None, None, middle, middle
+        newest = snapshots[-1][0]
+        render = min(newest + (now - self.received_at) / self.tick_ms - INTERP_DELAY_TICKS, newest)
+
+        before = after = snapshots[0]
+        for entry in snapshots:
+            if entry[0] <= render:
+                before = after = entry
+            else:
+                after = entry
+                break
+        (t0, a), (t1, b) = before, after
+        share = 0.0 if t1 == t0 else (render - t0) / (t1 - t0)
+        # A point was scored in between: the ball was re-served, so don't streak it
+        if a[LEFT_SCORE] != b[LEFT_SCORE] or a[RIGHT_SCORE] != b[RIGHT_SCORE]:
+            share = 1.0 if share > 0 else 0.0
+        state = [(x + (y - x) * share) / POSITION_SCALE for x, y in zip(a[:RIGHT_Y + 1], b[:RIGHT_Y + 1])]
+        if self.side in (LEFT, RIGHT):
+            state[LEFT_Y + self.side] = self.predicted_y
+        return tuple(state)
+
+
+class LoopbackEnd:
+    """One direction's sending side and the other's inbox, over a LoopbackLink"""
+    def __init__(self, link):
+        self.link = link
+        self.inbox = []  # (due time, order, data)
+        self.peer = None
+        self.bytes_sent = 0
+        self.messages_sent = 0
+        self.order = 0
+
+    def send(self, data):
+        link = self.link
+        self.bytes_sent += len(data)
+        self.messages_sent += 1
+        if link.rng.random() < link.loss:
+            return
+        due = link.now + link.latency_ms + link.rng.uniform(0, link.jitter_ms)
+        self.order += 1
+        self.peer.inbox.append((due, self.order, data))
+
+    def poll(self, now):
+        """Messages that have arrived by `now`, in arrival order"""
+        inbox = self.inbox
+        if not inbox:
+            return []
+        inbox.sort()
+        count = 0
+        while count < len(inbox) and inbox[count][0] <= now:
+            count += 1
+        arrived = [data for _, _, data in inbox[:count]]
+        del inbox[:count]
+        return arrived
+
+
+class LoopbackLink:
+    """In-memory stand-in for a network connection, with latency, jitter and loss"""
+    def __init__(self, latency_ms=50.0, jitter_ms=0.0, loss=0.0, rng=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.loss = loss
+        self.rng = rng or random.Random()
+        self.now = 0.0
+        self.client = LoopbackEnd(self)
+        self.server = LoopbackEnd(self)
+        self.client.peer = self.server
+        self.server.peer = self.client
+
+
+class LoopbackHost:
+    """A MatchHost reached over LoopbackLinks and ticked from the caller's clock
+
+    Stands in for tools/arcade/tennis_server.py in benchmarks and checks:
+    connect() returns a client-side transport, advance(now) delivers what
+    has arrived and runs the host ticks that are due.
+    """
+    def __init__(self, latency_ms=50.0, jitter_ms=0.0, loss=0.0, seed=None):
+        self.host = MatchHost(seed=seed)
+        self.rng = random.Random(seed)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.loss = loss
+        self.links = {}
+        self.timestep = FixedTimestep(TICK_RATE)
+        self.now = 0.0
+
+    def connect(self):
+        link = LoopbackLink(self.latency_ms, self.jitter_ms, self.loss, self.rng)
+        link.now = self.now
+        side = self.host.join(link.server)
+        if side != SIDE_FULL:
+            self.links[side] = link
+        return link.client
+
+    def advance(self, now):
+        self.now = now
+        for side, link in self.links.items():
+            link.now = now
+            for data in link.server.poll(now):
+                self.host.receive(side, data)
+        for _ in range(self.timestep.advance(now)):
+            self.host.step()
@@ -0,0 +1,150 @@
+"""
+Classic Tennis/Pong Game - Frame Profiler
+Optional per-phase timing for the tennis loop. Each phase wraps an existing
+method, samples land in fixed-size ring buffers (no per-frame allocation),
+and p50/p95/p99 are shown in a small overlay and published on window
+"""
+
+from array import array
+from js import document
+import time
+
+import tennis_core
+
+HISTORY_FRAMES = 240  # Ring buffer length: 4 seconds at 60 fps
+OVERLAY_EVERY = 30  # Frames between overlay/window refreshes
+PERCENTILES = (50, 95, 99)
+
+# Phases in overlay order; "collision" is the paddle time-of-impact search,
+# which runs inside "ball" now that collisions are swept
+PHASES = ("frame", "raf_gap", "ball", "collision", "ai", "scoring", "draw")
+
+OVERLAY_STYLE = (
+    "position:absolute;top:4px;left:4px;z-index:20;pointer-events:none;"
+    "font:10px/1.4 monospace;color:#00ff00;background:rgba(0,0,0,0.7);"
+    "padding:4px 6px;white-space:pre;"
+)
+
+
+class RingBuffer:
+    """Fixed-size float history; push overwrites the oldest sample"""
+    def __init__(self, size=HISTORY_FRAMES):
+        self.samples = array("d", bytes(8 * size))
+        self.size = size
+        self.index = 0
+        self.count = 0
+
+    def push(self, value):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def percentiles(self, points=PERCENTILES):
+        """Nearest-rank percentiles over the history (allocates; call rarely)"""
+        if self.count == 0:
+            return [0.0 for _ in points]
+        ordered = sorted(self.samples[:self.count])
+        last = self.count - 1
+        return [ordered[min(last, int(p / 100 * self.count))] for p in points]
+
+
+class FrameProfiler:
+    """Accumulates phase times per frame and keeps rolling histograms"""
+    def __init__(self):
+        self.history = {phase: RingBuffer() for phase in PHASES}
+        self.pending = dict.fromkeys(PHASES, 0.0)
+        self.last_timestamp = None
+        self.frames = 0
+        self.wrapped = []
+
+    def wrap(self, owner, name, phase):
+        """Replace owner.name with a version that adds its run time to `phase`"""
+        inner = getattr(owner, name)
+        pending = self.pending
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return inner(*args, **kwargs)
+            finally:
+                pending[phase] += (clock() - start) * 1000
+
+        setattr(owner, name, timed)
+        self.wrapped.append((owner, name, inner))
+
+    def unwrap(self):
+        """Restore every wrapped method"""
+        for owner, name, inner in reversed(self.wrapped):
+            setattr(owner, name, inner)
+        self.wrapped = []
+
+    def frame_start(self, timestamp):
+        """Record the gap between rAF callbacks"""
+        if self.last_timestamp is not None:
+            self.pending["raf_gap"] = timestamp - self.last_timestamp
+        self.last_timestamp = timestamp
+
+    def frame_end(self):
+        """Commit this frame's phase totals to the histories"""
+        for phase in PHASES:
+            self.history[phase].push(self.pending[phase])
+            self.pending[phase] = 0.0
+        self.frames += 1
+
+    def summary(self):
+        """{phase: {"p50": ms, "p95": ms, "p99": ms}} over the history"""
+        result = {}
+        for phase in PHASES:
+            values = self.history[phase].percentiles()
+            result[phase] = {f"p{p}": round(v, 3) for p, v in zip(PERCENTILES, values)}
+        result["frames"] = self.frames
+        return result
+
+
+class ProfilerOverlay:
+    """Instruments a TennisGame and renders its percentiles over the canvas"""
+    def __init__(self, game):
+        self.game = game
+        self.profiler = FrameProfiler()
+        self.latest = {}
+        self.element = document.createElement("div")
+        self.element.id = "tennis-profiler"
+        self.element.style.cssText = OVERLAY_STYLE
+        game.canvas.parentElement.appendChild(self.element)
+        self.instrument()
+
+    def instrument(self):
+        profiler = self.profiler
+        game = self.game
+        profiler.wrap(game.sim, "move_ball", "ball")
+        profiler.wrap(tennis_core, "paddle_time_of_impact", "collision")
+        profiler.wrap(game.sim.ai, "update", "ai")
+        profiler.wrap(game.sim, "check_scoring", "scoring")
+        profiler.wrap(game, "draw", "draw")
+        profiler.wrap(game, "game_loop", "frame")
+
+    def on_frame(self, timestamp):
+        """Called by the game after each frame it runs"""
+        profiler = self.profiler
+        profiler.frame_start(timestamp)
+        profiler.frame_end()
+        if profiler.frames % OVERLAY_EVERY == 0:
+            self.refresh()
+
+    def refresh(self):
+        self.latest = self.profiler.summary()
+        lines = ["phase      p50    p95    p99 ms"]
+        for phase in PHASES:
+            row = self.latest[phase]
+            lines.append(f"{phase:<9}{row['p50']:>6.2f} {row['p95']:>6.2f} {row['p99']:>6.2f}")
+        self.element.textContent = "\n".join(lines)
+
+    def stats(self):
+        """Latest percentiles, for window.tennisProfile()"""
+        return self.latest
+
+    def remove(self):
+        self.profiler.unwrap()
+        self.element.remove()
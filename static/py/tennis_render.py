@@ -0,0 +1,253 @@
+"""
+Classic Tennis/Pong Game - Canvas Renderer
+Pre-renders the static court and glowing sprites to offscreen canvases (once per
+quality level), then repaints only the regions the ball and paddles touched
+"""
+
+from js import document
+import math
+
+from tennis_core import BALL_RADIUS, CANVAS_HEIGHT, CANVAS_WIDTH, PADDLE_HEIGHT, PADDLE_WIDTH
+
+# Colors (neon arcade style)
+COLOR_BG = "#0a0a0a"
+COLOR_PADDLE = "#00ff00"
+COLOR_BALL = "#ff00ff"
+COLOR_CENTER_LINE = "#333333"
+COLOR_BRICK = "#00ffff"
+
+# Glow strength (shadowBlur) at full quality
+PADDLE_GLOW = 15
+BALL_GLOW = 20
+
+# Cheaper settings the quality governor steps down through: glow is a
+# fraction of full strength, scale the canvas's internal resolution (CSS
+# stretches it back to full size)
+QUALITY_LEVELS = (
+    {"name": "full", "glow": 1.0, "scale": 1.0},
+    {"name": "soft-glow", "glow": 0.5, "scale": 1.0},
+    {"name": "no-glow", "glow": 0.0, "scale": 1.0},
+    {"name": "three-quarter-res", "glow": 0.0, "scale": 0.75},
+    {"name": "half-res", "glow": 0.0, "scale": 0.5},
+)
+
+
+def glow_margin(blur):
+    """Whole pixels of halo a shadowBlur of `blur` spills outside its shape"""
+    return math.ceil(blur) + 2 if blur else 0
+
+
+def make_layer(width, height):
+    """Create an offscreen canvas and its 2D context"""
+    canvas = document.createElement("canvas")
+    canvas.width = width
+    canvas.height = height
+    return canvas, canvas.getContext("2d")
+
+
+def overlaps(a, b):
+    """True when rects (x, y, w, h) a and b intersect"""
+    return (a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and
+            a[1] < b[1] + b[3] and b[1] < a[1] + a[3])
+
+
+def clip_to_canvas(rect, width, height):
+    """Clamp rect (x, y, w, h) to a width x height canvas; None when fully off-screen"""
+    x0 = max(rect[0], 0)
+    y0 = max(rect[1], 0)
+    x1 = min(rect[0] + rect[2], width)
+    y1 = min(rect[1] + rect[3], height)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+class RenderCache:
+    """Cached court/sprite layers plus dirty-rectangle tracking for the canvas
+
+    Draws go through `surface` (see arcade_canvas.make_surface), which queues
+    them and hands the frame to the canvas in one flush. Positions come in
+    as court coordinates; layers and rects are in canvas pixels, `scale`
+    of those.
+    """
+    def __init__(self, surface, glow=1.0, scale=1.0):
+        self.surface = surface
+        self.background_id = self.paddle_id = self.ball_id = None
+        self.bricks = {}  # Arena bricks still standing, painted into the background
+        self.erased = []  # Canvas rects of bricks broken since the last draw
+        self.configure(glow, scale)
+
+    def configure(self, glow, scale):
+        """Re-render the layers for a glow strength and canvas scale"""
+        self.glow = glow
+        self.scale = scale
+        self.width = round(CANVAS_WIDTH * scale)
+        self.height = round(CANVAS_HEIGHT * scale)
+        self.background = self.render_background()
+        self.paddle_sprite, self.paddle_margin = self.render_paddle()
+        self.ball_sprite, self.ball_margin = self.render_ball()
+        self.paddle_size = (self.paddle_sprite.width, self.paddle_sprite.height)
+        self.ball_half = self.ball_sprite.width / 2
+        self.background_id = self.surface.register(self.background, self.background_id)
+        self.paddle_id = self.surface.register(self.paddle_sprite, self.paddle_id)
+        self.ball_id = self.surface.register(self.ball_sprite, self.ball_id)
+        self.last_rects = {}
+        self.full_redraw = True
+
+    def render_background(self):
+        """Court fill and dashed center line, drawn once"""
+        layer, ctx = make_layer(self.width, self.height)
+        ctx.scale(self.scale, self.scale)
+        ctx.fillStyle = COLOR_BG
+        ctx.fillRect(0, 0, CANVAS_WIDTH, CANVAS_HEIGHT)
+
+        ctx.setLineDash([10, 10])
+        ctx.strokeStyle = COLOR_CENTER_LINE
+        ctx.lineWidth = 2
+        ctx.beginPath()
+        ctx.moveTo(CANVAS_WIDTH / 2, 0)
+        ctx.lineTo(CANVAS_WIDTH / 2, CANVAS_HEIGHT)
+        ctx.stroke()
+        ctx.setLineDash([])
+
+        if self.bricks:
+            ctx.fillStyle = COLOR_BRICK
+            for x, y, w, h in self.bricks.values():
+                ctx.fillRect(x, y, w, h)
+        ctx.setTransform(1, 0, 0, 1, 0, 0)  # erase_brick works in canvas pixels
+        self.background_ctx = ctx
+        return layer
+
+    def render_paddle(self):
+        """Glowing paddle sprite with room for its blur halo"""
+        blur = PADDLE_GLOW * self.glow * self.scale  # shadowBlur ignores transforms
+        margin = glow_margin(blur)
+        width = round(PADDLE_WIDTH * self.scale)
+        height = round(PADDLE_HEIGHT * self.scale)
+        layer, ctx = make_layer(width + 2 * margin, height + 2 * margin)
+        ctx.fillStyle = COLOR_PADDLE
+        if blur:
+            ctx.shadowColor = COLOR_PADDLE
+            ctx.shadowBlur = blur
+        ctx.fillRect(margin, margin, width, height)
+        return layer, margin
+
+    def render_ball(self):
+        """Glowing ball sprite with room for its blur halo"""
+        blur = BALL_GLOW * self.glow * self.scale
+        margin = glow_margin(blur)
+        radius = BALL_RADIUS * self.scale
+        size = math.ceil(2 * (radius + margin))
+        layer, ctx = make_layer(size, size)
+        ctx.beginPath()
+        ctx.arc(size / 2, size / 2, radius, 0, 2 * math.pi)
+        ctx.fillStyle = COLOR_BALL
+        if blur:
+            ctx.shadowColor = COLOR_BALL
+            ctx.shadowBlur = blur
+        ctx.fill()
+        return layer, margin
+
+    def invalidate(self):
+        """Force the next draw to repaint the whole canvas"""
+        self.full_redraw = True
+
+    def set_bricks(self, bricks):
+        """Paint a fresh wall ({index: (x, y, w, h)} in court units) into the background"""
+        self.bricks = dict(bricks)
+        self.erased = []
+        self.configure(self.glow, self.scale)
+
+    def erase_brick(self, index):
+        """Clear a broken brick from the background; the next draw restores its spot"""
+        rect = self.bricks.pop(index, None)
+        if rect is None:
+            return
+        s = self.scale
+        x0 = math.floor(rect[0] * s)
+        y0 = math.floor(rect[1] * s)
+        x1 = math.ceil((rect[0] + rect[2]) * s)
+        y1 = math.ceil((rect[1] + rect[3]) * s)
+        ctx = self.background_ctx
+        ctx.fillStyle = COLOR_BG
+        ctx.fillRect(x0, y0, x1 - x0, y1 - y0)
+        self.erased.append((x0, y0, x1 - x0, y1 - y0))
+
+    def sprite_rects(self, player_x, player_y, ai_x, ai_y, ball_x, ball_y):
+        """Integer canvas rects each sprite covers, halo included"""
+        s = self.scale
+        pm = self.paddle_margin
+        paddle_w, paddle_h = self.paddle_size
+        half = self.ball_half
+        ball_size = 2 * half
+        return {
+            "player": (round(player_x * s) - pm, round(player_y * s) - pm, paddle_w, paddle_h),
+            "ai": (round(ai_x * s) - pm, round(ai_y * s) - pm, paddle_w, paddle_h),
+            "ball": (round(ball_x * s - half), round(ball_y * s - half), ball_size, ball_size),
+        }
+
+    def draw(self, player_x, player_y, ai_x, ai_y, ball_x, ball_y):
+        """Repaint what changed since the last frame"""
+        surface = self.surface
+        rects = self.sprite_rects(player_x, player_y, ai_x, ai_y, ball_x, ball_y)
+
+        if self.full_redraw:
+            surface.image(self.background_id, 0, 0)
+            dirty = list(rects.values())
+            self.full_redraw = False
+        else:
+            # Restore the court under every sprite that moved, old and new
+            # spot, and where bricks broke
+            dirty = self.erased
+            for key, rect in rects.items():
+                old = self.last_rects.get(key)
+                if old != rect:
+                    for r in (old, rect):
+                        clipped = clip_to_canvas(r, self.width, self.height)
+                        if clipped:
+                            dirty.append(clipped)
+            # A still sprite under a restored region is redrawn whole, so its
+            # whole rect is restored first; otherwise the glow outside the
+            # region would stack on last frame's. That can pull in another
+            # sprite, so repeat until nothing new overlaps
+            redrawn = set()
+            grew = True
+            while grew:
+                grew = False
+                for key, rect in rects.items():
+                    if key not in redrawn and any(overlaps(rect, d) for d in dirty):
+                        redrawn.add(key)
+                        clipped = clip_to_canvas(rect, self.width, self.height)
+                        if clipped and clipped not in dirty:
+                            dirty.append(clipped)
+                        grew = True
+            for x, y, w, h in dirty:
+                surface.image_region(self.background_id, x, y, w, h)
+
+        # Redraw sprites that moved or sit under a restored region
+        sprites = {"player": self.paddle_id, "ai": self.paddle_id, "ball": self.ball_id}
+        for key, rect in rects.items():
+            if any(overlaps(rect, d) for d in dirty):
+                surface.image(sprites[key], rect[0], rect[1])
+
+        surface.flush()
+        self.last_rects = rects
+        self.erased = []
+
+    def draw_many(self, player_x, player_y, ai_x, ai_y, ball_points):
+        """Repaint the whole court with a ball sprite at each corner in `ball_points`
+
+        With hundreds of balls nearly every region is dirty anyway, so this
+        skips the rect bookkeeping. `ball_points` is a flat float32 array of
+        sprite corners (x0, y0, x1, y1, ...) queued as one command.
+        """
+        surface = self.surface
+        s = self.scale
+        pm = self.paddle_margin
+        surface.image(self.background_id, 0, 0)
+        surface.image(self.paddle_id, round(player_x * s) - pm, round(player_y * s) - pm)
+        surface.image(self.paddle_id, round(ai_x * s) - pm, round(ai_y * s) - pm)
+        surface.images(self.ball_id, ball_points)
+        surface.flush()
+        # The next single-ball draw can't trust last_rects
+        self.full_redraw = True
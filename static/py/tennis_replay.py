@@ -0,0 +1,184 @@
+"""
+Classic Tennis/Pong Game - Match Recording and Replay
+Logs the player's paddle once per tick in a compact array and re-runs a
+match bit-exactly from its seed, headless at full speed or paced for display
+"""
+
+from array import array
+import base64
+import struct
+import sys
+import time
+import zlib
+
+from tennis_arena import ArenaSimulation
+from tennis_core import TennisSimulation
+
+# Paddle positions are stored in 1/POSITION_SCALE px steps as uint16, so
+# 2 bytes a tick; the scale is a power of two so replayed values are exact
+POSITION_SCALE = 16
+
+REPLAY_MAGIC = b"TNR2"
+# magic, seed, difficulty, dt, ticks, checksum of the final state, brick count (0: plain court)
+HEADER = struct.Struct("<4sIddIIH")
+# Replays shared before arena mode: the same without the brick count
+LEGACY_MAGIC = b"TNR1"
+LEGACY_HEADER = struct.Struct("<4sIddII")
+
+
+def quantize(y):
+    """Paddle y as the integer the recorder stores"""
+    return round(y * POSITION_SCALE)
+
+
+def make_simulation(bricks=0):
+    """A fresh simulation for the court a replay was recorded on"""
+    return ArenaSimulation(bricks) if bricks else TennisSimulation()
+
+
+def state_checksum(sim):
+    """CRC of everything a replay has to reproduce"""
+    ball = sim.ball
+    state = struct.pack(
+        "<dddddII", ball.x, ball.y, ball.vx, ball.vy, sim.ai_paddle.y,
+        sim.player.score, sim.ai_paddle.score,
+    )
+    return zlib.crc32(state)
+
+
+class Replay:
+    """One recorded match: seed, settings, court and per-tick paddle positions"""
+    def __init__(self, seed, difficulty, dt, positions, checksum=0, bricks=0):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.dt = dt
+        self.positions = positions
+        self.checksum = checksum
+        self.bricks = bricks
+
+    @property
+    def ticks(self):
+        return len(self.positions)
+
+    def to_bytes(self):
+        header = HEADER.pack(
+            REPLAY_MAGIC, self.seed, self.difficulty, self.dt, self.ticks, self.checksum, self.bricks,
+        )
+        positions = array("H", self.positions)
+        if sys.byteorder != "little":
+            positions.byteswap()
+        return header + positions.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic = data[:4]
+        if magic == REPLAY_MAGIC:
+            header = HEADER
+            _, seed, difficulty, dt, ticks, checksum, bricks = header.unpack_from(data)
+        elif magic == LEGACY_MAGIC:
+            header = LEGACY_HEADER
+            _, seed, difficulty, dt, ticks, checksum = header.unpack_from(data)
+            bricks = 0
+        else:
+            raise ValueError("not a tennis replay")
+        positions = array("H")
+        positions.frombytes(data[header.size:header.size + 2 * ticks])
+        if sys.byteorder != "little":
+            positions.byteswap()
+        if len(positions) != ticks:
+            raise ValueError("truncated tennis replay")
+        return cls(seed, difficulty, dt, positions, checksum, bricks)
+
+    def to_text(self):
+        """Compressed, URL-safe form for sharing (?replay=...)"""
+        return base64.urlsafe_b64encode(zlib.compress(self.to_bytes(), 9)).decode("ascii")
+
+    @classmethod
+    def from_text(cls, text):
+        return cls.from_bytes(zlib.decompress(base64.urlsafe_b64decode(text)))
+
+
+class InputRecorder:
+    """Collects the player's paddle position at every tick of a match"""
+    def __init__(self):
+        self.positions = array("H")
+        self.seed = None
+        self.difficulty = None
+        self.dt = None
+        self.bricks = 0
+
+    def begin(self, sim, dt):
+        """Start a new log for the match sim has just been reset for"""
+        self.positions = array("H")
+        self.seed = sim.seed
+        self.difficulty = sim.ai.difficulty
+        self.dt = dt
+        self.bricks = sim.bricks
+
+    def record(self, y):
+        """Log this tick's paddle y; returns the value the simulation must use
+
+        The live game steps with the quantized position too, which is what
+        makes the replay exact.
+        """
+        value = quantize(y)
+        self.positions.append(value)
+        return value / POSITION_SCALE
+
+    def finish(self, sim):
+        """The finished match as a Replay"""
+        return Replay(
+            self.seed, self.difficulty, self.dt, self.positions, state_checksum(sim), self.bricks,
+        )
+
+
+class ReplayEngine:
+    """Re-runs a Replay tick by tick on a (possibly shared) TennisSimulation
+
+    A shared sim must be for the replay's court; without one a matching
+    simulation is made.
+    """
+    def __init__(self, replay, sim=None):
+        if sim is not None and sim.bricks != replay.bricks:
+            raise ValueError(f"replay was recorded with {replay.bricks} bricks, not {sim.bricks}")
+        self.replay = replay
+        self.sim = sim or make_simulation(replay.bricks)
+        self.sim.ai.difficulty = replay.difficulty
+        self.sim.reset_match(replay.seed)
+        self.tick = 0
+
+    @property
+    def done(self):
+        return self.tick >= self.replay.ticks
+
+    def step(self):
+        """Advance one recorded tick; returns the scorer like TennisSimulation.step"""
+        self.sim.player.y = self.replay.positions[self.tick] / POSITION_SCALE
+        self.tick += 1
+        return self.sim.step(self.replay.dt)
+
+    def run(self):
+        """Play the rest of the replay as fast as possible"""
+        step = self.step
+        for _ in range(self.replay.ticks - self.tick):
+            step()
+        return self.sim
+
+    def verify(self):
+        """Run to the end; True when the final state matches the recording"""
+        self.run()
+        return state_checksum(self.sim) == self.replay.checksum
+
+
+if __name__ == "__main__":
+    # python tennis_replay.py <file with replay text>: headless check
+    replay = Replay.from_text(open(sys.argv[1]).read().strip())
+    start = time.perf_counter()
+    engine = ReplayEngine(replay)
+    ok = engine.verify()
+    elapsed = time.perf_counter() - start
+    print(f"ticks: {replay.ticks}")
+    print(f"bricks: {replay.bricks}")
+    print(f"score: {engine.sim.player.score} - {engine.sim.ai_paddle.score}")
+    print(f"bit-exact: {ok}")
+    print(f"speed: {replay.ticks / elapsed:,.0f} ticks/s")
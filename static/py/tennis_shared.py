@@ -0,0 +1,90 @@
+"""
+Classic Tennis/Pong Game - Shared State Buffer
+Slot layout of the Float32Array that a simulation worker and the main-thread
+renderer share, with the writer and reader that keep copies consistent
+"""
+
+from array import array
+
+# Worker-written block. COMMIT and BEGIN bracket every publish (a seqlock):
+# the writer bumps BEGIN, copies the state, then sets COMMIT to match, so a
+# reader whose copy overlapped a write sees the two disagree
+COMMIT = 0
+BALL_X = 1
+BALL_Y = 2
+AI_Y = 3
+PREV_BALL_X = 4
+PREV_BALL_Y = 5
+PREV_AI_Y = 6
+PLAYER_SCORE = 7
+AI_SCORE = 8
+STATUS = 9
+MATCH = 10  # Start requests the worker has acted on
+TICK = 11  # Simulation ticks run, so the renderer can spot a fresh one
+BEGIN = 12
+STATE_SLOTS = 13
+
+# Main-thread-written input, outside the block the worker copies over
+MOUSE_Y = 13
+START_REQUESTS = 14
+DIFFICULTY = 15  # AIController difficulty for the next match
+SLOTS = 16
+BUFFER_BYTES = SLOTS * 4
+
+STATUS_IDLE = 0
+STATUS_RUNNING = 1
+STATUS_OVER = 2
+
+# Counters wrap here so they stay exact as float32
+COUNTER_LIMIT = 1 << 24
+
+
+class StateWriter:
+    """Worker side: publishes simulation state with one block copy per tick"""
+    def __init__(self, shared):
+        self.shared = shared
+        self.block = shared.subarray(1, BEGIN)
+        self.local = array("f", bytes(4 * (BEGIN - 1)))
+        self.seq = 0
+
+    def publish(self, sim, prev, status, match, tick):
+        """Write sim's positions and scores; prev is (ball_x, ball_y, ai_y) a tick ago"""
+        local = self.local
+        local[BALL_X - 1] = sim.ball.x
+        local[BALL_Y - 1] = sim.ball.y
+        local[AI_Y - 1] = sim.ai_paddle.y
+        local[PREV_BALL_X - 1], local[PREV_BALL_Y - 1], local[PREV_AI_Y - 1] = prev
+        local[PLAYER_SCORE - 1] = sim.player.score
+        local[AI_SCORE - 1] = sim.ai_paddle.score
+        local[STATUS - 1] = status
+        local[MATCH - 1] = match
+        local[TICK - 1] = tick % COUNTER_LIMIT
+
+        self.seq = (self.seq + 1) % COUNTER_LIMIT
+        self.shared[BEGIN] = self.seq
+        self.block.assign(local)
+        self.shared[COMMIT] = self.seq
+
+
+class StateReader:
+    """Main-thread side: copies the worker block out in one FFI call per frame"""
+    def __init__(self, shared):
+        self.block = shared.subarray(0, STATE_SLOTS)
+        self.state = array("f", bytes(4 * STATE_SLOTS))  # Last consistent copy
+        self.scratch = array("f", bytes(4 * STATE_SLOTS))
+        self.torn = 0
+
+    def read(self):
+        """Refresh `state`; True when it holds a tick not seen before
+
+        A copy that raced a publish is dropped and the previous state kept;
+        the next frame reads again.
+        """
+        scratch = self.scratch
+        self.block.assign_to(scratch)
+        if scratch[COMMIT] != scratch[BEGIN]:
+            self.torn += 1
+            return False
+        fresh = scratch[TICK] != self.state[TICK]
+        self.state, self.scratch = scratch, self.state
+        return fresh
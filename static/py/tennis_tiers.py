@@ -0,0 +1,16 @@
+"""
+Classic Tennis/Pong Game - Difficulty Tiers
+Generated by tools/arcade/calibrate.py from self-play against scripted
+players; re-run it (make calibrate) instead of editing by hand
+"""
+
+# AIController difficulty per tier, with the win rate and mean rally the
+# "average" player model got there (400 matches per sampled difficulty)
+REFERENCE_MODEL = "average"
+DEFAULT_TIER = "normal"
+
+TIERS = {
+    "easy": {"difficulty": 0.801, "player_win_rate": 0.80, "mean_rally": 9.3},
+    "normal": {"difficulty": 0.91, "player_win_rate": 0.50, "mean_rally": 11.3},
+    "hard": {"difficulty": 0.977, "player_win_rate": 0.35, "mean_rally": 12.0},
+}
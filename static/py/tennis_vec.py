@@ -0,0 +1,51 @@
+"""
+Classic Tennis/Pong Game - Vectorised Paddle Sweep
+The swept ball-against-paddle step shared by the NumPy simulations
+(tennis_batch and tennis_chaos), one array slot per ball
+"""
+
+import numpy as np
+
+from tennis_core import (
+    BALL_RADIUS, BALL_SPEEDUP, BALL_SPIN, CANVAS_WIDTH, PADDLE_HEIGHT, PADDLE_OFFSET,
+    PADDLE_WIDTH, fold_y,
+)
+
+PLAYER_X = PADDLE_OFFSET
+AI_X = CANVAS_WIDTH - PADDLE_OFFSET - PADDLE_WIDTH
+
+# Ball-centre x where it touches each paddle's open face, and the far edge
+PLAYER_FACE = PLAYER_X + PADDLE_WIDTH + BALL_RADIUS
+PLAYER_BACK = PLAYER_X - BALL_RADIUS
+AI_FACE = AI_X - BALL_RADIUS
+AI_BACK = AI_X + PADDLE_WIDTH + BALL_RADIUS
+
+
+def sweep_paddles(x, y, vx, vy, player_y, ai_y, dt=1.0):
+    """Move every ball `dt` ticks: at most one paddle hit each, walls folded in closed form
+
+    A ball can only reach the paddle it's heading towards, so the time it
+    crosses that paddle's face is (face - x) / vx, and folding y at that
+    time gives the exact contact point however many walls it bounced off.
+    Paddle ys may be scalars or per-ball arrays. Returns new (x, y, vx, vy)
+    arrays and the mask of balls that hit a paddle.
+    """
+    left = vx < 0
+    face = np.where(left, PLAYER_FACE, AI_FACE)
+    paddle_y = np.where(left, player_y, ai_y)
+
+    # A ball already overlapping the paddle edge-on hits straight away
+    inside = np.where(left, (x < face) & (x >= PLAYER_BACK), (x > face) & (x <= AI_BACK))
+    t = np.where(inside, 0.0, (face - x) / vx)
+    contact_y, _ = fold_y(y + vy * t)
+    hit = (t >= 0) & (t <= dt) & (contact_y >= paddle_y) & (contact_y <= paddle_y + PADDLE_HEIGHT)
+
+    # Hits leave the face with the paddle's spin for the rest of the tick
+    span = np.where(hit, dt - t, dt)
+    new_vx = np.where(hit, -vx * BALL_SPEEDUP, vx)
+    new_vy = np.where(hit, ((contact_y - paddle_y) / PADDLE_HEIGHT - 0.5) * BALL_SPIN, vy)
+    start_x = np.where(hit, face, x)
+    start_y = np.where(hit, contact_y, y)
+
+    new_y, flipped = fold_y(start_y + new_vy * span)
+    return start_x + new_vx * span, new_y, new_vx, new_vy * (1 - 2 * flipped), hit
@@ -0,0 +1,87 @@
+"""
+Classic Tennis/Pong Game - Simulation Worker
+Runs TennisSimulation in a PyScript worker at a fixed tick rate, reading the
+mouse from and publishing every tick into the page's SharedArrayBuffer
+"""
+
+from js import Float32Array, performance, setInterval
+from polyscript import xworker
+from pyodide.ffi import create_proxy
+
+from tennis_core import PHYSICS_RATE, TICK_RATE, FixedTimestep, TennisSimulation
+from tennis_shared import (
+    DIFFICULTY, MOUSE_Y, START_REQUESTS, STATUS_IDLE, STATUS_OVER, STATUS_RUNNING, StateWriter,
+)
+
+
+class SimulationWorker:
+    """Owns the simulation; the page only ever sees the shared buffer"""
+    def __init__(self, tick_rate=TICK_RATE):
+        self.sim = TennisSimulation()
+        self.timestep = FixedTimestep(tick_rate)
+        self.dt = PHYSICS_RATE / tick_rate
+        self.interval_ms = 1000 / tick_rate
+        self.shared = None
+        self.writer = None
+        self.proxy = None
+        self.status = STATUS_IDLE
+        self.match = 0
+        self.ticks = 0
+        self.prev = (self.sim.ball.x, self.sim.ball.y, self.sim.ai_paddle.y)
+
+    def attach(self, buffer):
+        """Start ticking against the page's SharedArrayBuffer"""
+        self.shared = Float32Array.new(buffer)
+        self.writer = StateWriter(self.shared)
+        self.publish()
+        self.proxy = create_proxy(self.on_interval)
+        setInterval(self.proxy, self.interval_ms)
+
+    def on_interval(self, *args):
+        requests = self.shared[START_REQUESTS]
+        if requests != self.match:
+            self.start(requests)
+        if self.status != STATUS_RUNNING:
+            return
+
+        self.sim.player.move_to(self.shared[MOUSE_Y])
+        steps = self.timestep.advance(performance.now())
+        for _ in range(steps):
+            self.save_previous()
+            self.ticks += 1
+            if self.sim.step(self.dt) is not None:
+                # Ball was re-served: don't interpolate across the jump
+                self.save_previous()
+                if self.sim.winner() is not None:
+                    self.status = STATUS_OVER
+                    break
+        if steps:
+            self.publish()
+
+    def start(self, match):
+        """Begin the match the page asked for"""
+        self.match = match
+        self.status = STATUS_RUNNING
+        self.sim.ai.difficulty = self.shared[DIFFICULTY]
+        self.sim.reset_match()
+        self.save_previous()
+        self.timestep.reset()
+        self.publish()
+
+    def save_previous(self):
+        self.prev = (self.sim.ball.x, self.sim.ball.y, self.sim.ai_paddle.y)
+
+    def publish(self):
+        self.writer.publish(self.sim, self.prev, self.status, self.match, self.ticks)
+
+
+worker = SimulationWorker()
+
+
+def on_message(event):
+    """The page answers our "ready" with the SharedArrayBuffer"""
+    worker.attach(event.data)
+
+
+xworker.onmessage = create_proxy(on_message)
+xworker.postMessage("ready")
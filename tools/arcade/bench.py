@@ -0,0 +1,643 @@
+"""
+Arcade benchmarks - run the PyScript games headless under CPython
+Drives scripted scenarios through the real game classes with fake js /
+pyodide modules and writes ns per tick, DOM/canvas calls per frame and
+allocation counters to a JSON file
+
+Usage: python tools/arcade/bench.py [--out bench_output.json] [--scenario NAME]
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import runpy
+import sys
+import time
+import types
+import zipfile
+from io import BytesIO
+from pathlib import Path
+
+import fakejs
+
+STATIC_PY = Path(__file__).resolve().parents[2] / "static" / "py"
+FRAME_MS = 1000 / 60
+CANVAS_MIDDLE = 300
+
+
+def load_game(module, flags=()):
+    """Import a game module against fresh fakes and return (js, game)"""
+    js = fakejs.install(flags)
+    if str(STATIC_PY) not in sys.path:
+        sys.path.insert(0, str(STATIC_PY))
+
+    # Game modules bind js names at import time, so drop cached copies
+    for name, mod in list(sys.modules.items()):
+        if getattr(mod, "__file__", None) and Path(mod.__file__).parent == STATIC_PY:
+            del sys.modules[name]
+    namespace = runpy.run_path(str(STATIC_PY / f"{module}.py"), run_name="__bench__")
+    return js, namespace["game"]
+
+
+class Timer:
+    """Wraps a callable attribute on an object, accumulating calls and ns"""
+    def __init__(self, obj, name):
+        self.calls = 0
+        self.ns = 0
+        self.inner = getattr(obj, name)
+        setattr(obj, name, self)
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return self.inner(*args, **kwargs)
+        finally:
+            self.ns += time.perf_counter_ns() - start
+            self.calls += 1
+
+    def per_call(self):
+        return self.ns / self.calls if self.calls else 0.0
+
+
+class Sampler:
+    """FFI call counts, GC activity and retained blocks across a scenario"""
+    def __enter__(self):
+        gc.collect()
+        fakejs.reset_counts()
+        self.gen0 = gc.get_stats()[0]["collections"]
+        self.blocks = sys.getallocatedblocks()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.ns = time.perf_counter_ns() - self.start
+        self.gen0 = gc.get_stats()[0]["collections"] - self.gen0
+        self.blocks = sys.getallocatedblocks() - self.blocks
+        self.dom = fakejs.calls["dom"]
+        self.canvas = fakejs.calls["canvas"]
+
+    def per(self, count):
+        count = max(count, 1)
+        return {
+            "ns_per_frame": self.ns / count,
+            "dom_calls_per_frame": self.dom / count,
+            "canvas_calls_per_frame": self.canvas / count,
+            "gc_gen0_per_frame": self.gen0 / count,
+            "retained_blocks_per_frame": self.blocks / count,
+        }
+
+
+def move_mouse(game, y):
+    game.canvas.dispatch("pointermove", types.SimpleNamespace(clientY=y, clientX=0))
+
+
+def press(js, key, down=True):
+    event = types.SimpleNamespace(key=key, preventDefault=lambda: None)
+    js.document.dispatch("keydown" if down else "keyup", event)
+
+
+def tennis_frames(game, js, frames, player_speed):
+    """Play `frames` animation frames with a scripted mouse, restarting after game over"""
+    update = Timer(game, "update")
+    draw = Timer(game, "draw")
+    ai = Timer(game.ai, "update")
+    mouse_y = game.player.y + game.player.height / 2
+    game.start()
+    js.window.tick(FRAME_MS)
+    with Sampler() as sample:
+        for _ in range(frames):
+            if game.game_over:
+                game.start()
+            diff = game.ball.y - mouse_y
+            mouse_y += max(-player_speed, min(player_speed, diff))
+            move_mouse(game, mouse_y)
+            js.window.tick(FRAME_MS)
+    result = sample.per(frames)
+    result.update({
+        "frames": frames,
+        "ticks": update.calls,
+        "ns_per_tick": update.per_call(),
+        "ns_per_draw": draw.per_call(),
+        "ns_per_ai_update": ai.per_call(),
+        "live_proxies": fakejs.FakeProxy.live,
+    })
+    return result
+
+
+def bench_tennis_long_rally(frames):
+    """Perfect player vs the hard-tier AI: long, fast rallies"""
+    js, game = load_game("tennis_game")
+    game.set_tier("hard")
+    return tennis_frames(game, js, frames, player_speed=1000)
+
+
+def bench_tennis_full_match(frames):
+    """Lagging player vs the default AI until someone wins"""
+    js, game = load_game("tennis_game")
+    update = Timer(game, "update")
+    game.start()
+    js.window.tick(FRAME_MS)
+    mouse_y = game.player.y
+    count = 0
+    with Sampler() as sample:
+        while not game.game_over and count < frames:
+            diff = game.ball.y - mouse_y
+            mouse_y += max(-6, min(6, diff))
+            move_mouse(game, mouse_y)
+            js.window.tick(FRAME_MS)
+            count += 1
+    result = sample.per(count)
+    result.update({
+        "frames": count,
+        "ticks": update.calls,
+        "ns_per_tick": update.per_call(),
+        "score": [game.player.score, game.ai_paddle.score],
+        "live_proxies": fakejs.FakeProxy.live,
+    })
+    return result
+
+
+def bench_tennis_chaos(frames, balls):
+    """Chaos mode: `balls` balls per tick, every one drawn each frame"""
+    js, game = load_game("tennis_game", flags=(f"chaos={balls}",))
+    update = Timer(game, "update")
+    draw = Timer(game, "draw")
+    game.start()
+    js.window.tick(FRAME_MS)
+    count = 0
+    with Sampler() as sample:
+        while not game.game_over and count < frames:
+            move_mouse(game, 300 + 200 * ((count // 60) % 2))
+            js.window.tick(FRAME_MS)
+            count += 1
+    result = sample.per(count)
+    result.update({
+        "balls": game.field.n,
+        "frames": count,
+        "ticks": update.calls,
+        "ns_per_tick": update.per_call(),
+        "ns_per_draw": draw.per_call(),
+        "frame_budget_share": sample.ns / max(count, 1) / (FRAME_MS * 1e6),
+        "paddle_hits": game.field.hits,
+        "score": [game.player.score, game.ai_paddle.score],
+    })
+    return result
+
+
+def bench_tennis_quality(frames):
+    """The quality governor on a simulated device whose frame time depends on the level
+
+    Each phase gives the frame gap (ms) at every quality level: a heavy
+    load, a light one, then a borderline one that tempts oscillation.
+    """
+    phases = (
+        ("heavy", (28.0, 24.0, 21.0, 18.0, FRAME_MS)),
+        ("light", (FRAME_MS,) * 5),
+        ("borderline", (20.5, 20.5, 17.0, FRAME_MS, FRAME_MS)),
+    )
+    js, game = load_game("tennis_game")
+    draw = Timer(game, "draw")
+    idle_probe(js, FRAME_MS)
+    game.start()
+    js.window.tick(FRAME_MS)
+    result = {"budget_ms": round(game.quality.budget_ms, 2)}
+    count = 0
+    with Sampler() as sample:
+        for name, gaps in phases:
+            changes = game.quality.changes
+            for i in range(frames // len(phases)):
+                if game.game_over:
+                    game.start()
+                move_mouse(game, game.ball.y)
+                js.window.tick(gaps[game.quality.level] + (i % 3 - 1) * 0.3)  # A little vsync jitter
+                count += 1
+            result[f"{name}_level"] = game.quality.level
+            result[f"{name}_changes"] = game.quality.changes - changes
+    result.update(sample.per(count))
+    result.update({
+        "frames": count,
+        "ns_per_draw": draw.per_call(),
+        "restore_after": game.quality.restore_after,
+        "canvas_width": game.canvas.width,
+        "pinned_pointer_error": pinned_pointer_error(),
+    })
+    result.update(display_30hz(frames // len(phases)))
+    return result
+
+
+def idle_probe(js, gap):
+    """Let the start overlay idle long enough for the governor's refresh probe"""
+    for _ in range(int(1.2 * sys.modules["arcade_quality"].PROBE_MS / gap) + 2):
+        js.window.tick(gap)
+
+
+def display_30hz(frames):
+    """A display locked to 30 Hz that keeps up with it: quality should stay at the top"""
+    gap = 1000 / 30
+    js, game = load_game("tennis_game")
+    idle_probe(js, gap)
+    game.start()
+    for i in range(frames):
+        if game.game_over:
+            game.start()
+        move_mouse(game, game.ball.y)
+        js.window.tick(gap + (i % 3 - 1) * 0.3)
+    return {
+        "display_30hz_budget_ms": round(game.quality.budget_ms, 2),
+        "display_30hz_level": game.quality.level,
+        "display_30hz_changes": game.quality.changes,
+    }
+
+
+def pinned_pointer_error(y=550):
+    """Worst paddle-centre miss (court px) for a pointer at `y`, across every pinned ?quality=N
+
+    Lower levels shrink the canvas; the pointer must still map onto the whole court.
+    """
+    worst = 0.0
+    level = 0
+    while True:
+        js, game = load_game("tennis_game", flags=(f"quality={level}",))
+        game.start()
+        move_mouse(game, y)
+        js.window.tick(FRAME_MS)
+        worst = max(worst, abs(game.player.y + game.player.height / 2 - y))
+        level += 1
+        if level == game.quality.levels:
+            return worst
+
+
+def bench_tennis_arena(frames, counts=(100, 400, 1600, 4000)):
+    """Arena mode at growing brick counts: tick cost should stay flat
+
+    tests_per_query is what the grid checks per sweep; a brute-force scan
+    would check every live brick.
+    """
+    result = {}
+    for count in counts:
+        js, game = load_game("tennis_game", flags=(f"arena={count}",))
+        game.set_tier("hard")
+        update = Timer(game, "update")
+        game.start()
+        js.window.tick(FRAME_MS)
+        queries = tests = broken = 0
+        with Sampler() as sample:
+            for i in range(frames + 1):
+                grid = game.sim.grid
+                if game.game_over or i == frames:
+                    queries += grid.queries
+                    tests += grid.tests
+                    broken += len(grid.alive) - grid.live
+                    if i == frames:
+                        break
+                    game.start()
+                move_mouse(game, game.ball.y)
+                js.window.tick(FRAME_MS)
+        result[f"ns_per_tick_{count}"] = update.per_call()
+        result[f"tests_per_query_{count}"] = tests / max(queries, 1)
+        result[f"canvas_calls_per_frame_{count}"] = sample.canvas / frames
+        result[f"broken_{count}"] = broken
+    result["frames"] = frames
+    return result
+
+
+def bench_tennis_input(frames, events_per_frame):
+    """A high-rate mouse, a CSS-scaled canvas, scrolling and held keys"""
+    js, game = load_game("tennis_game")
+    game.set_tier("hard")
+    poll = Timer(game.input, "poll")
+    # Canvas shown at half size, 100px down the page
+    game.canvas.client_rect = types.SimpleNamespace(left=0, top=100, width=400, height=300)
+    game.start()
+    js.window.tick(FRAME_MS)
+    misplaced = 0
+    with Sampler() as sample:
+        for frame in range(frames):
+            if game.game_over:
+                game.start()
+            target = None
+            if frame % 300 == 150:
+                press(js, "ArrowDown")
+            elif frame % 300 == 200:
+                press(js, "ArrowDown", down=False)
+            elif frame % 300 < 150:
+                # Samples converging on the ball; the last lands on it exactly
+                target = game.ball.y
+                for i in range(events_per_frame - 1, -1, -1):
+                    move_mouse(game, 100 + (target - 2 * i) / 2)
+            if frame % 600 == 599:
+                js.window.dispatch("scroll")
+            js.window.tick(FRAME_MS)
+            if target is not None and not game.game_over:
+                expected = max(0, min(target - game.player.height / 2, 600 - game.player.height))
+                misplaced += abs(game.player.y - expected) > 0.05  # Replay quantisation is 1/16 px
+    result = sample.per(frames)
+    result.update({
+        "frames": frames,
+        "events": game.input.events,
+        "events_per_frame": game.input.events / frames,
+        "rect_reads": game.input.rect_reads,
+        "rect_reads_per_frame": fakejs.calls["dom.getBoundingClientRect"] / frames,
+        "ns_per_poll": poll.per_call(),
+        "misplaced_frames": misplaced,
+    })
+    return result
+
+
+def bench_tennis_versus(frames, latency_ms, loss):
+    """Online versus over a lossy loopback: the page against a scripted NetClient"""
+    js, game = load_game("tennis_game", flags=("versus",))
+    net = sys.modules["tennis_net"]
+    network = net.LoopbackHost(latency_ms, jitter_ms=latency_ms / 5, loss=loss, seed=0)
+    fakejs.FakeWebSocket.network = network
+    game.start()
+    opponent_end = network.connect()
+    opponent = net.NetClient(opponent_end)
+    opponent.request_start()
+    page_end = fakejs.FakeWebSocket.sockets[0].end
+    matches = 0
+    with Sampler() as sample:
+        for _ in range(frames):
+            now = js.window.clock + FRAME_MS
+            network.advance(now)
+            for socket in fakejs.FakeWebSocket.sockets:
+                socket.pump(now)
+            for data in opponent_end.poll(now):
+                opponent.receive(data, now)
+            ball_y = opponent.view(now)[1]
+            opponent.tick(CANVAS_MIDDLE if ball_y is None else ball_y)
+            if game.running:
+                ball_y = game.net.view(now)[1]
+                move_mouse(game, CANVAS_MIDDLE if ball_y is None else ball_y + 30)
+            js.window.tick(FRAME_MS)
+            if game.game_over:
+                matches += 1
+                game.start()
+                opponent.request_start()
+    seconds = frames * FRAME_MS / 1000
+    result = sample.per(frames)
+    result.update({
+        "frames": frames,
+        "rtt_ms": 2 * latency_ms,
+        "loss_percent": loss * 100,
+        "matches": matches,
+        "score": list(game.net.scores),
+        "upload_bytes_per_second": page_end.bytes_sent / seconds,
+        "download_bytes_per_second": page_end.peer.bytes_sent / seconds,
+        "bytes_per_snapshot": page_end.peer.bytes_sent / max(page_end.peer.messages_sent, 1),
+        "mispredictions": game.net.mispredictions,
+        "opponent_mispredictions": opponent.mispredictions,
+        "pending_inputs": len(game.net.pending),
+    })
+    return result
+
+
+def click(js, element):
+    """Click a button and run the animation frame that flushes the view"""
+    element.dispatch("click")
+    js.window.tick(FRAME_MS)
+
+
+def play_guess_session(game, js, secret):
+    """One full two-mode session; returns the number of handler calls"""
+    interactions = 0
+    click(js, game.start_btn)
+    interactions += 1
+
+    # Mode 1: bisect the computer's number through the input box
+    low, high = game.range_low, game.secret_high()
+    while game.current_mode == "player":
+        guess = (low + high) // 2
+        game.guess_input.type(str(guess))
+        click(js, game.submit_btn)
+        interactions += 1
+        if guess < game.secret_number:
+            low = guess + 1
+        elif guess > game.secret_number:
+            high = guess - 1
+        else:
+            break
+
+    # Mode 2: answer the computer's guesses about `secret`
+    click(js, game.continue_btn)
+    interactions += 1
+    while game.current_mode == "computer":
+        guess = game.computer_guess
+        if guess < secret:
+            click(js, game.btn_higher)
+        elif guess > secret:
+            click(js, game.btn_lower)
+        else:
+            click(js, game.btn_correct)
+            interactions += 1
+            break
+        interactions += 1
+    return interactions
+
+
+def bench_guess_sessions(sessions):
+    """Full two-mode guess sessions, cycling the player's secret"""
+    js, game = load_game("guess_number_game")
+    # Listeners are bound once at startup, so time their pooled proxies
+    listeners = game.proxies.proxies
+    player = Timer(listeners["submit"], "fn")
+    computer = [Timer(listeners[key], "fn") for key in ("higher", "lower", "correct")]
+    interactions = 0
+    low, high = game.range_low, game.secret_high()
+    with Sampler() as sample:
+        for i in range(sessions):
+            secret = low + (i * 37) % (high - low + 1)
+            interactions += play_guess_session(game, js, secret)
+    result = sample.per(interactions)
+    result = {key.replace("_frame", "_interaction"): value for key, value in result.items()}
+    result.update({
+        "sessions": sessions,
+        "interactions": interactions,
+        "ns_per_player_guess": player.per_call(),
+        "ns_per_computer_feedback": sum(t.ns for t in computer) / max(sum(t.calls for t in computer), 1),
+        "view_writes_per_interaction": game.view.writes / max(interactions, 1),
+        "live_proxies": fakejs.FakeProxy.live,
+    })
+    return result
+
+
+# A made-up but human-looking population of Mode 2 picks for 1-100: every
+# number sometimes, favourites and round numbers much more often
+HUMAN_PICKS = {number: 1.0 for number in range(1, 101)}
+HUMAN_PICKS.update({number: 4.0 for number in range(10, 101, 10)})
+HUMAN_PICKS.update({7: 14.0, 37: 8.0, 42: 10.0, 69: 8.0, 77: 5.0, 1: 3.0, 50: 6.0, 100: 5.0})
+
+
+def bench_guess_prior(sessions):
+    """The learned Mode 2 prior against bisection for a biased population of players"""
+    js, game = load_game("guess_number_game")
+    GuessSearch = sys.modules["guess_engine"].GuessSearch
+    from guess_eval import evaluate_prior  # Needs NumPy, so only imported here
+    record = Timer(game.prior, "record")
+    rng = random.Random(7)
+    numbers = list(HUMAN_PICKS)
+    weights = list(HUMAN_PICKS.values())
+    learned = []
+    bisected = []
+    with Sampler() as sample:
+        for _ in range(sessions):
+            secret = rng.choices(numbers, weights)[0]
+            play_guess_session(game, js, secret)
+            learned.append(game.computer_score)
+            search = GuessSearch(game.range_low, game.range_high)
+            attempts = 1
+            while search.next_guess() != secret:
+                search.feedback("higher" if secret > search.guess else "lower")
+                attempts += 1
+            bisected.append(attempts)
+    half = sessions // 2
+    result = evaluate_prior(game.prior, HUMAN_PICKS)
+    result.update({key.replace("_frame", "_session"): value for key, value in sample.per(sessions).items()})
+    result.update({
+        "sessions": sessions,
+        "late_mean_attempts": sum(learned[half:]) / max(sessions - half, 1),
+        "late_bisection_attempts": sum(bisected[half:]) / max(sessions - half, 1),
+        "worst_attempts": max(learned),
+        "ns_per_record": record.per_call(),
+        "stored_chars": len(js.window.localStorage.items.get("guessPrior:1-100", "")),
+    })
+    return result
+
+
+def bench_tennis_worker(frames):
+    """Worker mode: main-thread cost per frame with the simulation elsewhere"""
+    js, game = load_game("tennis_game", flags=("worker",))
+    worker = game.worker.namespace["worker"]
+    simulate = Timer(worker, "on_interval")
+    draw = Timer(game, "draw")
+    js.window.tick(FRAME_MS)  # Deliver the ready / buffer handshake
+    game.start()
+    mouse_y = game.player.y
+    count = 0
+    with Sampler() as sample:
+        while not game.game_over and count < frames:
+            diff = worker.sim.ball.y - mouse_y
+            mouse_y += max(-6, min(6, diff))
+            move_mouse(game, mouse_y)
+            js.window.tick(FRAME_MS)
+            count += 1
+    result = sample.per(count)
+    result.update({
+        "frames": count,
+        "ns_per_main_frame": (sample.ns - simulate.ns) / max(count, 1),
+        "ns_per_worker_tick": simulate.per_call(),
+        "ns_per_draw": draw.per_call(),
+        "shared_calls_per_frame": fakejs.calls["shared"] / max(count, 1),
+        "torn_reads": game.reader.torn,
+        "score": [game.player.score, game.ai_paddle.score],
+        "live_proxies": fakejs.FakeProxy.live,
+    })
+    return result
+
+
+def bundle_size():
+    """Bytes of the module archive, zipped as internal/pybundle does"""
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path in sorted(STATIC_PY.glob("*.py")):
+            if path.name != "arcade_boot.py":
+                archive.write(path, path.name)
+    return len(buffer.getvalue())
+
+
+def bench_startup(runs):
+    """Python's share of time-to-interactive: import and construct each game"""
+    result = {"bundle_bytes": bundle_size()}
+    for module in ("tennis_game", "guess_number_game"):
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter_ns()
+            js, game = load_game(module)
+            times.append(time.perf_counter_ns() - start)
+        result[f"ns_{module}_interactive"] = min(times)
+        result[f"{module}_marks"] = sorted(js.window.marks)
+    return result
+
+
+def bench_replay(frames):
+    """Record a live match through the game, then re-run it headless"""
+    js, game = load_game("tennis_game")
+    game.start()
+    js.window.tick(FRAME_MS)
+    mouse_y = game.player.y
+    count = 0
+    while not game.game_over and count < frames:
+        diff = game.ball.y - mouse_y
+        mouse_y += max(-6, min(6, diff))
+        move_mouse(game, mouse_y)
+        js.window.tick(FRAME_MS)
+        count += 1
+
+    # A match cut short by the frame limit is replayed as far as it got
+    finished = game.game_over
+    replay = game.last_replay if finished else game.recorder.finish(game.sim)
+    text = replay.to_text()
+    replay_module = sys.modules["tennis_replay"]
+    engine = replay_module.ReplayEngine(replay_module.Replay.from_text(text))
+    start = time.perf_counter_ns()
+    exact = engine.verify()
+    elapsed = time.perf_counter_ns() - start
+    return {
+        "ticks": replay.ticks,
+        "finished": finished,
+        "bit_exact": exact,
+        "score": [engine.sim.player.score, engine.sim.ai_paddle.score],
+        "live_score": [game.player.score, game.ai_paddle.score],
+        "bytes_per_tick": len(replay.to_bytes()) / max(replay.ticks, 1),
+        "shared_chars": len(text),
+        "ns_per_replay_tick": elapsed / max(replay.ticks, 1),
+    }
+
+
+SCENARIOS = {
+    "tennis_long_rally": lambda args: bench_tennis_long_rally(args.frames),
+    "tennis_full_match": lambda args: bench_tennis_full_match(args.frames * 10),
+    "tennis_worker": lambda args: bench_tennis_worker(args.frames * 10),
+    "tennis_chaos": lambda args: bench_tennis_chaos(args.frames, args.balls),
+    "tennis_input": lambda args: bench_tennis_input(args.frames, 8),
+    "tennis_quality": lambda args: bench_tennis_quality(args.frames),
+    "tennis_arena": lambda args: bench_tennis_arena(args.frames),
+    "tennis_versus": lambda args: bench_tennis_versus(args.frames * 10, 50, 0.02),
+    "guess_sessions": lambda args: bench_guess_sessions(args.sessions),
+    "guess_prior": lambda args: bench_guess_prior(args.sessions * 2),
+    "startup": lambda args: bench_startup(10),
+    "replay": lambda args: bench_replay(args.frames * 10),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--out", default="bench_output.json")
+    parser.add_argument("--frames", type=int, default=3000)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--balls", type=int, default=500, help="balls in the tennis_chaos scenario")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.scenario or SCENARIOS:
+        results[name] = SCENARIOS[name](args)
+        print(f"{name}: " + ", ".join(
+            f"{key}={value:.1f}" if isinstance(value, float) else f"{key}={value}"
+            for key, value in results[name].items()
+        ))
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+    Path(args.out).write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
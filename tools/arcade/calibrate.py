@@ -0,0 +1,236 @@
+"""
+Arcade calibration - self-play sweep of the tennis AI's difficulty
+Plays headless matches of AIController against scripted player models over
+a multiprocessing pool, writes win-rate / rally-length curves to JSON and
+regenerates static/py/tennis_tiers.py (the Easy/Normal/Hard lookup table)
+
+Usage: python tools/arcade/calibrate.py [--matches 400] [--steps 21] [--workers N]
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import time
+from pathlib import Path
+
+STATIC_PY = Path(__file__).resolve().parents[2] / "static" / "py"
+sys.path.insert(0, str(STATIC_PY))
+
+from tennis_core import BALL_START_SPEED, CANVAS_HEIGHT, TennisSimulation  # noqa: E402
+
+TIERS_MODULE = STATIC_PY / "tennis_tiers.py"
+
+# Scripted opponents: top paddle speed (px/tick), aim noise (standard
+# deviation in px at serve speed, growing with the ball's speed, drawn once
+# per return) and ticks before reacting to a return
+PLAYER_MODELS = {
+    "casual": {"speed": 5.0, "aim_noise": 30.0, "reaction": 18},
+    "average": {"speed": 8.0, "aim_noise": 20.0, "reaction": 10},
+    "skilled": {"speed": 12.0, "aim_noise": 12.0, "reaction": 5},
+}
+
+# Tiers are placed where the reference model wins this often. Hard is
+# bounded by the AI at difficulty 1 (fixed reaction delay, top paddle
+# speed), which the reference model still beats about 30% of the time
+REFERENCE_MODEL = "average"
+TIER_TARGETS = {"easy": 0.8, "normal": 0.5, "hard": 0.35}
+
+MATCHES_PER_TASK = 25  # Matches a pool task plays before reporting back
+MAX_MATCH_TICKS = 60 * 60 * 10  # Give up on a match after 10 minutes of play
+
+
+class ScriptedPlayer:
+    """Moves the player paddle toward the ball like a (noisy, slow) human"""
+    def __init__(self, paddle, speed, aim_noise, reaction, rng):
+        self.paddle = paddle
+        self.speed = speed
+        self.aim_noise = aim_noise
+        self.reaction = reaction
+        self.rng = rng
+        self.trajectory = None
+        self.offset = 0.0
+        self.waited = 0
+
+    def update(self, ball):
+        center = self.paddle.y + self.paddle.height / 2
+        if ball.vx < 0:
+            if self.trajectory != ball.trajectory:
+                self.trajectory = ball.trajectory
+                spread = self.aim_noise * abs(ball.vx) / BALL_START_SPEED
+                self.offset = self.rng.gauss(0.0, spread)
+                self.waited = 0
+            self.waited += 1
+            target = ball.y + self.offset if self.waited > self.reaction else center
+        else:
+            target = CANVAS_HEIGHT / 2
+        step = max(-self.speed, min(self.speed, target - center))
+        self.paddle.move_to(center + step)
+
+
+def play_matches(task):
+    """Pool worker: (difficulty, model, first_seed, count) -> totals"""
+    difficulty, model, first_seed, count = task
+    wins = points = hits = ticks = 0
+    for seed in range(first_seed, first_seed + count):
+        sim = TennisSimulation(difficulty, rng=random.Random(seed))
+        sim.reset_match(seed)
+        player = ScriptedPlayer(sim.player, rng=random.Random(~seed), **PLAYER_MODELS[model])
+        for _ in range(MAX_MATCH_TICKS):
+            player.update(sim.ball)
+            rally = sim.rally_hits
+            if sim.step() is not None:
+                points += 1
+                hits += rally
+                if sim.winner() is not None:
+                    break
+            ticks += 1
+        wins += sim.winner() == "player"
+    return difficulty, model, count, wins, points, hits, ticks
+
+
+def sweep(difficulties, matches, workers):
+    """Play `matches` per (difficulty, model) pair; returns the curves"""
+    tasks = []
+    for difficulty in difficulties:
+        for model in PLAYER_MODELS:
+            for first in range(0, matches, MATCHES_PER_TASK):
+                tasks.append((difficulty, model, first, min(MATCHES_PER_TASK, matches - first)))
+
+    totals = {}
+    with multiprocessing.Pool(workers) as pool:
+        for difficulty, model, *counts in pool.imap_unordered(play_matches, tasks):
+            key = (difficulty, model)
+            totals[key] = [a + b for a, b in zip(totals.get(key, [0] * 5), counts)]
+
+    curves = {model: [] for model in PLAYER_MODELS}
+    for (difficulty, model), (count, wins, points, hits, ticks) in sorted(totals.items()):
+        curves[model].append({
+            "difficulty": difficulty,
+            "matches": count,
+            "player_win_rate": wins / count,
+            "mean_rally": hits / max(points, 1),
+            "mean_match_ticks": ticks / count,
+        })
+    return curves
+
+
+def difficulty_for(curve, win_rate):
+    """Difficulty at which `curve` crosses win_rate (linear between samples)
+
+    The player's win rate falls as difficulty rises; sampling noise is
+    smoothed out by forcing the curve to be non-increasing first. None when
+    no sampled difficulty gets that win rate.
+    """
+    points = []
+    lowest = 1.0
+    for row in curve:
+        lowest = min(lowest, row["player_win_rate"])
+        points.append((row["difficulty"], lowest))
+    if win_rate > points[0][1] or win_rate < points[-1][1]:
+        return None
+    for (d0, w0), (d1, w1) in zip(points, points[1:]):
+        if w1 <= win_rate <= w0:
+            share = 0.0 if w0 == w1 else (w0 - win_rate) / (w0 - w1)
+            return d0 + (d1 - d0) * share
+    return None
+
+
+def value_at(curve, difficulty, key):
+    """curve's `key` at `difficulty`, linear between samples"""
+    for row0, row1 in zip(curve, curve[1:]):
+        if row0["difficulty"] <= difficulty <= row1["difficulty"]:
+            share = (difficulty - row0["difficulty"]) / (row1["difficulty"] - row0["difficulty"])
+            return row0[key] + (row1[key] - row0[key]) * share
+    return curve[-1][key]
+
+
+def write_tiers(curves, matches):
+    """Regenerate the lookup table the game imports
+
+    Fails, leaving the table as it was, when a tier's target win rate is
+    outside what the sweep reached.
+    """
+    curve = curves[REFERENCE_MODEL]
+    difficulties = {tier: difficulty_for(curve, target) for tier, target in TIER_TARGETS.items()}
+    missed = [tier for tier, difficulty in difficulties.items() if difficulty is None]
+    if missed:
+        low = min(row["player_win_rate"] for row in curve)
+        high = max(row["player_win_rate"] for row in curve)
+        raise SystemExit(
+            f"Tier targets out of reach for {', '.join(missed)}: the {REFERENCE_MODEL} model "
+            f"won {low:.0%}-{high:.0%} across the sweep; retune TIER_TARGETS"
+        )
+    lines = [
+        '"""',
+        "Classic Tennis/Pong Game - Difficulty Tiers",
+        "Generated by tools/arcade/calibrate.py from self-play against scripted",
+        "players; re-run it (make calibrate) instead of editing by hand",
+        '"""',
+        "",
+        '# AIController difficulty per tier, with the win rate and mean rally the',
+        f'# "{REFERENCE_MODEL}" player model got there ({matches} matches per sampled difficulty)',
+        f'REFERENCE_MODEL = "{REFERENCE_MODEL}"',
+        'DEFAULT_TIER = "normal"',
+        "",
+        "TIERS = {",
+    ]
+    for tier, difficulty in difficulties.items():
+        difficulty = round(difficulty, 3)
+        win_rate = value_at(curve, difficulty, "player_win_rate")
+        rally = value_at(curve, difficulty, "mean_rally")
+        lines.append(
+            f'    "{tier}": {{"difficulty": {difficulty}, "player_win_rate": {win_rate:.2f}, '
+            f'"mean_rally": {rally:.1f}}},'
+        )
+    lines.append("}")
+    TIERS_MODULE.write_text("\n".join(lines) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--matches", type=int, default=400, help="matches per difficulty and model")
+    parser.add_argument("--steps", type=int, default=21, help="difficulties sampled from 0 to 1")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--out", default="calibration_output.json")
+    parser.add_argument("--no-tiers", action="store_true", help="don't rewrite tennis_tiers.py")
+    parser.add_argument("--load", help="rebuild the tiers from a saved report instead of playing")
+    args = parser.parse_args(argv)
+
+    if args.load:
+        report = json.loads(Path(args.load).read_text())
+        write_tiers(report["curves"], report["matches_per_point"])
+        print(f"Wrote {TIERS_MODULE}")
+        return
+
+    difficulties = [round(i / (args.steps - 1), 4) for i in range(args.steps)]
+    start = time.perf_counter()
+    curves = sweep(difficulties, args.matches, args.workers)
+    elapsed = time.perf_counter() - start
+    total = args.matches * len(difficulties) * len(PLAYER_MODELS)
+
+    for model, curve in curves.items():
+        print(f"{model}:")
+        for row in curve:
+            print(f"  difficulty {row['difficulty']:.2f}: win {row['player_win_rate']:6.1%}"
+                  f"  rally {row['mean_rally']:5.2f}")
+    print(f"{total} matches on {args.workers} workers in {elapsed:.1f}s "
+          f"({total / elapsed:.0f} matches/s)")
+
+    report = {
+        "matches_per_point": args.matches,
+        "workers": args.workers,
+        "seconds": round(elapsed, 2),
+        "player_models": PLAYER_MODELS,
+        "curves": curves,
+    }
+    Path(args.out).write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Wrote {args.out}")
+    if not args.no_tiers:
+        write_tiers(curves, args.matches)
+        print(f"Wrote {TIERS_MODULE}")
+
+
+if __name__ == "__main__":
+    main()
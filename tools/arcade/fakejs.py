@@ -0,0 +1,439 @@
+"""
+Fake js / pyodide.ffi modules for running the arcade games under CPython
+Every DOM and canvas property write or method call is counted so the
+benchmarks can report FFI crossings per frame
+"""
+
+import runpy
+import sys
+import types
+from collections import Counter
+from pathlib import Path
+
+STATIC_PY = Path(__file__).resolve().parents[2] / "static" / "py"
+
+# Calls that would cross the Pyodide <-> JS boundary, by category
+calls = Counter()
+
+
+def reset_counts():
+    calls.clear()
+
+
+class FakeProxy:
+    """Stand-in for a pyodide.ffi proxy"""
+    live = 0
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.destroyed = False
+        FakeProxy.live += 1
+
+    def __call__(self, *args):
+        return self.fn(*args)
+
+    def destroy(self):
+        if not self.destroyed:
+            self.destroyed = True
+            FakeProxy.live -= 1
+
+
+class FakeJS:
+    """Attribute bag that counts reads of methods and writes of properties"""
+    category = "dom"
+
+    def __init__(self, **attrs):
+        object.__setattr__(self, "_attrs", dict(attrs))
+
+    def __getattr__(self, name):
+        attrs = object.__getattribute__(self, "_attrs")
+        if name in attrs:
+            return attrs[name]
+        category = object.__getattribute__(self, "category")
+
+        def method(*args, **kwargs):
+            calls[category] += 1
+            calls[f"{category}.{name}"] += 1
+            return None
+        return method
+
+    def __setattr__(self, name, value):
+        calls[self.category] += 1
+        calls[f"{self.category}.{name}="] += 1
+        self._attrs[name] = value
+
+    def __delattr__(self, name):
+        calls[self.category] += 1
+        self._attrs.pop(name, None)  # Like JS delete, fine when it isn't there
+
+
+class FakeContext(FakeJS):
+    category = "canvas"
+
+
+class FakeCanvasExecutor:
+    """window.arcadeCanvas from static/js/arcade-canvas.js
+
+    run() is the one canvas crossing per flush; the drawImage calls it
+    makes on the JS side are tallied under "canvas.executed".
+    """
+    sizes = {1: 4, 2: 6}  # Operand slots per opcode (3 is variable)
+
+    def __init__(self):
+        self.images = []
+
+    def register(self, image, image_id=None):
+        calls["canvas"] += 1
+        calls["canvas.register"] += 1
+        if image_id is not None:
+            self.images[image_id] = image
+            return image_id
+        self.images.append(image)
+        return len(self.images) - 1
+
+    def run(self, ctx, buffer, length):
+        calls["canvas"] += 1
+        calls["canvas.run"] += 1
+        ops = buffer.fn
+        i = 0
+        while i < length:
+            op = int(ops[i])
+            if op == 3:
+                count = int(ops[i + 2])
+                calls["canvas.executed"] += count
+                i += 3 + 2 * count
+            else:
+                calls["canvas.executed"] += 1
+                i += self.sizes[op]
+
+
+class FakeClassList(FakeJS):
+    def __init__(self):
+        super().__init__()
+        object.__setattr__(self, "names", set())
+
+    def add(self, name):
+        calls["dom"] += 1
+        calls["dom.classList.add"] += 1
+        self.names.add(name)
+
+    def remove(self, name):
+        calls["dom"] += 1
+        calls["dom.classList.remove"] += 1
+        self.names.discard(name)
+
+    def contains(self, name):
+        calls["dom"] += 1
+        return name in self.names
+
+    def toggle(self, name, force=None):
+        calls["dom"] += 1
+        calls["dom.classList.toggle"] += 1
+        on = (name not in self.names) if force is None else bool(force)
+        if on:
+            self.names.add(name)
+        else:
+            self.names.discard(name)
+        return on
+
+
+class FakeElement(FakeJS):
+    def __init__(self, element_id=None, tag="div"):
+        super().__init__(
+            id=element_id, tagName=tag, value="", textContent="", innerHTML="",
+            width=800, height=600, clientWidth=800, clientHeight=600,
+            # Page box for getBoundingClientRect; differs from width/height when CSS scales a canvas
+            client_rect=types.SimpleNamespace(left=0, top=0, width=800, height=600),
+        )
+        object.__setattr__(self, "classList", FakeClassList())
+        object.__setattr__(self, "style", FakeJS())
+        object.__setattr__(self, "listeners", {})
+        object.__setattr__(self, "context", FakeContext())
+
+    def addEventListener(self, event, handler, *options):
+        add_listener(self, event, handler)
+
+    def removeEventListener(self, event, handler, *options):
+        calls["dom"] += 1
+        handlers = self.listeners.get(event, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def dispatch(self, event, payload=None):
+        dispatch(self, event, payload)
+
+    def type(self, text):
+        """Set an input's value as the user would (test helper, not counted)"""
+        self._attrs["value"] = text
+
+    @property
+    def parentElement(self):
+        if "parentElement" not in self._attrs:
+            self._attrs["parentElement"] = FakeElement(tag="div")
+        return self._attrs["parentElement"]
+
+    def getContext(self, kind, *options):
+        calls["dom"] += 1
+        return self.context
+
+    def getBoundingClientRect(self):
+        calls["dom"] += 1
+        calls["dom.getBoundingClientRect"] += 1
+        return self.client_rect
+
+    def querySelector(self, selector):
+        calls["dom"] += 1
+        return FakeElement()
+
+
+def add_listener(target, event, handler):
+    calls["dom"] += 1
+    calls["dom.addEventListener"] += 1
+    target.listeners.setdefault(event, []).append(handler)
+
+
+def dispatch(target, event, payload=None):
+    """Fire `event` at every listener on target (test helper, not a JS API)"""
+    for handler in list(target.listeners.get(event, [])):
+        handler(payload)
+
+
+class FakeWebSocket(FakeElement):
+    """WebSocket stand-in joined to `network` (a tennis_net.LoopbackHost) when constructed"""
+    network = None
+    sockets = []
+
+    def __init__(self, url):
+        super().__init__(tag="websocket")
+        object.__setattr__(self, "url", url)
+        object.__setattr__(self, "end", FakeWebSocket.network.connect())
+        object.__setattr__(self, "opened", False)
+        FakeWebSocket.sockets.append(self)
+
+    def send(self, data):
+        calls["dom"] += 1
+        calls["dom.send"] += 1
+        self.end.send(bytes(data))
+
+    def pump(self, now):
+        """Fire open once, then a message event per delivered packet (test helper)"""
+        if not self.opened:
+            object.__setattr__(self, "opened", True)
+            self.dispatch("open")
+        for data in self.end.poll(now):
+            self.dispatch("message", types.SimpleNamespace(data=data))
+
+
+class FakeUint8Array:
+    def __init__(self, buffer):
+        self.data = bytes(buffer)
+
+    def to_bytes(self):
+        return self.data
+
+
+class FakeDocument:
+    def __init__(self):
+        self.elements = {}
+        self.listeners = {}
+
+    def getElementById(self, element_id):
+        calls["dom"] += 1
+        calls["dom.getElementById"] += 1
+        if element_id not in self.elements:
+            self.elements[element_id] = FakeElement(element_id)
+        return self.elements[element_id]
+
+    def createElement(self, tag):
+        calls["dom"] += 1
+        return FakeElement(tag=tag)
+
+    def querySelector(self, selector):
+        calls["dom"] += 1
+        calls["dom.querySelector"] += 1
+        if selector not in self.elements:
+            self.elements[selector] = FakeElement()
+        return self.elements[selector]
+
+    def addEventListener(self, event, handler, *options):
+        add_listener(self, event, handler)
+
+    def dispatch(self, event, payload=None):
+        dispatch(self, event, payload)
+
+
+class FakeWindow(FakeJS):
+    def __init__(self):
+        super().__init__(
+            devicePixelRatio=1, innerWidth=1280, innerHeight=800,
+            crossOriginIsolated=True, arcadeQueuedStart=False, arcadeCanvas=FakeCanvasExecutor(),
+        )
+        object.__setattr__(self, "frames", {})
+        object.__setattr__(self, "intervals", [])
+        object.__setattr__(self, "messages", [])
+        object.__setattr__(self, "next_frame", 1)
+        object.__setattr__(self, "clock", 0.0)
+        object.__setattr__(self, "marks", {})
+        object.__setattr__(self, "performance", types.SimpleNamespace(
+            now=lambda: self.clock, mark=self.mark, getEntriesByName=self.entries,
+        ))
+        object.__setattr__(self, "location", types.SimpleNamespace(search="", hash="", hostname="localhost", protocol="http:"))
+        object.__setattr__(self, "listeners", {})
+        object.__setattr__(self, "localStorage", FakeStorage())
+
+    def mark(self, name):
+        self.marks.setdefault(name, self.clock)
+
+    def entries(self, name):
+        found = FakeArray()
+        if name in self.marks:
+            found.append(types.SimpleNamespace(startTime=self.marks[name]))
+        return found
+
+    def requestAnimationFrame(self, callback):
+        calls["dom"] += 1
+        calls["dom.requestAnimationFrame"] += 1
+        frame_id = self.next_frame
+        object.__setattr__(self, "next_frame", frame_id + 1)
+        self.frames[frame_id] = callback
+        return frame_id
+
+    def cancelAnimationFrame(self, frame_id):
+        calls["dom"] += 1
+        self.frames.pop(frame_id, None)
+
+    def addEventListener(self, event, handler, *options):
+        add_listener(self, event, handler)
+
+    def dispatch(self, event, payload=None):
+        dispatch(self, event, payload)
+
+    def setInterval(self, callback, ms):
+        self.intervals.append(callback)
+        return len(self.intervals)
+
+    def tick(self, ms):
+        """Advance the clock `ms`: deliver messages, fire intervals once, run frames"""
+        object.__setattr__(self, "clock", self.clock + ms)
+        while self.messages:
+            target, data = self.messages.pop(0)
+            target.onmessage(types.SimpleNamespace(data=data))
+        for callback in list(self.intervals):
+            callback()
+        pending = list(self.frames.values())
+        self.frames.clear()
+        for callback in pending:
+            callback(self.clock)
+        return len(pending)
+
+
+class FakeStorage:
+    """window.localStorage"""
+    def __init__(self):
+        self.items = {}
+
+    def getItem(self, key):
+        calls["dom"] += 1
+        calls["dom.storage.getItem"] += 1
+        return self.items.get(key)
+
+    def setItem(self, key, value):
+        calls["dom"] += 1
+        calls["dom.storage.setItem"] += 1
+        self.items[key] = str(value)
+
+
+class FakeArray(list):
+    """JS array stand-in (has .length)"""
+    @property
+    def length(self):
+        return len(self)
+
+
+class FakeSharedArrayBuffer:
+    def __init__(self, size):
+        self.data = bytearray(size)
+
+
+class FakeFloat32Array:
+    """Float32Array over a fake SharedArrayBuffer; every access is one crossing"""
+    def __init__(self, buffer, start=0, end=None):
+        self.buffer = buffer
+        self.view = memoryview(buffer.data).cast("f")[start:end]
+        self.start = start
+
+    def __getitem__(self, index):
+        calls["shared"] += 1
+        return self.view[index]
+
+    def __setitem__(self, index, value):
+        calls["shared"] += 1
+        self.view[index] = value
+
+    def subarray(self, start, end):
+        return FakeFloat32Array(self.buffer, self.start + start, self.start + end)
+
+    def assign(self, source):
+        """pyodide JsBuffer.assign: copy a Python buffer in"""
+        calls["shared"] += 1
+        self.view[:] = memoryview(source).cast("B").cast("f")
+
+    def assign_to(self, target):
+        """pyodide JsBuffer.assign_to: copy out into a Python buffer"""
+        calls["shared"] += 1
+        memoryview(target).cast("B").cast("f")[:] = self.view
+
+
+class FakeWorker:
+    """PyScript worker run in-process; messages queue until the next tick"""
+    def __init__(self, window, src):
+        self.window = window
+        self.onmessage = None
+        xworker = types.SimpleNamespace(onmessage=None)
+        xworker.postMessage = lambda data: window.messages.append((self, data))
+        self.xworker = xworker
+        sys.modules["polyscript"] = types.SimpleNamespace(xworker=xworker)
+        self.namespace = runpy.run_path(str(STATIC_PY / Path(src).name), run_name="__worker__")
+
+    def postMessage(self, data):
+        self.window.messages.append((self.xworker, data))
+
+
+def install(flags=()):
+    """Register fresh fake js / pyodide modules in sys.modules
+
+    `flags` are the ?query flags the page URL should appear to carry, as
+    "name" or "name=value".
+    """
+    params = dict(flag.partition("=")[::2] for flag in flags)
+    js = types.ModuleType("js")
+    js.document = FakeDocument()
+    js.window = FakeWindow()
+    js.Object = types.SimpleNamespace(fromEntries=dict)
+    js.URLSearchParams = types.SimpleNamespace(
+        new=lambda search: types.SimpleNamespace(get=params.get, has=params.__contains__),
+    )
+    js.performance = js.window.performance
+    js.setInterval = js.window.setInterval
+    js.SharedArrayBuffer = types.SimpleNamespace(new=FakeSharedArrayBuffer)
+    js.Float32Array = types.SimpleNamespace(new=FakeFloat32Array)
+    js.Uint8Array = types.SimpleNamespace(new=FakeUint8Array)
+    js.WebSocket = types.SimpleNamespace(new=FakeWebSocket)
+    FakeWebSocket.sockets = []
+    pyscript = types.ModuleType("pyscript")
+    pyscript.PyWorker = lambda src, **options: FakeWorker(js.window, src)
+
+    ffi = types.ModuleType("pyodide.ffi")
+    ffi.create_proxy = FakeProxy
+    ffi.to_js = lambda value, **kwargs: value
+    ffi.JsException = type("JsException", (Exception,), {})
+    pyodide = types.ModuleType("pyodide")
+    pyodide.ffi = ffi
+
+    sys.modules["js"] = js
+    sys.modules["pyodide"] = pyodide
+    sys.modules["pyodide.ffi"] = ffi
+    sys.modules["pyscript"] = pyscript
+    FakeProxy.live = 0
+    reset_counts()
+    return js
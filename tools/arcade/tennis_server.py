@@ -0,0 +1,178 @@
+"""
+Arcade versus server - reference host for online tennis
+Runs tennis_net.MatchHost at TICK_RATE behind a minimal stdlib WebSocket
+server (binary messages only); open /games/tennis?versus in two browsers
+
+It serves plain ws:// only. Pages served over https can't open that, so put
+a TLS reverse proxy in front and open /games/tennis?versus&server=wss://<proxy>
+
+Usage: python tools/arcade/tennis_server.py [--host 0.0.0.0] [--port 8765] [--seed N]
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import struct
+import sys
+import time
+from pathlib import Path
+
+STATIC_PY = Path(__file__).resolve().parents[2] / "static" / "py"
+sys.path.insert(0, str(STATIC_PY))
+
+from tennis_core import TICK_RATE, FixedTimestep  # noqa: E402
+from tennis_net import SIDE_FULL, VERSUS_PORT, MatchHost  # noqa: E402
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+MAX_MESSAGE = 1 << 16  # Game messages are tens of bytes; anything bigger is dropped
+MAX_BUFFERED = 1 << 18  # Unsent bytes before a stalled client is disconnected
+
+
+class WebSocketConnection:
+    """Server side of one RFC 6455 connection: binary messages, ping and close"""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.closed = False
+
+    async def handshake(self):
+        """Answer the HTTP upgrade request; False if it wasn't one"""
+        request = await self.reader.readuntil(b"\r\n\r\n")
+        headers = {}
+        for line in request.decode("latin-1").split("\r\n")[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        key = headers.get("sec-websocket-key")
+        if key is None or headers.get("upgrade", "").lower() != "websocket":
+            self.writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            return False
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        self.writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode())
+        return True
+
+    def send(self, data, opcode=OP_BINARY):
+        """Queue one unfragmented frame (server frames are never masked)"""
+        if self.closed:
+            return
+        if self.writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+            self.close()
+            return
+        length = len(data)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 1 << 16:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+        self.writer.write(header + data)
+
+    async def receive(self):
+        """The next complete message, or None once the connection has closed"""
+        message = bytearray()
+        try:
+            while True:
+                first, second = await self.reader.readexactly(2)
+                opcode = first & 0x0F
+                length = second & 0x7F
+                if length == 126:
+                    (length,) = struct.unpack("!H", await self.reader.readexactly(2))
+                elif length == 127:
+                    (length,) = struct.unpack("!Q", await self.reader.readexactly(8))
+                if length > MAX_MESSAGE:
+                    return None
+                mask = await self.reader.readexactly(4) if second & 0x80 else None
+                payload = await self.reader.readexactly(length)
+                if mask:
+                    key = (mask * (length // 4 + 1))[:length]
+                    payload = (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(length, "big")
+
+                if opcode == OP_CLOSE:
+                    self.send(payload[:2], OP_CLOSE)
+                    return None
+                if opcode == OP_PING:
+                    self.send(payload, OP_PONG)
+                    continue
+                if opcode == OP_PONG:
+                    continue
+                message += payload
+                if first & 0x80:
+                    return bytes(message)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return None
+
+    def close(self):
+        self.closed = True
+        self.writer.close()
+
+
+class VersusServer:
+    """One MatchHost shared by whoever connects (two players, everyone else turned away)"""
+    def __init__(self, seed=None):
+        self.host = MatchHost(seed=seed)
+
+    async def handle(self, reader, writer):
+        connection = WebSocketConnection(reader, writer)
+        try:
+            if not await connection.handshake():
+                return
+            side = self.host.join(connection)
+            if side == SIDE_FULL:
+                await writer.drain()
+                return
+            print(f"Player joined on side {side}")
+            try:
+                while True:
+                    data = await connection.receive()
+                    if data is None:
+                        break
+                    self.host.receive(side, data)
+            finally:
+                self.host.leave(side)
+                print(f"Player left side {side}")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            connection.close()
+
+    async def tick(self):
+        """Step the host TICK_RATE times a second"""
+        timestep = FixedTimestep(TICK_RATE)
+        while True:
+            for _ in range(timestep.advance(time.perf_counter() * 1000)):
+                self.host.step()
+            await asyncio.sleep(0.5 / TICK_RATE)
+
+
+async def serve(host, port, seed):
+    server = VersusServer(seed)
+    listener = await asyncio.start_server(server.handle, host, port)
+    print(f"Versus host on ws://{host}:{port}")
+    async with listener:
+        await asyncio.gather(listener.serve_forever(), server.tick())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=VERSUS_PORT)
+    parser.add_argument("--seed", type=int, help="seed the host's matches (reproducible serves)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.seed))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()